@@ -1,9 +1,10 @@
-from flask import Flask, jsonify, send_from_directory, abort
-from flask import request
+from flask import Flask, jsonify, send_from_directory, abort, url_for
+from flask import request, Response, stream_with_context
 from flask_cors import CORS
 from scraper.engine import ScraperEngine
-from scraper.task_manager import TaskManager
-from scraper.utils import parse_platforms_file
+from scraper.async_engine import AsyncScraperEngine
+from scraper.task_manager import TaskManager, LOG_TAIL
+from scraper.utils import parse_platforms_file, json_default
 from scraper.strategies import plan_strategies
 import os
 import sys
@@ -13,16 +14,25 @@ import logging
 import uuid
 import threading
 import atexit
-from dataclasses import asdict
+from typing import Optional
+import json
 import time
 
 app = Flask(__name__, static_folder='static')
 CORS(app)
+# Jobs keep their raw values (datetimes included) and are serialized here, once
+app.json.default = json_default
 
 task_manager = TaskManager()
-scraper_engine = ScraperEngine(task_manager=task_manager)
+# SCRAPER_ENGINE=async drives pages from one asyncio loop instead of a thread per browser
+if os.environ.get("SCRAPER_ENGINE", "sync").lower() == "async":
+    scraper_engine = AsyncScraperEngine(task_manager=task_manager)
+else:
+    scraper_engine = ScraperEngine(task_manager=task_manager)
 
-# Ensure the scraper engine is stopped when the app exits
+# Ensure the scraper engine is stopped when the app exits, then queued store writes land
+# (atexit runs handlers last registered first)
+atexit.register(task_manager.flush)
 atexit.register(scraper_engine.stop)
 
 @app.route('/')
@@ -46,17 +56,89 @@ def start_scraping():
 
 @app.route('/api/scrape/status/<task_id>', methods=['GET'])
 def get_status(task_id: str):
+    # ?since=<seq> returns only what changed after that sequence number,
+    # ?summary=1 additionally leaves job descriptions out
+    since = request.args.get("since", type=int)
+    summary = request.args.get("summary", "").lower() in ("1", "true", "yes")
+    if since is not None or summary:
+        delta = task_manager.changes_since(task_id, since or 0, summary=summary)
+        if delta is None:
+            abort(404, description="Task not found")
+        return jsonify(delta)
     task = task_manager.get_task(task_id)
     if not task:
         abort(404, description="Task not found")
-    return jsonify(asdict(task))
+    # Only the tail of the log ring buffer unless ?logs=all (or ?log_tail=N)
+    tail = None if request.args.get("logs") == "all" else request.args.get("log_tail", LOG_TAIL, type=int)
+    # Shallow copies taken under the TaskManager lock, the scrape goes on while they are encoded
+    return jsonify(task_manager.task_snapshot(task, log_limit=tail, omit=_omitted_result_keys()))
+
+def _omitted_result_keys():
+    # "jobs_unfiltered" repeats every job of "jobs" plus the date filtered ones,
+    # only sent when asked for with ?unfiltered=1
+    if request.args.get("unfiltered", "").lower() in ("1", "true", "yes"):
+        return ()
+    return ("jobs_unfiltered",)
+
+def _result_view(result):
+    omit = _omitted_result_keys()
+    return {k: v for k, v in result.items() if k not in omit}
+
+# Comment line sent when nothing happened, keeps proxies from closing the stream
+SSE_HEARTBEAT_SECONDS = 15
+
+def _sse(event: str, data, event_id=None) -> str:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, default=json_default)}\n\n"
+
+@app.route('/api/scrape/events/<task_id>', methods=['GET'])
+def stream_events(task_id: str):
+    """Server-Sent Events for a task: log, result, job, task and done events.
+
+    Event ids are task sequence numbers, so a reconnecting EventSource resumes
+    from its Last-Event-ID (or ?since=) without replaying what it already has.
+    """
+    since = request.headers.get("Last-Event-ID", type=int)
+    if since is None:
+        since = request.args.get("since", 0, type=int)
+    summary = request.args.get("summary", "").lower() in ("1", "true", "yes")
+    if task_manager.get_task(task_id) is None:
+        abort(404, description="Task not found")
+
+    def generate(since: int):
+        while True:
+            delta = task_manager.changes_since(task_id, since, summary=summary)
+            if delta is None:
+                return
+            if delta["seq"] > since:
+                # Ids must only grow, or a resume from Last-Event-ID would skip events
+                events = [("log", e) for e in delta["logs"]] + [("result", e) for e in delta["results"]] + \
+                         [("job", e) for e in delta["jobs"]]
+                for event, entry in sorted(events, key=lambda item: item[1]["seq"]):
+                    yield _sse(event, entry, entry["seq"])
+                since = delta["seq"]
+                state = {k: v for k, v in delta.items() if k not in ("since", "logs", "results", "jobs")}
+                yield _sse("task", state, since)
+            if delta["status"] in ("completed", "failed"):
+                yield _sse("done", {"status": delta["status"], "seq": since})
+                return
+            if not task_manager.wait_for_changes(task_id, since, SSE_HEARTBEAT_SECONDS):
+                yield ": keepalive\n\n"
+
+    return Response(stream_with_context(generate(since)), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    return jsonify(task_manager.metrics())
 
 @app.route('/api/scrape/approve/<task_id>', methods=['POST'])
 def approve_next(task_id: str):
     task = task_manager.get_task(task_id)
     if not task:
         abort(404, description="Task not found")
-    scraper_engine.approve_next(task_id)
+    if not scraper_engine.approve_next(task_id):
+        return jsonify({"status": "error", "message": "No URL is awaiting approval"}), 409
     return jsonify({"status": "ok", "message": "Approved next URL"})
 
 @app.route('/api/scrape/approve_all/<task_id>', methods=['POST'])
@@ -64,8 +146,7 @@ def approve_all(task_id: str):
     task = task_manager.get_task(task_id)
     if not task:
         abort(404, description="Task not found")
-    task_manager.set_approve_all(task_id, True)
-    scraper_engine.approve_next(task_id)
+    scraper_engine.approve_all(task_id)
     return jsonify({"status": "ok", "message": "Approved all remaining URLs"})
 
 @app.route('/api/scrape/skip/<task_id>', methods=['POST'])
@@ -73,30 +154,92 @@ def skip_next(task_id: str):
     task = task_manager.get_task(task_id)
     if not task:
         abort(404, description="Task not found")
-    task_manager.set_skip_next(task_id, True)
+    if not scraper_engine.skip_next(task_id):
+        return jsonify({"status": "error", "message": "No URL is awaiting approval"}), 409
     return jsonify({"status": "ok", "message": "Skipped current URL"})
 
-@app.route('/api/scrape', methods=['POST'])
-def scrape_aggregate():
-    file_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'job platforms.txt')
-    urls = parse_platforms_file(file_path)
-    task_id = scraper_engine.start_scraping_task(urls)
-    task_manager.set_approve_all(task_id, True)
-    scraper_engine.approve_next(task_id)
-    while True:
-        task = task_manager.get_task(task_id)
-        if task and task.status in ("completed", "failed"):
-            break
-        time.sleep(0.3)
-    task = task_manager.get_task(task_id)
-    if not task:
-        return jsonify({"status": "error", "message": "Task not found"}), 500
-    return jsonify({
+# Longest a blocking scrape request holds a worker; ?timeout= can only lower it.
+# Unset, /api/scrape and /api/scrape/one wait for the scrape to finish as they always did,
+# callers that did not opt into ?timeout= or async mode never see a 202
+_wait_limit = os.environ.get("SCRAPER_RESULT_WAIT_TIMEOUT", "")
+RESULT_WAIT_TIMEOUT = float(_wait_limit) if _wait_limit else None
+
+def _wants_async() -> bool:
+    # ?mode=async or "Prefer: respond-async" return 202 right away
+    return (request.args.get("mode", "").lower() == "async"
+            or "respond-async" in request.headers.get("Prefer", "").lower())
+
+def _wait_timeout(name: str = "timeout", default: Optional[float] = RESULT_WAIT_TIMEOUT) -> Optional[float]:
+    """Seconds to wait for the task, None for no limit."""
+    value = request.args.get(name, default, type=float)
+    if value is None:
+        return RESULT_WAIT_TIMEOUT
+    value = max(0.0, value)
+    return value if RESULT_WAIT_TIMEOUT is None else min(value, RESULT_WAIT_TIMEOUT)
+
+def _is_done(task) -> bool:
+    return task is not None and task.status in ("completed", "failed")
+
+def _task_payload(task, single: bool):
+    if single:
+        if task.results:
+            return _result_view(task.results[-1])
+        return {"url": None, "status": "error", "jobs": []}
+    return {
         "status": task.status,
         "total_urls": task.total,
         "scraped_count": len(task.results),
-        "results": task.results
+        "results": [_result_view(r) for r in task.results]
+    }
+
+def _accepted(task, single: bool):
+    """202 pointing at the result and event URLs of a task that is still running."""
+    result_url = url_for("scrape_result", task_id=task.task_id, one=1 if single else None)
+    response = jsonify({
+        "task_id": task.task_id,
+        "status": task.status,
+        "progress": task.progress,
+        "total": task.total,
+        "result_url": result_url,
+        "events_url": url_for("stream_events", task_id=task.task_id),
     })
+    response.headers["Location"] = result_url
+    return response, 202
+
+def _respond(task_id: str, single: bool, timeout: Optional[float]):
+    # Long-poll: sleeps on TaskManager's condition, woken by the status change
+    if timeout is None or timeout > 0:
+        task = task_manager.wait_until_done(task_id, timeout)
+    else:
+        task = task_manager.get_task(task_id)
+    if not task:
+        return jsonify({"status": "error", "message": "Task not found"}), 404
+    if not _is_done(task):
+        return _accepted(task, single)
+    return jsonify(_task_payload(task, single))
+
+def _start_approved(urls) -> str:
+    task_id = scraper_engine.start_scraping_task(urls)
+    scraper_engine.approve_all(task_id)
+    return task_id
+
+@app.route('/api/scrape', methods=['POST'])
+def scrape_aggregate():
+    file_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'job platforms.txt')
+    urls = parse_platforms_file(file_path)
+    task_id = _start_approved(urls)
+    return _respond(task_id, single=False, timeout=0 if _wants_async() else _wait_timeout())
+
+@app.route('/api/scrape/result/<task_id>', methods=['GET'])
+def scrape_result(task_id: str):
+    """Result of a task started by /api/scrape or /api/scrape/one (?one=1).
+
+    ?wait=<seconds> long-polls until the task finishes; 202 while it is running.
+    """
+    if task_manager.get_task(task_id) is None:
+        abort(404, description="Task not found")
+    single = request.args.get("one", "").lower() in ("1", "true", "yes")
+    return _respond(task_id, single=single, timeout=_wait_timeout("wait", 0))
 
 @app.route('/api/scrape/plan', methods=['GET'])
 def scrape_plan():
@@ -119,19 +262,8 @@ def scrape_one():
     url = data.get("url")
     if not url:
         abort(400, description="Missing 'url' in request body")
-    task_id = scraper_engine.start_scraping_task([url])
-    task_manager.set_approve_all(task_id, True)
-    scraper_engine.approve_next(task_id)
-    while True:
-        task = task_manager.get_task(task_id)
-        if task and task.status in ("completed", "failed"):
-            break
-        time.sleep(0.3)
-    task = task_manager.get_task(task_id)
-    if not task:
-        return jsonify({"status": "error", "message": "Task not found"}), 500
-    result = task.results[-1] if task.results else {"url": url, "status": "error", "jobs": []}
-    return jsonify(result)
+    task_id = _start_approved([url])
+    return _respond(task_id, single=True, timeout=0 if _wants_async() else _wait_timeout())
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000, use_reloader=False)
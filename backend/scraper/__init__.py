@@ -1,4 +1,5 @@
 # Scraper module
 from .engine import ScraperEngine
+from .async_engine import AsyncScraperEngine
 
-__all__ = ['ScraperEngine']
+__all__ = ['ScraperEngine', 'AsyncScraperEngine']
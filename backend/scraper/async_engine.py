@@ -0,0 +1,211 @@
+from playwright.async_api import async_playwright
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from typing import List, Dict, Any, Optional, Coroutine
+from .browser_pool import BrowserPool, LAUNCH_ARGS
+from .resource_blocker import ResourceBlocker
+from .engine import ScraperEngine, TASK_CONCURRENCY, CONTEXT_OPTIONS, STEALTH_SCRIPT
+from .task_manager import TaskManager
+
+logger = logging.getLogger(__name__)
+
+# Pages driven at once by the event loop across all tasks
+ASYNC_MAX_PAGES = int(os.environ.get("SCRAPER_ASYNC_MAX_PAGES", "24"))
+
+class AsyncScraperEngine(ScraperEngine):
+    """ScraperEngine variant that drives pages from a single asyncio event loop.
+
+    The loop runs on one background thread and owns one async Chromium, so
+    dozens of pages can be in flight without a thread each. Strategies that
+    implement ``scrape_async`` run on that loop; the rest are handed to the
+    sync browser pool so they can be ported one at a time. The public API
+    matches ScraperEngine, so the Flask layer can use either.
+    """
+
+    def __init__(self, task_manager: TaskManager, task_concurrency: int = TASK_CONCURRENCY,
+                 max_pages: int = ASYNC_MAX_PAGES, browser_pool: Optional[BrowserPool] = None):
+        super().__init__(task_manager, task_concurrency=task_concurrency, browser_pool=browser_pool)
+        self.max_pages = max(1, max_pages)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+        self._playwright = None
+        self._browser = None
+        self._browser_lock: Optional[asyncio.Lock] = None
+        self._page_slots: Optional[asyncio.Semaphore] = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    # Loop bound primitives have to be created on the loop thread
+                    self._browser_lock = asyncio.Lock()
+                    self._page_slots = asyncio.Semaphore(self.max_pages)
+                    ready.set()
+                    loop.run_forever()
+
+                self._loop_thread = threading.Thread(target=run, name="async-scraper-loop", daemon=True)
+                self._loop_thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def submit(self, coro: Coroutine) -> Future:
+        """Schedule a coroutine on the engine loop from any thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def start_scraping_task(self, urls: List[str], concurrency: Optional[int] = None) -> str:
+        task_id = self._register_task(urls)
+        concurrency = max(1, concurrency or self.task_concurrency)
+        self.submit(self._run_task_async(task_id, urls, concurrency))
+        return task_id
+
+    def stop(self):
+        self._release_gates()
+        if self._loop is not None:
+            try:
+                # Tasks still running would otherwise be left pending on a dead loop
+                self.submit(self._cancel_tasks()).result(timeout=30)
+            except Exception as e:
+                logger.warning(f"Failed to cancel async tasks: {e}")
+            try:
+                self.submit(self._close_browser()).result(timeout=30)
+            except Exception as e:
+                logger.warning(f"Failed to close async browser: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join(timeout=10)
+            if not self._loop_thread.is_alive():
+                self._loop.close()
+            self._loop = None
+        super().stop()
+
+    async def _cancel_tasks(self, timeout: float = 20) -> None:
+        current = asyncio.current_task()
+        pending = [t for t in asyncio.all_tasks() if t is not current]
+        for t in pending:
+            t.cancel()
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+
+    async def _await_approval_async(self, task_id: str, index: int, url: str, total: int) -> bool:
+        """Async _await_approval(): waits on the gate on the loop, no executor thread is held."""
+        gate = self._open_prompt(task_id, index, url, total)
+        if gate is None:
+            return True
+        return self._close_prompt(task_id, index, url, total, await gate.wait_async())
+
+    async def _get_browser(self):
+        async with self._browser_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+                logger.info("[AsyncEngine] Launched async browser")
+            return self._browser
+
+    async def _close_browser(self):
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _run_task_async(self, task_id: str, urls: List[str], concurrency: int) -> None:
+        try:
+            for i, url in enumerate(urls):
+                if self._approved_all(task_id) and concurrency > 1 and i < len(urls) - 1:
+                    await self._scrape_parallel_async(task_id, urls, i, concurrency)
+                    break
+                if not await self._await_approval_async(task_id, i, url, len(urls)):
+                    if self._stopped(task_id):
+                        break
+                    continue
+                if self._approved_all(task_id) and concurrency > 1 and i < len(urls) - 1:
+                    self.task_manager.add_log(task_id, f"Approve all received. Scraping remaining {len(urls) - i} sites with concurrency {concurrency}")
+                    await self._scrape_parallel_async(task_id, urls, i, concurrency)
+                    break
+                self.task_manager.add_log(task_id, f"Approval received. Processing site {i+1}/{len(urls)}: {url}")
+                result = await self._scrape_url_async(url, task_id)
+                self.task_manager.add_result(task_id, result)
+        except Exception as e:
+            logger.error(f"Task failed: {e}")
+            self.task_manager.add_log(task_id, f"Task failed: {e}", level="error", event="task_failed")
+        finally:
+            self._finish_task(task_id)
+
+    async def _scrape_parallel_async(self, task_id: str, urls: List[str], start: int, concurrency: int) -> None:
+        remaining = urls[start:]
+        # Register placeholders up front so results keep the URL order of the plan
+        for url in remaining:
+            self.task_manager.init_result(task_id, url, status="queued")
+
+        slots = asyncio.Semaphore(concurrency)
+
+        async def run(index: int, url: str):
+            async with slots:
+                self.task_manager.add_log(task_id, f"Processing site {index+1}/{len(urls)}: {url}")
+                result = await self._scrape_url_async(url, task_id)
+                self.task_manager.add_result(task_id, result)
+
+        outcomes = await asyncio.gather(
+            *(run(start + offset, url) for offset, url in enumerate(remaining)),
+            return_exceptions=True
+        )
+        for url, outcome in zip(remaining, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Parallel scrape of {url} failed: {outcome}")
+                self.task_manager.add_result(task_id, self._error_result(task_id, url, outcome))
+
+    async def _scrape_url_async(self, url: str, task_id: str) -> Dict[str, Any]:
+        # API scrapes block on HTTP, keep them off the event loop
+        strategy, result = await asyncio.get_running_loop().run_in_executor(None, self._scrape_direct, url, task_id)
+        if result is not None:
+            return result
+        if not strategy.supports_async:
+            # Not ported yet, run the sync strategy on the shared browser pool
+            return await asyncio.wrap_future(self.browser_pool.submit(self._scrape_url, url, task_id, strategy))
+
+        async with self._page_slots:
+            browser = await self._get_browser()
+            context = await browser.new_context(**CONTEXT_OPTIONS)
+            blocker = ResourceBlocker.for_strategy(strategy)
+            if blocker:
+                await context.route("**/*", blocker.handle_async)
+            # Anti-detection script, on the context so every page opened in it gets it
+            await context.add_init_script(STEALTH_SCRIPT)
+            page = await context.new_page()
+
+            try:
+                self.task_manager.add_log(task_id, f"Starting to scrape {url}", url=url, event="scrape_started")
+                try:
+                    await page.goto(url, timeout=45000, wait_until="domcontentloaded")
+                except Exception as nav_err:
+                    self.task_manager.add_log(task_id, f"Initial navigation failed for {url}: {nav_err}. Retrying with longer timeout.",
+                                              level="warning", url=url, event="navigation_retry")
+                    try:
+                        await page.goto(url, timeout=70000, wait_until="domcontentloaded")
+                    except Exception as retry_err:
+                        self.task_manager.add_log(task_id, f"Retry navigation failed: {retry_err}. Proceeding with partial page.",
+                                                  level="warning", url=url, event="navigation_failed")
+
+                on_jobs_found = self._make_job_callback(task_id, url)
+                jobs = await strategy.scrape_async(page, url, on_jobs_found=on_jobs_found)
+
+                try:
+                    page_title = await page.title()
+                except Exception:
+                    page_title = ""
+                return self._build_result(task_id, url, strategy, jobs, page_title, blocker)
+            except Exception as e:
+                return self._error_result(task_id, url, e)
+            finally:
+                await page.close()
+                await context.close()
@@ -0,0 +1,208 @@
+from playwright.sync_api import sync_playwright
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Set
+import logging
+import os
+import queue
+import threading
+
+try:
+    import psutil
+except ImportError:  # Memory based recycling is skipped without psutil
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = int(os.environ.get("SCRAPER_GLOBAL_CONCURRENCY", "6"))
+MAX_PAGES_PER_BROWSER = int(os.environ.get("SCRAPER_BROWSER_MAX_PAGES", "50"))
+MAX_MEMORY_MB = int(os.environ.get("SCRAPER_BROWSER_MAX_MEMORY_MB", "1500"))
+
+LAUNCH_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--no-sandbox',
+    '--disable-setuid-sandbox'
+]
+
+class BrowserPool:
+    """Warm Chromium processes shared by every scraping task.
+
+    Playwright's sync API is bound to the thread that started it, so each
+    browser lives on its own worker thread and work is handed over through a
+    queue. ``submit(fn, *args)`` runs ``fn(browser, *args)`` on the next free
+    browser and returns a Future. Browsers are relaunched after
+    ``max_pages`` scrapes or once their process tree grows past
+    ``max_memory_mb``.
+    """
+
+    def __init__(self, size: int = POOL_SIZE, max_pages: int = MAX_PAGES_PER_BROWSER,
+                 max_memory_mb: int = MAX_MEMORY_MB, launch_args: Optional[List[str]] = None):
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.launch_args = launch_args or LAUNCH_ARGS
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._workers: List[threading.Thread] = []
+        self._alive = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self):
+        with self._lock:
+            # Also restarts the pool if every worker died
+            if self._alive > 0 or self._closed:
+                return
+            self._workers = []
+            for i in range(self.size):
+                t = threading.Thread(target=self._worker, args=(i,), name=f"browser-pool-{i}", daemon=True)
+                t.start()
+                self._workers.append(t)
+            self._alive = self.size
+            logger.info(f"[BrowserPool] Started {self.size} browser workers")
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        if self._closed:
+            raise RuntimeError("Browser pool is shut down")
+        self.start()
+        future: Future = Future()
+        self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def shutdown(self, wait: bool = True, timeout: float = 30.0):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+        # Cancel work nobody has picked up yet
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item:
+                item[0].cancel()
+        for _ in workers:
+            self._queue.put(None)
+        if wait:
+            for t in workers:
+                t.join(timeout=timeout)
+        logger.info("[BrowserPool] Shut down")
+
+    def _launch(self, playwright):
+        # Every worker runs its own Playwright driver and the browsers it launches are
+        # direct children of that process, whatever the other workers start meanwhile
+        driver = self._driver_pid(playwright)
+        before = self._child_pids(driver)
+        browser = playwright.chromium.launch(headless=True, args=self.launch_args)
+        return browser, self._child_pids(driver) - before
+
+    def _worker(self, index: int):
+        try:
+            with sync_playwright() as playwright:
+                browser, pids, pages = None, set(), 0
+                try:
+                    # Warm up before the first request arrives
+                    browser, pids = self._launch(playwright)
+                except Exception as e:
+                    logger.error(f"[BrowserPool] Worker {index} failed to launch browser: {e}")
+
+                while True:
+                    item = self._queue.get()
+                    if item is None:
+                        break
+                    future, fn, args, kwargs = item
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        if browser is None or not browser.is_connected():
+                            browser, pids = self._launch(playwright)
+                            pages = 0
+                        future.set_result(fn(browser, *args, **kwargs))
+                    except BaseException as e:
+                        future.set_exception(e)
+                    pages += 1
+
+                    if browser is not None and self._should_recycle(pages, pids):
+                        logger.info(f"[BrowserPool] Recycling browser of worker {index} after {pages} pages")
+                        self._close(browser)
+                        browser, pids, pages = None, set(), 0
+
+                if browser is not None:
+                    self._close(browser)
+        except Exception as e:
+            logger.error(f"[BrowserPool] Worker {index} crashed: {e}")
+            self._worker_died(e)
+            return
+        with self._lock:
+            self._alive -= 1
+
+    def _worker_died(self, error: Exception):
+        with self._lock:
+            self._alive -= 1
+            last = self._alive <= 0
+        if not last:
+            return
+        # Nobody is left to run queued work, fail it instead of hanging callers
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item and item[0].set_running_or_notify_cancel():
+                item[0].set_exception(error)
+
+    def _should_recycle(self, pages: int, pids: Set[int]) -> bool:
+        if self.max_pages and pages >= self.max_pages:
+            return True
+        if self.max_memory_mb and pids:
+            rss_mb = self._rss_bytes(pids) / (1024 * 1024)
+            if rss_mb >= self.max_memory_mb:
+                logger.info(f"[BrowserPool] Browser using {rss_mb:.0f}MB, over {self.max_memory_mb}MB limit")
+                return True
+        return False
+
+    @staticmethod
+    def _close(browser):
+        try:
+            browser.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _driver_pid(playwright) -> Optional[int]:
+        # Not public API, memory based recycling is skipped if it moves
+        try:
+            return playwright._impl_obj._connection._transport._proc.pid
+        except AttributeError:
+            return None
+
+    @staticmethod
+    def _child_pids(pid: Optional[int]) -> Set[int]:
+        if psutil is None or pid is None:
+            return set()
+        try:
+            return {p.pid for p in psutil.Process(pid).children()}
+        except Exception:
+            return set()
+
+    @staticmethod
+    def _rss_bytes(roots: Set[int]) -> int:
+        if psutil is None:
+            return 0
+        seen, total = set(), 0
+        for pid in roots:
+            try:
+                root = psutil.Process(pid)
+                procs = [root] + root.children(recursive=True)
+            except Exception:
+                continue
+            for proc in procs:
+                if proc.pid in seen:
+                    continue
+                seen.add(proc.pid)
+                try:
+                    total += proc.memory_info().rss
+                except Exception:
+                    # Renderer processes come and go while we measure
+                    continue
+        return total
@@ -0,0 +1,211 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+import re
+import time
+
+# Job fields that may hold a posting time, most reliable first
+POSTED_KEYS = ("posted_at", "posted", "date", "age", "age_text")
+# posted_precision of a job whose posting time could not be parsed, so it is not parsed again
+UNPARSED = "unparsed"
+
+# Seconds per unit, keyed by every spelling we accept (English, French, German, Spanish)
+_UNITS = {
+    "second": 1, "seconds": 1, "seconde": 1, "secondes": 1,
+    "sekunde": 1, "sekunden": 1, "segundo": 1, "segundos": 1,
+    "minute": 60, "minutes": 60, "minuten": 60, "minuto": 60, "minutos": 60,
+    "hour": 3600, "hours": 3600, "heure": 3600, "heures": 3600,
+    "stunde": 3600, "stunden": 3600, "hora": 3600, "horas": 3600,
+    "day": 86400, "days": 86400, "jour": 86400, "jours": 86400,
+    "tag": 86400, "tage": 86400, "tagen": 86400, "día": 86400, "días": 86400, "dia": 86400, "dias": 86400,
+    "week": 604800, "weeks": 604800, "semaine": 604800, "semaines": 604800,
+    "woche": 604800, "wochen": 604800, "semana": 604800, "semanas": 604800,
+    "month": 2592000, "months": 2592000, "mois": 2592000,
+    "monat": 2592000, "monate": 2592000, "monaten": 2592000, "mes": 2592000, "meses": 2592000,
+    "year": 31536000, "years": 31536000, "an": 31536000, "ans": 31536000, "année": 31536000, "années": 31536000,
+    "jahr": 31536000, "jahre": 31536000, "jahren": 31536000, "año": 31536000, "años": 31536000,
+}
+# Abbreviations only count after digits ("3d", "2 hrs"): "a d" or "an h" is ordinary text
+_SHORT_UNITS = {
+    "sec": 1, "secs": 1, "min": 60, "mins": 60, "h": 3600, "hr": 3600, "hrs": 3600,
+    "d": 86400, "wk": 604800, "wks": 604800, "mo": 2592000,
+}
+_ALL_UNITS = {**_UNITS, **_SHORT_UNITS}
+# Precision reported for a relative date, by unit size
+_PRECISION = {1: "minute", 60: "minute", 3600: "hour", 86400: "day", 604800: "week",
+              2592000: "month", 31536000: "year"}
+
+_WORD_NUMBERS = {"a": 1, "an": 1, "one": 1, "un": 1, "une": 1, "ein": 1, "einem": 1, "einer": 1,
+                 "uno": 1, "una": 1}
+
+def _alternation(words) -> str:
+    return "|".join(sorted(map(re.escape, words), key=len, reverse=True))
+
+# "<number> <unit>": digits with any unit, or a spelled-out one with a full unit name
+_AMOUNT = (rf"(?:(\d+)\+?\s*({_alternation(_ALL_UNITS)})"
+           rf"|(a|an|one|un|une|ein|einem|einer|uno|una)\s+({_alternation(_UNITS)}))")
+
+# "3 days ago", "posted 2 hours ago", "30+ days ago", "il y a 3 jours", "vor 3 Tagen", "hace 3 días"
+_RELATIVE_RES = [
+    re.compile(rf"\bil y a\s+{_AMOUNT}\b"),
+    re.compile(rf"\bvor\s+{_AMOUNT}\b"),
+    re.compile(rf"\bhace\s+{_AMOUNT}\b"),
+    re.compile(rf"\b{_AMOUNT}\.?\s*ago\b"),
+]
+# "3 days" only counts when the text says it is about posting
+_LOOSE_RELATIVE_RE = re.compile(rf"\b{_AMOUNT}\b")
+_LOOSE_HINTS = ("posted", "ago", "since", "updated", "publié", "depuis", "veröffentlicht", "publicado")
+
+# Phrases meaning "now" / "today" / "yesterday"
+_NOW_RE = re.compile(r"\b(just posted|just now|recently posted|à l'instant|a l'instant|gerade eben|justo ahora)\b")
+_TODAY_RE = re.compile(r"\b(today|aujourd'hui|aujourd’hui|heute|hoy)\b")
+# French "hier" is left out, it is also German for "here"
+_YESTERDAY_RE = re.compile(r"\b(yesterday|gestern|ayer)\b")
+
+_MONTHS = {
+    "jan": 1, "january": 1, "janvier": 1, "januar": 1, "enero": 1, "ene": 1,
+    "feb": 2, "february": 2, "février": 2, "fevrier": 2, "févr": 2, "fév": 2, "februar": 2, "febrero": 2,
+    "mar": 3, "march": 3, "mars": 3, "märz": 3, "marzo": 3,
+    "apr": 4, "april": 4, "avril": 4, "avr": 4, "abril": 4, "abr": 4,
+    "may": 5, "mai": 5, "mayo": 5,
+    "jun": 6, "june": 6, "juin": 6, "juni": 6, "junio": 6,
+    "jul": 7, "july": 7, "juillet": 7, "juil": 7, "juli": 7, "julio": 7,
+    # Spanish "ago." is left out, it would read "3 days ago" as a date in August
+    "aug": 8, "august": 8, "août": 8, "aout": 8, "agosto": 8,
+    "sep": 9, "sept": 9, "september": 9, "septembre": 9, "septiembre": 9,
+    "oct": 10, "october": 10, "octobre": 10, "oktober": 10, "octubre": 10, "okt": 10,
+    "nov": 11, "november": 11, "novembre": 11, "noviembre": 11,
+    "dec": 12, "december": 12, "décembre": 12, "decembre": 12, "déc": 12, "dezember": 12, "diciembre": 12, "dez": 12, "dic": 12,
+}
+_MONTH_PATTERN = "|".join(sorted(map(re.escape, _MONTHS), key=len, reverse=True))
+
+# Matched against lowercased text, hence "t" and "z"
+_ISO_RE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})(?:[t ](\d{2}):(\d{2})(?::(\d{2})(?:\.\d+)?)?\s*(z|[+-]\d{2}:?\d{2})?)?")
+# "May 1, 2024", "Sept. 3 2024"
+_MONTH_FIRST_RE = re.compile(rf"\b({_MONTH_PATTERN})\.?\s+(\d{{1,2}})(?:st|nd|rd|th)?,?\s+(\d{{4}})\b")
+# "1 May 2024", "3 septembre 2024", "1er mai 2024", "3. März 2024", "3 de mayo de 2024"
+_DAY_FIRST_RE = re.compile(rf"\b(\d{{1,2}})(?:er|st|nd|rd|th|\.)?\s+(?:de\s+)?({_MONTH_PATTERN})\.?,?\s+(?:de\s+)?(\d{{4}})\b")
+
+def _aware(value: datetime) -> datetime:
+    # Naive datetimes from strategies are treated as UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+def _relative(match: "re.Match", now: float) -> Tuple[float, str]:
+    digits, short_unit, word, unit = match.groups()
+    if digits is not None:
+        count, seconds = int(digits), _ALL_UNITS[short_unit]
+    else:
+        count, seconds = _WORD_NUMBERS[word], _UNITS[unit]
+    return now - count * seconds, _PRECISION[seconds]
+
+def _parse_absolute(text: str) -> Optional[Tuple[float, str]]:
+    m = _ISO_RE.search(text)
+    if m:
+        year, month, day, hour, minute, second, tz = m.groups()
+        try:
+            if hour is None:
+                return datetime(int(year), int(month), int(day), tzinfo=timezone.utc).timestamp(), "day"
+            offset = timezone.utc
+            if tz and tz != "z":
+                sign = -1 if tz[0] == "-" else 1
+                digits = tz[1:].replace(":", "")
+                offset = timezone(sign * timedelta(hours=int(digits[:2]), minutes=int(digits[2:])))
+            value = datetime(int(year), int(month), int(day), int(hour), int(minute), int(second or 0), tzinfo=offset)
+            return value.timestamp(), "exact"
+        except ValueError:
+            return None
+    for regex, order in ((_MONTH_FIRST_RE, "mdy"), (_DAY_FIRST_RE, "dmy")):
+        m = regex.search(text)
+        if m:
+            first, second, year = m.groups()
+            month, day = (first, second) if order == "mdy" else (second, first)
+            try:
+                return datetime(int(year), _MONTHS[month], int(day), tzinfo=timezone.utc).timestamp(), "day"
+            except ValueError:
+                return None
+    return None
+
+def parse_posted(value: Any, now: Optional[float] = None) -> Optional[Tuple[float, str]]:
+    """Parse one posting time into ``(utc_timestamp, precision)``, or None.
+
+    Accepts datetime/date objects, epoch numbers (seconds or milliseconds),
+    ISO 8601 and written-out absolute dates, and relative phrases such as
+    "3 days ago", "30+ days ago", "il y a 2 semaines", "vor 3 Tagen" or
+    "hace 5 días". Precision is "exact", "minute", "hour", "day", "week",
+    "month" or "year".
+    """
+    if value is None or value == "":
+        return None
+    now = time.time() if now is None else now
+    if isinstance(value, datetime):
+        # Strategies build dates with fromisoformat(ds[:10]): midnight means day precision
+        day_only = value.tzinfo is None and value.time() == datetime.min.time()
+        return _aware(value).timestamp(), "day" if day_only else "exact"
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day, tzinfo=timezone.utc).timestamp(), "day"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # Milliseconds since the epoch are common in JSON APIs
+        return (value / 1000 if value > 1e11 else float(value)), "exact"
+    if not isinstance(value, str):
+        return None
+
+    text = value.strip().lower()
+    if not text:
+        return None
+    if text.isdigit() and len(text) in (10, 13):
+        return parse_posted(int(text), now)
+    if _NOW_RE.search(text):
+        return now, "minute"
+    for regex in _RELATIVE_RES:
+        m = regex.search(text)
+        if m:
+            return _relative(m, now)
+    absolute = _parse_absolute(text)
+    if absolute:
+        return absolute
+    if _TODAY_RE.search(text):
+        return now, "day"
+    if _YESTERDAY_RE.search(text):
+        return now - 86400, "day"
+    if any(hint in text for hint in _LOOSE_HINTS):
+        m = _LOOSE_RELATIVE_RE.search(text)
+        if m:
+            return _relative(m, now)
+    return None
+
+def normalize_job(job: Dict[str, Any], now: Optional[float] = None) -> Optional[float]:
+    """Set ``posted_ts`` (UTC epoch seconds or None) and ``posted_precision`` on a job.
+
+    Each posting is parsed once however many times it goes through
+    filtering: a failed parse is remembered as ``posted_precision`` UNPARSED.
+    merge_job() forgets both when an update brings a new posting time.
+    """
+    if job.get("posted_ts") is not None:
+        return job["posted_ts"]
+    if job.get("posted_precision") == UNPARSED:
+        return None
+    now = time.time() if now is None else now
+    for key in POSTED_KEYS:
+        parsed = parse_posted(job.get(key), now)
+        if parsed:
+            job["posted_ts"], job["posted_precision"] = parsed
+            return job["posted_ts"]
+    job["posted_ts"] = None
+    job["posted_precision"] = UNPARSED
+    return None
+
+def merge_job(job: Dict[str, Any], fields: Dict[str, Any]) -> None:
+    """``job.update(fields)``; a new posting time drops the normalized one so it is parsed again."""
+    if any(key in fields for key in POSTED_KEYS) and "posted_ts" not in fields:
+        job.pop("posted_ts", None)
+        job.pop("posted_precision", None)
+    job.update(fields)
+
+def normalize_jobs(jobs: Iterable[Dict[str, Any]], now: Optional[float] = None) -> None:
+    now = time.time() if now is None else now
+    for job in jobs:
+        normalize_job(job, now)
+
+def to_iso(ts: Optional[float]) -> Optional[str]:
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
@@ -0,0 +1,535 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from .http_client import HttpClient, get_http_client, USER_AGENT, DEFAULT_TIMEOUT
+from .seen_jobs import get_seen_index
+from .dates import merge_job
+from . import http_cache
+
+try:
+    import httpx
+except ImportError:  # Only the threaded backend is available without httpx
+    httpx = None
+
+try:
+    import h2  # noqa: F401
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+logger = logging.getLogger(__name__)
+# httpx logs every request at INFO, far too chatty for thousands of detail pages
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+DETAIL_WORKERS = int(os.environ.get("SCRAPER_DETAIL_WORKERS", "10"))
+MAX_PER_HOST = int(os.environ.get("SCRAPER_DETAIL_PER_HOST", "4"))
+RPS_PER_HOST = float(os.environ.get("SCRAPER_DETAIL_RPS", "5"))
+# "threads" or "async"; strategies can override it with their detail_backend attribute
+DETAIL_BACKEND = os.environ.get("SCRAPER_DETAIL_BACKEND", "threads")
+# Requests in flight at once across every host for the async backend
+ASYNC_DETAIL_CONCURRENCY = int(os.environ.get("SCRAPER_ASYNC_DETAIL_CONCURRENCY", "64"))
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Browser tabs used by the Playwright detail stage for each listing
+DETAIL_PAGES = int(os.environ.get("SCRAPER_DETAIL_PAGES", "4"))
+# Enriched jobs are streamed in batches of this many, or after this many seconds
+STREAM_BATCH = int(os.environ.get("SCRAPER_DETAIL_STREAM_BATCH", "25"))
+STREAM_INTERVAL = float(os.environ.get("SCRAPER_DETAIL_STREAM_INTERVAL", "2"))
+
+# extract(page, job) -> same contract as DetailParser, for an already loaded page
+PageExtractor = Callable[[Any, Dict[str, Any]], Optional[Dict[str, Any]]]
+# parse(job, response) -> fields to merge into the job, or None if nothing was found
+DetailParser = Callable[[Dict[str, Any], Any], Optional[Dict[str, Any]]]
+# (job, target url, parsed fields, request latency, error, cache outcome)
+FetchOutcome = Tuple[Dict[str, Any], str, Optional[Dict[str, Any]], Optional[float], Any, Optional[str]]
+
+class HostLimiter:
+    """Caps concurrent requests and requests per second for each host."""
+
+    def __init__(self, max_per_host: int = MAX_PER_HOST, rps_per_host: float = RPS_PER_HOST):
+        self.max_per_host = max(1, max_per_host)
+        self.min_interval = 1.0 / rps_per_host if rps_per_host > 0 else 0.0
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, url: str):
+        """Hold one of the host's connection slots, starting no sooner than its rate allows."""
+        host = (urlparse(url).hostname or "").lower()
+        with self._semaphore(host):
+            delay = self._reserve_start(host)
+            if delay > 0:
+                time.sleep(delay)
+            yield
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            sem = self._semaphores.get(host)
+            if sem is None:
+                sem = self._semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return sem
+
+    def _reserve_start(self, host: str) -> float:
+        # Hands out evenly spaced start times, returns how long the caller must wait
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.min_interval
+            return start - now
+
+# Shared by every strategy so two tasks hitting the same board respect one budget
+host_limiter = HostLimiter()
+
+class DetailFetcher:
+    """Reusable "enrich details" stage for job lists.
+
+    Fetches each job's detail URL concurrently through the shared HTTP client,
+    hands the response to a strategy-specific parser, merges the parsed
+    fields into the job and streams it through ``on_jobs_found``. Jobs already
+    enriched recently (see seen_jobs) are served from the index instead.
+    Skipped/fetched, success and latency counts are written to
+    ``stats["details"][backend]``.
+    """
+
+    backend = "threads"
+
+    def __init__(self, http: Optional[HttpClient] = None, max_workers: int = DETAIL_WORKERS,
+                 limiter: Optional[HostLimiter] = None):
+        self.http = http or get_http_client()
+        self.max_workers = max(1, max_workers)
+        self.limiter = limiter or host_limiter
+
+    def enrich(self, jobs: List[Dict[str, Any]], parse: DetailParser, on_jobs_found=None,
+               stats: Optional[Dict[str, Any]] = None, url_for: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None,
+               ttl_hours: Optional[float] = None, cache_max_age: Optional[float] = None, **request_kwargs) -> int:
+        """Fetch and parse details for ``jobs`` in place. Returns the number enriched.
+
+        Jobs enriched within ``ttl_hours`` (seen-jobs index default, 0 disables)
+        get their cached fields back without a request. Responses go through
+        the HTTP cache; ``cache_max_age`` (seconds) overrides the server's
+        max-age for the platform.
+        """
+        run = _DetailRun(jobs, url_for, on_jobs_found, stats, ttl_hours, self.backend)
+        pending = run.take_cached()
+        if pending:
+            for job, target, fields, elapsed, error, cached in self._fetch_all(pending, parse, cache_max_age, request_kwargs):
+                run.record(job, target, fields, elapsed, error, cached)
+        return run.finish()
+
+    def _fetch_all(self, targets: List[Tuple[Dict[str, Any], str]], parse: DetailParser,
+                   cache_max_age: Optional[float], request_kwargs: Dict[str, Any]) -> Iterator[FetchOutcome]:
+        """Yield ``(job, target, fields, elapsed, error, cache outcome)`` in completion order."""
+        cache = http_cache.get_http_cache()
+
+        def fetch(job: Dict[str, Any], target: str):
+            key, entry, resp = http_cache.lookup(cache, target, request_kwargs.get("headers"), cache_max_age)
+            if resp is not None:
+                return parse(job, resp), None, None, "hit"
+            kwargs = request_kwargs
+            if entry is not None:
+                kwargs = dict(request_kwargs, headers={**request_kwargs.get("headers", {}), **entry.validators()})
+            with self.limiter.slot(target):
+                t0 = time.monotonic()
+                resp = self.http.get(target, **kwargs)
+                elapsed = time.monotonic() - t0
+            resp, cached = http_cache.store(cache, key, entry, resp, cache_max_age)
+            if resp.status_code != 200:
+                return None, elapsed, f"HTTP {resp.status_code}", cached
+            return parse(job, resp), elapsed, None, cached
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(targets))) as executor:
+            futures = {executor.submit(fetch, job, target): (job, target) for job, target in targets}
+            for future in as_completed(futures):
+                job, target = futures[future]
+                try:
+                    fields, elapsed, error, cached = future.result()
+                except Exception as e:
+                    fields, elapsed, error, cached = None, None, e, None
+                yield job, target, fields, elapsed, error, cached
+
+class AsyncHostLimiter:
+    """asyncio counterpart of HostLimiter, must be used from a single event loop."""
+
+    def __init__(self, max_per_host: int = MAX_PER_HOST, rps_per_host: float = RPS_PER_HOST):
+        self.max_per_host = max(1, max_per_host)
+        self.min_interval = 1.0 / rps_per_host if rps_per_host > 0 else 0.0
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        host = (urlparse(url).hostname or "").lower()
+        sem = self._semaphores.get(host)
+        if sem is None:
+            sem = self._semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        async with sem:
+            # No lock needed, the loop runs one coroutine at a time
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.min_interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+class AsyncDetailFetcher(DetailFetcher):
+    """Detail stage backed by httpx on a dedicated asyncio loop.
+
+    Hundreds of detail requests can be in flight without a thread each, and
+    HTTP/2 is negotiated when ``h2`` is installed so one connection per host
+    multiplexes them. Responses are parsed and streamed on the calling
+    thread as they arrive, so ``enrich()`` behaves exactly like the threaded
+    stage. Use ``get_detail_fetcher("async")`` to share one loop and
+    connection pool across strategies.
+    """
+
+    backend = "async"
+
+    def __init__(self, max_in_flight: int = ASYNC_DETAIL_CONCURRENCY, max_per_host: int = MAX_PER_HOST,
+                 rps_per_host: float = RPS_PER_HOST, retries: int = 3, backoff_factor: float = 0.5,
+                 timeout: float = DEFAULT_TIMEOUT):
+        if httpx is None:
+            raise RuntimeError("httpx is required for the async detail backend")
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_per_host = max_per_host
+        self.rps_per_host = rps_per_host
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self._clients: Dict[bool, Any] = {}
+        self._limiter: Optional[AsyncHostLimiter] = None
+        self._in_flight: Optional[asyncio.Semaphore] = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    # Loop bound primitives have to be created on the loop thread
+                    self._limiter = AsyncHostLimiter(self.max_per_host, self.rps_per_host)
+                    self._in_flight = asyncio.Semaphore(self.max_in_flight)
+                    ready.set()
+                    loop.run_forever()
+
+                threading.Thread(target=run, name="async-detail-loop", daemon=True).start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def _client(self, verify: bool):
+        # verify is a client setting in httpx, keep one client per mode
+        client = self._clients.get(verify)
+        if client is None:
+            client = self._clients[verify] = httpx.AsyncClient(
+                http2=HTTP2,
+                verify=verify,
+                follow_redirects=True,
+                headers={"User-Agent": USER_AGENT},
+                limits=httpx.Limits(max_connections=self.max_in_flight,
+                                    max_keepalive_connections=self.max_in_flight),
+            )
+        return client
+
+    async def _get(self, url: str, verify: bool = True, timeout: Optional[float] = None, **kwargs):
+        client = self._client(verify)
+        for attempt in range(self.retries + 1):
+            try:
+                resp = await client.get(url, timeout=timeout or self.timeout, **kwargs)
+            except httpx.TransportError:
+                if attempt == self.retries:
+                    raise
+            else:
+                if resp.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return resp
+                retry_after = resp.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    await asyncio.sleep(int(retry_after))
+                    continue
+            await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+
+    async def _fetch_one(self, target: str, cache_max_age: Optional[float], request_kwargs: Dict[str, Any]):
+        loop = asyncio.get_running_loop()
+        # SQLite reads and writes (and decompressing bodies) would stall every request on the loop
+        cache = await loop.run_in_executor(None, http_cache.get_http_cache)
+        key, entry, resp = await loop.run_in_executor(
+            None, http_cache.lookup, cache, target, request_kwargs.get("headers"), cache_max_age
+        )
+        if resp is not None:
+            return resp, None, "hit"
+        kwargs = request_kwargs
+        if entry is not None:
+            kwargs = dict(request_kwargs, headers={**request_kwargs.get("headers", {}), **entry.validators()})
+        async with self._in_flight:
+            async with self._limiter.slot(target):
+                t0 = time.monotonic()
+                resp = await self._get(target, **kwargs)
+                elapsed = time.monotonic() - t0
+        resp, cached = await loop.run_in_executor(None, http_cache.store, cache, key, entry, resp, cache_max_age)
+        return resp, elapsed, cached
+
+    async def _fetch_into(self, targets: List[Tuple[Dict[str, Any], str]], cache_max_age: Optional[float],
+                          request_kwargs: Dict[str, Any], results: "queue.Queue"):
+        async def run(index: int, target: str):
+            try:
+                resp, elapsed, cached = await self._fetch_one(target, cache_max_age, request_kwargs)
+                results.put((index, resp, elapsed, None, cached))
+            except Exception as e:
+                results.put((index, None, None, e, None))
+
+        await asyncio.gather(*(run(i, target) for i, (_, target) in enumerate(targets)))
+
+    def _fetch_all(self, targets: List[Tuple[Dict[str, Any], str]], parse: DetailParser,
+                   cache_max_age: Optional[float], request_kwargs: Dict[str, Any]) -> Iterator[FetchOutcome]:
+        results: "queue.Queue" = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(
+            self._fetch_into(targets, cache_max_age, request_kwargs, results), self._ensure_loop()
+        )
+        try:
+            for _ in targets:
+                index, resp, elapsed, error, cached = results.get()
+                job, target = targets[index]
+                if error is None and resp.status_code != 200:
+                    error = f"HTTP {resp.status_code}"
+                fields = None
+                if error is None:
+                    try:
+                        fields = parse(job, resp)
+                    except Exception as e:
+                        error = e
+                yield job, target, fields, elapsed, error, cached
+        finally:
+            # Consumer stopped early, don't leave requests running in the background
+            if not future.done():
+                future.cancel()
+
+    def close(self):
+        if self._loop is None:
+            return
+
+        async def close_clients():
+            for client in self._clients.values():
+                await client.aclose()
+            self._clients.clear()
+
+        asyncio.run_coroutine_threadsafe(close_clients(), self._loop).result(timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+class PageDetailFetcher:
+    """Detail stage for boards that only render in a browser.
+
+    Opens ``pages`` tabs in the listing page's context, so cookies, consent
+    and route blocking carry over, and keeps them all navigating at once:
+    each tab starts its next job as soon as the previous one was extracted.
+    Navigation is started with ``wait_until="commit"`` and awaited later, so
+    while one tab is being read the others keep loading in the browser.
+    Counters are reported like DetailFetcher's.
+    """
+
+    def __init__(self, page, pages: int = DETAIL_PAGES, wait_selector: Optional[str] = None,
+                 load_state: str = "domcontentloaded", timeout: int = 30000, selector_timeout: int = 5000):
+        self.context = page.context
+        self.pages = max(1, pages)
+        self.wait_selector = wait_selector
+        self.load_state = load_state
+        self.timeout = timeout
+        self.selector_timeout = selector_timeout
+
+    def enrich(self, jobs: List[Dict[str, Any]], extract: PageExtractor, on_jobs_found=None,
+               stats: Optional[Dict[str, Any]] = None, url_for: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None,
+               ttl_hours: Optional[float] = None) -> int:
+        """Load each job's detail page and merge what ``extract(page, job)`` returns."""
+        run = _DetailRun(jobs, url_for, on_jobs_found, stats, ttl_hours, "browser")
+        pending = deque(run.take_cached())
+        if not pending:
+            return run.finish()
+
+        tabs = []
+        # In flight navigations in the order they were started
+        active = deque()
+
+        def start_next(tab) -> None:
+            while pending:
+                job, target = pending.popleft()
+                t0 = time.monotonic()
+                try:
+                    tab.goto(target, wait_until="commit", timeout=self.timeout)
+                except Exception as e:
+                    run.record(job, target, None, None, f"navigation failed: {e}")
+                    continue
+                active.append((tab, job, target, t0))
+                return
+
+        try:
+            for _ in range(min(self.pages, len(pending))):
+                tabs.append(self.context.new_page())
+            for tab in tabs:
+                start_next(tab)
+
+            while active:
+                tab, job, target, t0 = active.popleft()
+                fields, error = None, None
+                try:
+                    tab.wait_for_load_state(self.load_state, timeout=self.timeout)
+                    if self.wait_selector:
+                        try:
+                            tab.wait_for_selector(self.wait_selector, timeout=self.selector_timeout)
+                        except Exception:
+                            # Proceed anyway, the extractor has its own fallbacks
+                            pass
+                    fields = extract(tab, job)
+                except Exception as e:
+                    error = e
+                run.record(job, target, fields, time.monotonic() - t0, error)
+                start_next(tab)
+        finally:
+            for tab in tabs:
+                try:
+                    tab.close()
+                except Exception:
+                    pass
+
+        return run.finish()
+
+class _DetailRun:
+    """Bookkeeping shared by the detail stages for one enrich() call.
+
+    Resolves targets, serves jobs already in the seen-jobs index, merges and
+    streams fetched fields in batches, then writes counters to
+    ``stats["details"]`` and remembers what was fetched.
+    """
+
+    def __init__(self, jobs: List[Dict[str, Any]], url_for, on_jobs_found, stats: Optional[Dict[str, Any]],
+                 ttl_hours: Optional[float], backend: str):
+        self.targets = []
+        for job in jobs:
+            target = url_for(job) if url_for else job.get("link")
+            if target:
+                self.targets.append((job, target))
+        self.on_jobs_found = on_jobs_found
+        self.stats = stats
+        self.ttl_hours = ttl_hours
+        self.backend = backend
+        self.seen = get_seen_index() if ttl_hours != 0 else None
+        self.counters = {"requested": len(self.targets), "skipped": 0, "fetched": 0,
+                         "succeeded": 0, "failed": 0, "empty": 0}
+        self.cache = {"hit": 0, "miss": 0, "revalidated": 0}
+        self.latencies: List[float] = []
+        self.keys: Dict[int, Tuple[str, str]] = {}
+        self.fresh: List[Tuple[str, str, Dict[str, Any]]] = []
+        self.started = time.monotonic()
+        self.unstreamed: List[Dict[str, Any]] = []
+        self.streamed_at = self.started
+
+    def take_cached(self) -> List[Tuple[Dict[str, Any], str]]:
+        """Apply cached details and return the targets that still need fetching."""
+        if self.seen is None or not self.targets:
+            return list(self.targets)
+        try:
+            lookups = self.seen.lookup([job for job, _ in self.targets], self.ttl_hours)
+        except Exception as e:
+            logger.warning(f"Seen-jobs lookup failed, fetching everything: {e}")
+            return list(self.targets)
+
+        pending, cached = [], []
+        for (job, target), (key, card, fields) in zip(self.targets, lookups):
+            if fields:
+                merge_job(job, fields)
+                cached.append(job)
+            else:
+                self.keys[id(job)] = (key, card)
+                pending.append((job, target))
+        self.counters["skipped"] = len(cached)
+        if cached:
+            logger.info(f"Skipping detail fetch for {len(cached)} jobs enriched recently")
+            if self.on_jobs_found:
+                self.on_jobs_found(cached, stats=self.stats)
+        return pending
+
+    def record(self, job: Dict[str, Any], target: str, fields: Optional[Dict[str, Any]],
+               elapsed: Optional[float], error: Any, cached: Optional[str] = None):
+        self.counters["fetched"] += 1
+        if cached:
+            self.cache[cached] += 1
+        if elapsed is not None:
+            self.latencies.append(elapsed)
+        if error is not None:
+            self.counters["failed"] += 1
+            logger.warning(f"Failed to fetch details for {target}: {error}")
+            return
+        if not fields:
+            self.counters["empty"] += 1
+            return
+        merge_job(job, fields)
+        self.counters["succeeded"] += 1
+        if id(job) in self.keys:
+            self.fresh.append((*self.keys[id(job)], fields))
+        if self.on_jobs_found:
+            self.unstreamed.append(job)
+            if len(self.unstreamed) >= STREAM_BATCH or time.monotonic() - self.streamed_at >= STREAM_INTERVAL:
+                self.stream()
+
+    def stream(self):
+        """Hand the jobs enriched since the last batch to ``on_jobs_found``."""
+        # Streamed from the calling thread, strategies' callbacks need not be thread-safe
+        if self.unstreamed:
+            batch, self.unstreamed = self.unstreamed, []
+            self.on_jobs_found(batch, stats=self.stats)
+        self.streamed_at = time.monotonic()
+
+    def finish(self) -> int:
+        self.stream()
+        if self.seen is not None and self.fresh:
+            try:
+                self.seen.remember(self.fresh)
+            except Exception as e:
+                logger.warning(f"Failed to update seen-jobs index: {e}")
+
+        counters = self.counters
+        if self.stats is not None:
+            report = dict(counters)
+            if self.latencies:
+                report["avg_latency_ms"] = round(sum(self.latencies) / len(self.latencies) * 1000)
+                report["max_latency_ms"] = round(max(self.latencies) * 1000)
+            report["duration_s"] = round(time.monotonic() - self.started, 2)
+            if any(self.cache.values()):
+                report["http_cache"] = dict(self.cache)
+            # Keyed by backend, a strategy may run an HTTP pass and then a browser fallback
+            self.stats.setdefault("details", {})[self.backend] = report
+        if counters["requested"]:
+            logger.info(f"Details for {counters['requested']} jobs ({self.backend}): {counters['skipped']} cached, "
+                        f"{counters['succeeded']}/{counters['fetched']} fetched")
+        return counters["succeeded"] + counters["skipped"]
+
+_async_fetcher: Optional[AsyncDetailFetcher] = None
+_async_fetcher_lock = threading.Lock()
+
+def get_detail_fetcher(backend: str = DETAIL_BACKEND, http: Optional[HttpClient] = None,
+                       max_workers: int = DETAIL_WORKERS) -> DetailFetcher:
+    """Return the detail stage for ``backend`` ("threads" or "async").
+
+    The async backend is a process-wide singleton; without httpx it falls
+    back to the threaded stage.
+    """
+    global _async_fetcher
+    if backend == "async":
+        if httpx is None:
+            logger.warning("httpx is not installed, using the threaded detail fetcher")
+        else:
+            with _async_fetcher_lock:
+                if _async_fetcher is None:
+                    _async_fetcher = AsyncDetailFetcher()
+                return _async_fetcher
+    return DetailFetcher(http=http, max_workers=max_workers)
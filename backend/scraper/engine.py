@@ -1,8 +1,14 @@
-from playwright.sync_api import sync_playwright
+import asyncio
 import logging
 import inspect
-from typing import List, Dict, Any
+import os
+from collections import deque
+from typing import List, Dict, Any, Callable, Optional
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from .browser_pool import BrowserPool
+from .http_client import USER_AGENT
+from .resource_blocker import ResourceBlocker
 from .strategies import get_strategy
 from .task_manager import TaskManager
 from .utils import filter_jobs_by_date
@@ -10,76 +16,194 @@ from .utils import filter_jobs_by_date
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Concurrency limit for approve_all runs: how many URLs one task scrapes at
+# once. The process-wide limit is the size of the browser pool.
+TASK_CONCURRENCY = int(os.environ.get("SCRAPER_TASK_CONCURRENCY", "3"))
+
+CONTEXT_OPTIONS = {
+    "user_agent": USER_AGENT,
+    "viewport": {'width': 1920, 'height': 1080},
+    "ignore_https_errors": True
+}
+
+STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+"""
+
+class ApprovalGate:
+    """Approval decisions for one task, delivered by the HTTP handlers.
+
+    The task worker blocks in ``wait()`` on a condition (or awaits
+    ``wait_async()`` on an event loop) until a decision arrives, so approve /
+    approve all / skip take effect immediately and an idle task costs no CPU
+    and holds no thread. ``approve_all`` and ``stop`` are sticky; single
+    approvals and skips only count while a prompt is open (between
+    ``begin()`` and the decision that answers it), so a double click or a
+    stale request cannot approve a URL nobody has seen yet.
+    """
+
+    APPROVE, SKIP, STOP = "approve", "skip", "stop"
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._decisions = deque()
+        # Wake-up callbacks of coroutines parked in wait_async()
+        self._listeners: List[Any] = []
+        self.approve_all = False
+        self.stopped = False
+        self.prompting = False
+
+    def _notify(self):
+        self._cond.notify_all()
+        for wake in list(self._listeners):
+            wake()
+
+    def begin(self):
+        """Open a prompt; decisions left over from the previous one are dropped."""
+        with self._cond:
+            self._decisions.clear()
+            self.prompting = True
+
+    def post(self, decision: str, accepted: Optional[Callable[[], Any]] = None) -> bool:
+        """Answer the open prompt with approve/skip. False (and ignored) if no prompt
+        is open or it already has its answer.
+
+        ``accepted`` runs before the waiting worker can take the decision, so
+        state it sets is never applied after the worker has moved on.
+        """
+        with self._cond:
+            if not self.prompting or self._decisions:
+                return False
+            if accepted is not None:
+                accepted()
+            self._decisions.append(decision)
+            self._notify()
+            return True
+
+    def release_all(self):
+        with self._cond:
+            self.approve_all = True
+            self._notify()
+
+    def stop(self):
+        with self._cond:
+            self.stopped = True
+            self._notify()
+
+    def _ready(self) -> bool:
+        return bool(self.stopped or self._decisions or self.approve_all)
+
+    def _take(self) -> str:
+        self.prompting = False
+        # Skips queued earlier still win over approve all
+        if self.stopped:
+            return self.STOP
+        if self._decisions:
+            return self._decisions.popleft()
+        return self.APPROVE
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[str]:
+        """Next decision, or None on timeout."""
+        with self._cond:
+            if not self._cond.wait_for(self._ready, timeout):
+                return None
+            return self._take()
+
+    async def wait_async(self) -> str:
+        """Next decision, awaited on the running loop without blocking a thread."""
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # Loop already closed, nobody is waiting anymore
+                pass
+
+        with self._cond:
+            if self._ready():
+                return self._take()
+            self._listeners.append(wake)
+        try:
+            while True:
+                await event.wait()
+                event.clear()
+                with self._cond:
+                    if self._ready():
+                        return self._take()
+        finally:
+            with self._cond:
+                self._listeners.remove(wake)
+
 class ScraperEngine:
-    def __init__(self, task_manager: TaskManager):
+    def __init__(self, task_manager: TaskManager, task_concurrency: int = TASK_CONCURRENCY,
+                 browser_pool: Optional[BrowserPool] = None):
         self.task_manager = task_manager
-        self.approvals: Dict[str, threading.Event] = {}
+        self.task_concurrency = max(1, task_concurrency)
+        self.approvals: Dict[str, ApprovalGate] = {}
+        # Browsers are launched lazily on the first task and reused afterwards
+        self.browser_pool = browser_pool or BrowserPool()
 
     def stop(self):
-        return
-
-    def _scrape_url(self, browser, url: str, task_id: str) -> Dict[str, Any]:
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            viewport={'width': 1920, 'height': 1080},
-            ignore_https_errors=True
-        )
+        self._release_gates()
+        self.browser_pool.shutdown()
+
+    def _release_gates(self):
+        # Wake tasks parked on an approval so their threads can exit
+        for gate in list(self.approvals.values()):
+            gate.stop()
+
+    def _scrape(self, url: str, task_id: str) -> Dict[str, Any]:
+        """Scrape one URL, through the strategy's API when it has one, else on a pooled browser."""
+        strategy, result = self._scrape_direct(url, task_id)
+        if result is not None:
+            return result
+        return self.browser_pool.submit(self._scrape_url, url, task_id, strategy).result()
+
+    def _scrape_direct(self, url: str, task_id: str):
+        """Returns ``(strategy, result)``; result is None when a browser is needed."""
+        strategy = self._prepare_strategy(url, task_id)
+        if not strategy.supports_direct:
+            return strategy, None
+        self.task_manager.add_log(task_id, f"Starting to scrape {url} without a browser", url=url, event="scrape_started")
+        try:
+            jobs = strategy.scrape_direct(url, on_jobs_found=self._make_job_callback(task_id, url))
+        except Exception as e:
+            logger.warning(f"Direct scrape of {url} failed: {e}")
+            jobs = None
+        if jobs is None:
+            self.task_manager.add_log(task_id, f"API not available for {url}, falling back to the browser",
+                                      level="warning", url=url, event="direct_fallback")
+            return strategy, None
+        return strategy, self._build_result(task_id, url, strategy, jobs, page_title="")
+
+    def _scrape_url(self, browser, url: str, task_id: str, strategy=None) -> Dict[str, Any]:
+        strategy = strategy or self._prepare_strategy(url, task_id)
+        context = browser.new_context(**CONTEXT_OPTIONS)
+        blocker = ResourceBlocker.for_strategy(strategy)
+        if blocker:
+            context.route("**/*", blocker.handle)
+        # Anti-detection script, on the context so every page opened in it gets it
+        context.add_init_script(STEALTH_SCRIPT)
         page = context.new_page()
-        
-        # Anti-detection script
-        page.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-        """)
 
         try:
-            self.task_manager.add_log(task_id, f"Starting to scrape {url}")
+            self.task_manager.add_log(task_id, f"Starting to scrape {url}", url=url, event="scrape_started")
             try:
                 page.goto(url, timeout=45000, wait_until="domcontentloaded")
             except Exception as nav_err:
-                self.task_manager.add_log(task_id, f"Initial navigation failed for {url}: {nav_err}. Retrying with longer timeout.")
+                self.task_manager.add_log(task_id, f"Initial navigation failed for {url}: {nav_err}. Retrying with longer timeout.",
+                                          level="warning", url=url, event="navigation_retry")
                 try:
                     page.goto(url, timeout=70000, wait_until="domcontentloaded")
                 except Exception as retry_err:
-                    self.task_manager.add_log(task_id, f"Retry navigation failed: {retry_err}. Proceeding with partial page.")
+                    self.task_manager.add_log(task_id, f"Retry navigation failed: {retry_err}. Proceeding with partial page.",
+                                              level="warning", url=url, event="navigation_failed")
             
-            strategy = get_strategy(url)
-            self.task_manager.add_log(task_id, f"Using {strategy.__class__.__name__} for {url}")
-            import inspect
-            try:
-                self.task_manager.add_log(task_id, f"Strategy file: {inspect.getfile(strategy.__class__)}")
-            except:
-                pass
-            
-            # Initialize streaming result
-            self.task_manager.init_result(task_id, url)
-
-            def _json_safe(items):
-                safe = []
-                for it in items:
-                    ni = {}
-                    for k, v in it.items():
-                        if isinstance(v, dict):
-                            ni[k] = v
-                        elif hasattr(v, "isoformat"):
-                            try:
-                                ni[k] = v.isoformat()
-                            except Exception:
-                                ni[k] = str(v)
-                        else:
-                            ni[k] = v
-                    safe.append(ni)
-                return safe
-
-            def on_jobs_found(new_jobs, stats=None):
-                if not new_jobs: return
-                logger.info(f"[Engine] on_jobs_found called with {len(new_jobs)} jobs")
-                # Relaxed filtering to 30 days to ensure we see more jobs during development
-                filtered = filter_jobs_by_date(new_jobs, hours_back=720, require_date=False)
-                safe_jobs = _json_safe(filtered)
-                self.task_manager.update_result_jobs(task_id, url, safe_jobs, stats=stats)
-                self.task_manager.add_log(task_id, f"Streamed {len(safe_jobs)} new jobs from {url}")
+            on_jobs_found = self._make_job_callback(task_id, url)
 
             sig = inspect.signature(strategy.scrape)
             if "on_jobs_found" in sig.parameters:
@@ -87,110 +211,222 @@ class ScraperEngine:
             else:
                 jobs = strategy.scrape(page, url)
             
-            # Retrieve stats from strategy if available
-            strategy_stats = getattr(strategy, "stats", {})
-            
-            # Relaxed require_date to False and increased window to 30 days
-            filtered_jobs = filter_jobs_by_date(jobs, hours_back=720, require_date=False)
-            filtered_jobs_json = _json_safe(filtered_jobs)
-            jobs_json = _json_safe(jobs)
             try:
                 page_title = page.title()
             except Exception:
                 page_title = ""
-            result = {
-                "url": url,
-                "title": page_title,
-                "status": "success",
-                "jobs": filtered_jobs_json, # Note: this will duplicate if we blindly append in add_result
-                "platform": strategy.__class__.__name__.replace('Strategy', ''),
-                "total_found": len(jobs),
-                "filtered_count": len(filtered_jobs),
-                "jobs_unfiltered": jobs_json,
-                "stats": strategy_stats
-            }
-            self.task_manager.add_log(task_id, f"Successfully scraped {len(jobs)} jobs from {url}, filtered to {len(filtered_jobs)} recent jobs")
-            return result
+            return self._build_result(task_id, url, strategy, jobs, page_title, blocker)
         except Exception as e:
-            error_message = f"Error scraping {url}: {e}"
-            logger.error(error_message)
-            self.task_manager.add_log(task_id, error_message)
-            return {
-                "url": url,
-                "status": "error",
-                "error": str(e),
-                "jobs": []
-            }
+            return self._error_result(task_id, url, e)
         finally:
             page.close()
             context.close()
 
-    def _run_task(self, task_id: str, urls: List[str]) -> None:
+    def _prepare_strategy(self, url: str, task_id: str):
+        strategy = get_strategy(url)
+        self.task_manager.add_log(task_id, f"Using {strategy.__class__.__name__} for {url}")
         try:
-            with sync_playwright() as playwright:
-                browser = playwright.chromium.launch(
-                    headless=True,
-                    args=[
-                        '--disable-blink-features=AutomationControlled',
-                        '--no-sandbox',
-                        '--disable-setuid-sandbox'
-                    ]
-                )
-                try:
-                    for i, url in enumerate(urls):
-                        self.task_manager.add_log(task_id, f"Ready to scrape site {i+1}/{len(urls)}: {url}. Awaiting approval.")
-                        self.task_manager.set_approval(task_id, True, url)
-                        evt = self.approvals.get(task_id)
-                        skip_current = False
-                        if evt:
-                            evt.clear()
-                            while True:
-                                task = self.task_manager.get_task(task_id)
-                                if task and task.approve_all:
-                                    break
-                                if task and task.skip_next:
-                                    self.task_manager.add_log(task_id, f"Skipped site {i+1}/{len(urls)}: {url}")
-                                    self.task_manager.add_result(task_id, {
-                                        "url": url,
-                                        "status": "skipped",
-                                        "jobs": [],
-                                        "platform": get_strategy(url).__class__.__name__.replace('Strategy', '')
-                                    })
-                                    self.task_manager.set_skip_next(task_id, False)
-                                    self.task_manager.set_approval(task_id, False, "")
-                                    skip_current = True
-                                    break
-                                if evt.wait(timeout=0.5):
-                                    break
-                        if skip_current:
-                            continue
-                        self.task_manager.set_approval(task_id, False, "")
-                        self.task_manager.add_log(task_id, f"Approval received. Processing site {i+1}/{len(urls)}: {url}")
-                        result = self._scrape_url(browser, url, task_id)
-                        self.task_manager.add_result(task_id, result)
-                finally:
-                    browser.close()
+            self.task_manager.add_log(task_id, f"Strategy file: {inspect.getfile(strategy.__class__)}")
+        except:
+            pass
+        
+        # Initialize streaming result
+        self.task_manager.init_result(task_id, url)
+        return strategy
+
+    def _make_job_callback(self, task_id: str, url: str):
+        def on_jobs_found(new_jobs, stats=None):
+            if not new_jobs: return
+            logger.info(f"[Engine] on_jobs_found called with {len(new_jobs)} jobs")
+            # Relaxed filtering to 30 days to ensure we see more jobs during development.
+            # This also normalizes posted_ts on the strategy's dicts, so the final
+            # result's filtering reuses it instead of parsing again.
+            filtered = filter_jobs_by_date(new_jobs, hours_back=720, require_date=False)
+            # Shallow copies: the strategy keeps updating its own dicts while it runs
+            streamed = [dict(job) for job in filtered]
+            added, updated = self.task_manager.update_result_jobs(task_id, url, streamed, stats=stats)
+            # Re-sent unchanged jobs are not worth a record in the log buffer
+            if added or updated:
+                self.task_manager.add_log(task_id, f"Streamed {len(streamed)} jobs from {url}: {added} new, {updated} updated",
+                                          level="debug", url=url, event="jobs_streamed", jobs=len(streamed),
+                                          added=added, updated=updated)
+        return on_jobs_found
+
+    def _build_result(self, task_id: str, url: str, strategy, jobs: List[Dict[str, Any]], page_title: str,
+                      blocker: Optional[ResourceBlocker] = None) -> Dict[str, Any]:
+        # Retrieve stats from strategy if available
+        strategy_stats = getattr(strategy, "stats", {})
+        if blocker:
+            strategy_stats["resources"] = blocker.summary()
+        
+        # Relaxed require_date to False and increased window to 30 days
+        # "jobs" is a view on "jobs_unfiltered": the same dicts, not copies.
+        # Dates stay as-is and are serialized with json_default at the API boundary.
+        filtered_jobs = filter_jobs_by_date(jobs, hours_back=720, require_date=False)
+        result = {
+            "url": url,
+            "title": page_title,
+            "status": "success",
+            "jobs": filtered_jobs,
+            "platform": strategy.__class__.__name__.replace('Strategy', ''),
+            "total_found": len(jobs),
+            "filtered_count": len(filtered_jobs),
+            "jobs_unfiltered": jobs,
+            "stats": strategy_stats
+        }
+        self.task_manager.add_log(task_id, f"Successfully scraped {len(jobs)} jobs from {url}, filtered to {len(filtered_jobs)} recent jobs",
+                                  url=url, event="scrape_finished", found=len(jobs), kept=len(filtered_jobs))
+        return result
+
+    def _error_result(self, task_id: str, url: str, error: Exception) -> Dict[str, Any]:
+        error_message = f"Error scraping {url}: {error}"
+        logger.error(error_message)
+        self.task_manager.add_log(task_id, error_message, level="error", url=url, event="scrape_failed")
+        return {
+            "url": url,
+            "status": "error",
+            "error": str(error),
+            "jobs": []
+        }
+
+    def _await_approval(self, task_id: str, index: int, url: str, total: int) -> bool:
+        """Block until the URL is approved. Returns False if it was skipped or the task stopped."""
+        gate = self._open_prompt(task_id, index, url, total)
+        if gate is None:
+            return True
+        return self._close_prompt(task_id, index, url, total, gate.wait())
+
+    def _open_prompt(self, task_id: str, index: int, url: str, total: int) -> Optional[ApprovalGate]:
+        gate = self.approvals.get(task_id)
+        if gate is None:
+            return None
+        # Opened before the UI hears about the prompt, so an immediate click is not rejected
+        gate.begin()
+        self.task_manager.add_log(task_id, f"Ready to scrape site {index+1}/{total}: {url}. Awaiting approval.",
+                                  url=url, event="awaiting_approval")
+        self.task_manager.set_approval(task_id, True, url)
+        return gate
+
+    def _close_prompt(self, task_id: str, index: int, url: str, total: int, decision: str) -> bool:
+        self.task_manager.set_approval(task_id, False, "")
+        self.task_manager.set_skip_next(task_id, False)
+        if decision == ApprovalGate.STOP:
+            self.task_manager.add_log(task_id, f"Task stopped before site {index+1}/{total}: {url}")
+            return False
+        if decision == ApprovalGate.SKIP:
+            self.task_manager.add_log(task_id, f"Skipped site {index+1}/{total}: {url}", url=url, event="skipped")
+            self.task_manager.add_result(task_id, {
+                "url": url,
+                "status": "skipped",
+                "jobs": [],
+                "platform": get_strategy(url).__class__.__name__.replace('Strategy', '')
+            })
+            return False
+        return True
+
+    def _approved_all(self, task_id: str) -> bool:
+        gate = self.approvals.get(task_id)
+        return bool(gate and gate.approve_all)
+
+    def _stopped(self, task_id: str) -> bool:
+        gate = self.approvals.get(task_id)
+        return bool(gate and gate.stopped)
+
+    def _finish_task(self, task_id: str) -> None:
+        self.task_manager.update_task_status(task_id, "completed")
+        # Cleanup approval gate
+        self.approvals.pop(task_id, None)
+
+    def _run_task(self, task_id: str, urls: List[str], concurrency: int = 1) -> None:
+        try:
+            for i, url in enumerate(urls):
+                if self._approved_all(task_id) and concurrency > 1 and i < len(urls) - 1:
+                    # Everything left is approved, fan out instead of walking one by one
+                    self._scrape_parallel(task_id, urls, i, concurrency)
+                    break
+                if not self._await_approval(task_id, i, url, len(urls)):
+                    if self._stopped(task_id):
+                        break
+                    continue
+                if self._approved_all(task_id) and concurrency > 1 and i < len(urls) - 1:
+                    self.task_manager.add_log(task_id, f"Approve all received. Scraping remaining {len(urls) - i} sites with concurrency {concurrency}")
+                    self._scrape_parallel(task_id, urls, i, concurrency)
+                    break
+                self.task_manager.add_log(task_id, f"Approval received. Processing site {i+1}/{len(urls)}: {url}")
+                result = self._scrape(url, task_id)
+                self.task_manager.add_result(task_id, result)
         except Exception as e:
             logger.error(f"Task failed: {e}")
-            self.task_manager.add_log(task_id, f"Task failed: {e}")
+            self.task_manager.add_log(task_id, f"Task failed: {e}", level="error", event="task_failed")
         finally:
-            self.task_manager.update_task_status(task_id, "completed")
-            # Cleanup approval event
-            if task_id in self.approvals:
-                del self.approvals[task_id]
+            self._finish_task(task_id)
+
+    def _scrape_parallel(self, task_id: str, urls: List[str], start: int, concurrency: int) -> None:
+        remaining = urls[start:]
+        # Register placeholders up front so results keep the URL order of the plan
+        for url in remaining:
+            self.task_manager.init_result(task_id, url, status="queued")
+
+        # The pool size is the process-wide limit on browsers, these threads are the
+        # per-task one; URLs scraped through an API never take a browser
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"task-{task_id[:8]}") as executor:
+            futures = [(url, executor.submit(self._scrape_and_record, url, task_id, start + offset, len(urls)))
+                       for offset, url in enumerate(remaining)]
 
-    def start_scraping_task(self, urls: List[str]) -> str:
+        for url, future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Parallel scrape of {url} failed: {e}")
+                self.task_manager.add_result(task_id, {
+                    "url": url,
+                    "status": "error",
+                    "error": str(e),
+                    "jobs": []
+                })
+
+    def _scrape_and_record(self, url: str, task_id: str, index: int, total: int) -> None:
+        self.task_manager.add_log(task_id, f"Processing site {index+1}/{total}: {url}")
+        result = self._scrape(url, task_id)
+        self.task_manager.add_result(task_id, result)
+
+    def _register_task(self, urls: List[str]) -> str:
         task = self.task_manager.create_task(total_urls=len(urls))
         self.task_manager.update_task_status(task.task_id, "running")
-        # Create approval event for this task
-        self.approvals[task.task_id] = threading.Event()
+        # Create approval gate for this task
+        self.approvals[task.task_id] = ApprovalGate()
+        return task.task_id
 
-        thread = threading.Thread(target=self._run_task, args=(task.task_id, urls), daemon=True)
+    def start_scraping_task(self, urls: List[str], concurrency: Optional[int] = None) -> str:
+        task_id = self._register_task(urls)
+        concurrency = max(1, concurrency or self.task_concurrency)
+        thread = threading.Thread(target=self._run_task, args=(task_id, urls, concurrency), daemon=True)
         thread.start()
-        return task.task_id
+        return task_id
+
+    def approve_next(self, task_id: str) -> bool:
+        """Approve the URL awaiting approval; False if none is."""
+        gate = self.approvals.get(task_id)
+        if not gate:
+            return False
+        task = self.task_manager.get_task(task_id)
+        if task and task.approve_all:
+            # Flag set straight on the TaskManager, as older callers do
+            gate.release_all()
+            return True
+        # awaiting_approval is cleared by the worker once it takes the decision
+        return gate.post(ApprovalGate.APPROVE)
+
+    def approve_all(self, task_id: str):
+        self.task_manager.set_approve_all(task_id, True)
+        gate = self.approvals.get(task_id)
+        if gate:
+            gate.release_all()
 
-    def approve_next(self, task_id: str):
-        evt = self.approvals.get(task_id)
-        if evt:
-            evt.set()
-            self.task_manager.set_approval(task_id, False, "")
+    def skip_next(self, task_id: str) -> bool:
+        """Skip the URL awaiting approval; False if none is."""
+        gate = self.approvals.get(task_id)
+        if not gate:
+            return False
+        # Set before the worker can wake, its _close_prompt() clears it
+        return gate.post(ApprovalGate.SKIP, accepted=lambda: self.task_manager.set_skip_next(task_id, True))
@@ -0,0 +1,240 @@
+from typing import Any, Dict, Mapping, Optional, Tuple
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = os.environ.get(
+    "SCRAPER_HTTP_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "http_cache.db"),
+)
+MAX_SIZE_MB = float(os.environ.get("SCRAPER_HTTP_CACHE_MAX_MB", "256"))
+# Used when neither the strategy nor the server gives a max-age: always revalidate
+DEFAULT_MAX_AGE = float(os.environ.get("SCRAPER_HTTP_CACHE_MAX_AGE", "0"))
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS http_cache (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    server_max_age REAL,
+    stored_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_http_cache_access ON http_cache (last_access);
+"""
+
+# Only what parsers need from a response, bodies are re-decoded from bytes
+_KEPT_HEADERS = ("content-type", "etag", "last-modified", "cache-control")
+
+class CachedResponse:
+    """Stand-in for a requests/httpx response served from the cache."""
+
+    from_cache = True
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def encoding(self) -> str:
+        match = re.search(r"charset=([\w-]+)", self.headers.get("content-type", ""))
+        return match.group(1) if match else "utf-8"
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+class CacheEntry:
+    def __init__(self, row: sqlite3.Row):
+        self.key = row["key"]
+        self.url = row["url"]
+        self.status = row["status"]
+        self.headers = json.loads(row["headers"])
+        self.body = row["body"]
+        self.etag = row["etag"]
+        self.last_modified = row["last_modified"]
+        self.server_max_age = row["server_max_age"]
+        self.stored_at = row["stored_at"]
+
+    def is_fresh(self, max_age: Optional[float] = None) -> bool:
+        # A per-platform override wins over what the server announced
+        if max_age is None:
+            max_age = self.server_max_age if self.server_max_age is not None else DEFAULT_MAX_AGE
+        return time.time() - self.stored_at < max_age
+
+    def validators(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def response(self) -> CachedResponse:
+        return CachedResponse(self.url, self.status, self.headers, zlib.decompress(self.body))
+
+class HttpCache:
+    """On-disk cache for detail page responses.
+
+    Bodies are stored zlib-compressed in SQLite. A fresh entry is served
+    without a request; a stale one is revalidated with If-None-Match /
+    If-Modified-Since, so an unchanged page costs a 304 instead of a full
+    download. Least recently used entries are evicted once the cache grows
+    past ``max_size_mb``.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, max_size_mb: float = MAX_SIZE_MB):
+        self.path = path
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+
+    @staticmethod
+    def key(url: str, headers: Optional[Mapping[str, str]] = None) -> str:
+        # The same URL can serve HTML or JSON depending on Accept (Workday's CXS API)
+        accept = next((v for k, v in (headers or {}).items() if k.lower() == "accept"), "")
+        return f"{url}|{accept}" if accept else url
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM http_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE http_cache SET last_access = ? WHERE key = ?", (time.time(), key))
+        return CacheEntry(row)
+
+    def put(self, key: str, url: str, status: int, headers: Mapping[str, str], content: bytes,
+            max_age: Optional[float] = None):
+        cache_control = (headers.get("cache-control") or "").lower()
+        if "no-store" in cache_control:
+            return
+        match = _MAX_AGE_RE.search(cache_control)
+        server_max_age = 0.0 if "no-cache" in cache_control else (float(match.group(1)) if match else None)
+        if max_age is None:
+            max_age = server_max_age if server_max_age is not None else DEFAULT_MAX_AGE
+        if max_age <= 0 and not headers.get("etag") and not headers.get("last-modified"):
+            # Never fresh and nothing to revalidate with: it could only be downloaded again
+            return
+        kept = {k: headers[k] for k in _KEPT_HEADERS if headers.get(k)}
+        body = zlib.compress(content)
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM http_cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache (key, url, status, headers, body, etag, last_modified, "
+                "server_max_age, stored_at, last_access, size) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, status, json.dumps(kept), body, headers.get("etag"), headers.get("last-modified"),
+                 server_max_age, now, now, len(body)),
+            )
+            self._size += len(body) - (old["size"] if old else 0)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def refresh(self, key: str, headers: Mapping[str, str]):
+        """Mark an entry fresh again after a 304, picking up new validators."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE http_cache SET stored_at = ?, last_access = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                (now, now, headers.get("etag"), headers.get("last-modified"), key),
+            )
+
+    def _evict(self):
+        # Drop least recently used entries until comfortably under the cap
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute("SELECT key, size FROM http_cache ORDER BY last_access").fetchall()
+        doomed = []
+        for row in rows:
+            if self._size <= target:
+                break
+            doomed.append((row["key"],))
+            self._size -= row["size"]
+        self._conn.executemany("DELETE FROM http_cache WHERE key = ?", doomed)
+        logger.info(f"[HttpCache] Evicted {len(doomed)} entries, {self._size / (1024 * 1024):.1f}MB left")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def lookup(cache: Optional[HttpCache], url: str, request_headers: Optional[Mapping[str, str]],
+           max_age: Optional[float]) -> Tuple[Optional[str], Optional[CacheEntry], Optional[CachedResponse]]:
+    """First half of a cached GET: ``(key, entry, fresh_response)``.
+
+    ``fresh_response`` is set when no request is needed; otherwise send the
+    request with ``entry.validators()`` (if there is an entry) and pass the
+    response to ``store()``.
+    """
+    if cache is None:
+        return None, None, None
+    key = HttpCache.key(url, request_headers)
+    try:
+        entry = cache.get(key)
+    except Exception as e:
+        logger.warning(f"[HttpCache] Lookup failed for {url}: {e}")
+        return None, None, None
+    if entry is not None and entry.is_fresh(max_age):
+        return key, entry, entry.response()
+    return key, entry, None
+
+def store(cache: Optional[HttpCache], key: Optional[str], entry: Optional[CacheEntry], resp,
+          max_age: Optional[float] = None) -> Tuple[Any, str]:
+    """Second half of a cached GET: returns the response to use and "miss" or "revalidated".
+
+    ``max_age`` is the one given to ``lookup()``.
+    """
+    if cache is None or key is None:
+        return resp, "miss"
+    try:
+        if resp.status_code == 304 and entry is not None:
+            cache.refresh(key, resp.headers)
+            return entry.response(), "revalidated"
+        if resp.status_code == 200:
+            cache.put(key, str(resp.url), resp.status_code, resp.headers, resp.content, max_age)
+    except Exception as e:
+        logger.warning(f"[HttpCache] Failed to store {key}: {e}")
+    return resp, "miss"
+
+_cache: Optional[HttpCache] = None
+_cache_failed = False
+_cache_lock = threading.Lock()
+
+def get_http_cache() -> Optional[HttpCache]:
+    """Shared cache, or None when SCRAPER_HTTP_CACHE_PATH is set to an empty string."""
+    global _cache, _cache_failed
+    if not CACHE_PATH:
+        return None
+    with _cache_lock:
+        if _cache is None and not _cache_failed:
+            try:
+                _cache = HttpCache()
+            except Exception as e:
+                _cache_failed = True
+                logger.error(f"[HttpCache] Could not open {CACHE_PATH}, caching disabled: {e}")
+        return _cache
@@ -0,0 +1,63 @@
+from typing import Optional
+import logging
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# Number of hosts with a cached connection pool, and connections kept per host
+POOL_HOSTS = int(os.environ.get("SCRAPER_HTTP_POOL_HOSTS", "32"))
+POOL_PER_HOST = int(os.environ.get("SCRAPER_HTTP_POOL_PER_HOST", "16"))
+DEFAULT_TIMEOUT = float(os.environ.get("SCRAPER_HTTP_TIMEOUT", "15"))
+
+class HttpClient:
+    """Process-wide HTTP client used by strategies for listing APIs and job details.
+
+    One ``requests.Session`` keeps connections alive per host, so fetching
+    many detail pages from one board reuses TCP/TLS connections instead of
+    opening a new one per job. Transient failures (connection errors, 429,
+    5xx) are retried with exponential backoff.
+    """
+
+    def __init__(self, pool_hosts: int = POOL_HOSTS, pool_per_host: int = POOL_PER_HOST,
+                 retries: int = 3, backoff_factor: float = 0.5, timeout: float = DEFAULT_TIMEOUT):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_per_host, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method: str, url: str, timeout: Optional[float] = None, **kwargs) -> requests.Response:
+        return self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+def get_http_client() -> HttpClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
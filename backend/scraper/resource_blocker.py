@@ -0,0 +1,148 @@
+from typing import Dict, Any, Iterable, Optional
+from urllib.parse import urlparse
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Strategies only read DOM text and JSON, so these are dead weight by default
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+
+# Analytics, tag managers and ad networks seen on the configured job boards
+TRACKER_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "connect.facebook.net",
+    "facebook.com/tr",
+    "hotjar.com",
+    "segment.io",
+    "cdn.segment.com",
+    "mixpanel.com",
+    "amplitude.com",
+    "clarity.ms",
+    "bat.bing.com",
+    "snap.licdn.com",
+    "px.ads.linkedin.com",
+    "static.ads-twitter.com",
+    "analytics.tiktok.com",
+    "ct.pinterest.com",
+    "fullstory.com",
+    "quantserve.com",
+    "scorecardresearch.com",
+    "criteo.com",
+    "adnxs.com",
+    "taboola.com",
+    "outbrain.com",
+    "nr-data.net",
+)
+
+# Aborted requests never report a size, so savings are estimated from rough
+# average transfer sizes per resource type
+ESTIMATED_BYTES = {
+    "image": 40_000,
+    "font": 30_000,
+    "media": 500_000,
+    "stylesheet": 25_000,
+    "script": 30_000,
+}
+DEFAULT_ESTIMATED_BYTES = 5_000
+
+ENABLED = os.environ.get("SCRAPER_BLOCK_RESOURCES", "1") != "0"
+
+def _host_matches(host: str, domain: str) -> bool:
+    return host == domain or host.endswith("." + domain)
+
+def _is_tracker(host: str, path: str) -> bool:
+    # Entries are either a bare domain or a domain plus path prefix
+    for entry in TRACKER_DOMAINS:
+        domain, _, prefix = entry.partition("/")
+        if _host_matches(host, domain) and (not prefix or path.lstrip("/").startswith(prefix)):
+            return True
+    return False
+
+class ResourceBlocker:
+    """Route handler that aborts heavy assets and tracker requests.
+
+    Install it on a browser context with ``context.route("**/*", blocker.handle)``
+    (or ``handle_async`` for the async API). Counters are exposed through
+    ``summary()`` and end up in the result ``stats``.
+    """
+
+    def __init__(self, blocked_types: Iterable[str] = BLOCKED_RESOURCE_TYPES,
+                 allowlist: Iterable[str] = (), block_trackers: bool = True):
+        self.blocked_types = frozenset(blocked_types)
+        self.allowlist = tuple(allowlist)
+        self.block_trackers = block_trackers
+        self.requests_blocked = 0
+        self.requests_allowed = 0
+        self.bytes_saved_estimate = 0
+        self.blocked_by_type: Dict[str, int] = {}
+
+    @classmethod
+    def for_strategy(cls, strategy) -> Optional["ResourceBlocker"]:
+        if not ENABLED:
+            return None
+        blocked_types = frozenset(getattr(strategy, "blocked_resources", BLOCKED_RESOURCE_TYPES))
+        if getattr(strategy, "needs_css", False):
+            blocked_types -= {"stylesheet"}
+        return cls(
+            blocked_types=blocked_types,
+            allowlist=getattr(strategy, "resource_allowlist", ()),
+        )
+
+    def should_block(self, url: str, resource_type: str) -> Optional[str]:
+        """Return the reason to block the request, or None to let it through."""
+        parsed = urlparse(url)
+        host = (parsed.hostname or "").lower()
+        if any(_host_matches(host, d) for d in self.allowlist):
+            return None
+        if self.block_trackers and _is_tracker(host, parsed.path):
+            return "tracker"
+        if resource_type in self.blocked_types:
+            return resource_type
+        return None
+
+    def _record(self, reason: Optional[str], resource_type: str):
+        if reason is None:
+            self.requests_allowed += 1
+            return
+        self.requests_blocked += 1
+        self.blocked_by_type[reason] = self.blocked_by_type.get(reason, 0) + 1
+        self.bytes_saved_estimate += ESTIMATED_BYTES.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+
+    def handle(self, route):
+        request = route.request
+        reason = self.should_block(request.url, request.resource_type)
+        self._record(reason, request.resource_type)
+        try:
+            if reason:
+                route.abort("blockedbyclient")
+            else:
+                route.continue_()
+        except Exception as e:
+            # The page may already be closing
+            logger.debug(f"Route handling failed for {request.url}: {e}")
+
+    async def handle_async(self, route):
+        request = route.request
+        reason = self.should_block(request.url, request.resource_type)
+        self._record(reason, request.resource_type)
+        try:
+            if reason:
+                await route.abort("blockedbyclient")
+            else:
+                await route.continue_()
+        except Exception as e:
+            logger.debug(f"Route handling failed for {request.url}: {e}")
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "requests_blocked": self.requests_blocked,
+            "requests_allowed": self.requests_allowed,
+            "bytes_saved_estimate": self.bytes_saved_estimate,
+            "blocked_by_type": dict(self.blocked_by_type),
+        }
@@ -0,0 +1,151 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from .storage import DB_PATH
+from .utils import json_default
+
+logger = logging.getLogger(__name__)
+
+# Jobs enriched within this window are not fetched again
+SEEN_TTL_HOURS = float(os.environ.get("SCRAPER_SEEN_TTL_HOURS", "72"))
+
+# Query parameters that only track where a click came from, matched exactly so
+# ids like refId or sourceId are kept
+TRACKING_PARAMS = frozenset({
+    "gh_src", "gh_jid_src", "ref", "source", "src", "trk", "lever-source", "fbclid", "gclid",
+})
+# Any parameter with one of these prefixes is tracking too (utm_source, utm_medium, ...)
+TRACKING_PREFIXES = ("utm_",)
+
+# Listing card fields that identify a posting; relative ages ("3 days ago")
+# change every day and would defeat the cache
+CARD_FIELDS = ("title", "company", "location", "platform", "posted_at", "posted", "date")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_jobs (
+    link TEXT PRIMARY KEY,
+    card_hash TEXT NOT NULL,
+    fields TEXT NOT NULL,
+    enriched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_seen_jobs_enriched ON seen_jobs (enriched_at);
+"""
+
+def canonical_link(link: str) -> str:
+    """Normalize a job link so the same posting maps to one key across runs."""
+    parsed = urlparse(link.strip())
+    query = [(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+             if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)]
+    fragment = parsed.fragment
+    # SPA boards route with "#/..." fragments, anything else is an in-page anchor
+    if not fragment.startswith(("/", "!/")):
+        fragment = ""
+    return urlunparse((
+        parsed.scheme.lower(),
+        parsed.netloc.lower(),
+        parsed.path.rstrip("/") or "/",
+        parsed.params,
+        urlencode(sorted(query)),
+        fragment,
+    ))
+
+def card_hash(job: Dict[str, Any]) -> str:
+    card = {k: str(job[k]) for k in CARD_FIELDS if job.get(k) not in (None, "", "Unknown")}
+    return hashlib.sha1(json.dumps(card, sort_keys=True).encode()).hexdigest()
+
+class SeenJobsIndex:
+    """Remembers the detail fields fetched for each posting.
+
+    Entries are keyed by canonical link and carry a hash of the listing card,
+    so a posting whose title, location or date changed is fetched again even
+    within the TTL. Stored next to the job store (its own table); falls back
+    to an in-memory database when persistence is disabled.
+    """
+
+    def __init__(self, path: str = DB_PATH, ttl_hours: float = SEEN_TTL_HOURS):
+        self.ttl_hours = ttl_hours
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            if path:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+
+    def lookup(self, jobs: Iterable[Dict[str, Any]], ttl_hours: Optional[float] = None
+               ) -> List[Tuple[str, str, Optional[Dict[str, Any]]]]:
+        """Return ``(key, card_hash, cached_fields)`` per job; fields are None when it must be fetched."""
+        ttl = self.ttl_hours if ttl_hours is None else ttl_hours
+        entries = []
+        for job in jobs:
+            link = job.get("link")
+            entries.append((canonical_link(link) if link else "", card_hash(job)))
+        if ttl <= 0:
+            return [(key, h, None) for key, h in entries]
+
+        cutoff = time.time() - ttl * 3600
+        keys = [key for key, _ in entries if key]
+        found: Dict[str, Tuple[str, str]] = {}
+        with self._lock:
+            # Stay under SQLite's bound parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT link, card_hash, fields FROM seen_jobs WHERE enriched_at >= ? "
+                    f"AND link IN ({','.join('?' * len(chunk))})",
+                    (cutoff, *chunk),
+                ).fetchall()
+                found.update((link, (h, fields)) for link, h, fields in rows)
+
+        results = []
+        for key, h in entries:
+            hit = found.get(key)
+            fields = json.loads(hit[1]) if hit and hit[0] == h else None
+            results.append((key, h, fields))
+        return results
+
+    def remember(self, entries: Iterable[Tuple[str, str, Dict[str, Any]]]):
+        now = time.time()
+        rows = [(key, h, json.dumps(fields, default=json_default), now) for key, h, fields in entries if key]
+        if not rows:
+            return
+        with self._lock:
+            # One transaction, not one fsync per job
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO seen_jobs (link, card_hash, fields, enriched_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(link) DO UPDATE SET card_hash=excluded.card_hash, fields=excluded.fields, "
+                    "enriched_at=excluded.enriched_at",
+                    rows,
+                )
+
+    def prune(self, older_than_hours: Optional[float] = None) -> int:
+        hours = self.ttl_hours if older_than_hours is None else older_than_hours
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM seen_jobs WHERE enriched_at < ?", (time.time() - hours * 3600,))
+            return cur.rowcount
+
+_index: Optional[SeenJobsIndex] = None
+_index_lock = threading.Lock()
+
+def get_seen_index() -> Optional[SeenJobsIndex]:
+    global _index
+    with _index_lock:
+        if _index is None:
+            try:
+                _index = SeenJobsIndex()
+                # Expired entries would never be read again
+                _index.prune()
+            except Exception as e:
+                logger.error(f"[SeenJobs] Could not open index, every job will be fetched: {e}")
+                return None
+        return _index
@@ -0,0 +1,269 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from .dates import POSTED_KEYS, UNPARSED, parse_posted, to_iso
+from .utils import json_default
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = os.environ.get(
+    "SCRAPER_DB_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "jobs.db"),
+)
+
+# Keys kept in their own columns (or tables) instead of the result's JSON blob
+_RESULT_COLUMNS = ("url", "status", "platform", "total_found", "jobs", "jobs_unfiltered")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    progress INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    task_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    status TEXT,
+    platform TEXT,
+    total_found INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (task_id, url)
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    task_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    job_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    link TEXT,
+    title TEXT,
+    company TEXT,
+    platform TEXT,
+    posted TEXT,
+    filtered INTEGER NOT NULL DEFAULT 1,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (task_id, url, job_key)
+);
+CREATE INDEX IF NOT EXISTS idx_results_task ON results (task_id, position);
+CREATE INDEX IF NOT EXISTS idx_jobs_task ON jobs (task_id, url, position);
+CREATE INDEX IF NOT EXISTS idx_jobs_platform ON jobs (platform);
+CREATE INDEX IF NOT EXISTS idx_jobs_posted ON jobs (posted);
+CREATE INDEX IF NOT EXISTS idx_jobs_link ON jobs (link);
+CREATE INDEX IF NOT EXISTS idx_jobs_url ON jobs (url);
+"""
+
+def _job_key(job: Dict[str, Any]) -> str:
+    # Jobs are merged by link everywhere else; linkless ones are keyed by content
+    link = job.get("link")
+    if link:
+        return link
+    return "#" + hashlib.sha1(json.dumps(job, sort_keys=True, default=json_default).encode()).hexdigest()[:16]
+
+def _posted(job: Dict[str, Any]) -> Optional[str]:
+    # Only normalized UTC timestamps go in the column: as ISO strings they compare
+    # correctly in find_jobs(posted_since=...); anything unparseable is NULL
+    if job.get("posted_ts") is not None:
+        return to_iso(job["posted_ts"])
+    if job.get("posted_precision") == UNPARSED:
+        return None
+    for key in POSTED_KEYS:
+        parsed = parse_posted(job.get(key))
+        if parsed:
+            return to_iso(parsed[0])
+    return None
+
+class JobStore:
+    """Persistence interface used by TaskManager.
+
+    Tasks, their per-URL results and the jobs of each result are written
+    through as they change; logs are not persisted. Implementations must be
+    safe to call from several threads.
+    """
+
+    def save_task(self, task_id: str, status: str, progress: int, total: int):
+        raise NotImplementedError
+
+    def save_result(self, task_id: str, position: int, result: Dict[str, Any]):
+        """Upsert a result; if it carries ``jobs`` they replace the stored ones."""
+        raise NotImplementedError
+
+    def save_jobs(self, task_id: str, url: str, jobs: Iterable[Tuple[int, Dict[str, Any]]]):
+        """Upsert ``(position, job)`` pairs streamed into a result."""
+        raise NotImplementedError
+
+    def load_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Return the task row with its ``results`` (jobs included), or None."""
+        raise NotImplementedError
+
+    def find_jobs(self, task_id: Optional[str] = None, platform: Optional[str] = None,
+                  url: Optional[str] = None, posted_since: Optional[str] = None,
+                  limit: int = 500) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class SQLiteJobStore(JobStore):
+    """JobStore backed by a single SQLite file in WAL mode.
+
+    WAL lets status reads proceed while a scrape is writing. One connection
+    is shared behind a lock; every call is its own short transaction.
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # Durable enough with WAL, and avoids an fsync per streamed job
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        logger.info(f"[JobStore] Using SQLite database at {path}")
+
+    def _write(self, statements: List[Tuple[str, Any]]):
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN")
+                for sql, params in statements:
+                    if isinstance(params, list):
+                        self._conn.executemany(sql, params)
+                    else:
+                        self._conn.execute(sql, params)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def save_task(self, task_id: str, status: str, progress: int, total: int):
+        now = time.time()
+        self._write([(
+            "INSERT INTO tasks (task_id, status, progress, total, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(task_id) DO UPDATE SET status=excluded.status, progress=excluded.progress, "
+            "total=excluded.total, updated_at=excluded.updated_at",
+            (task_id, status, progress, total, now, now),
+        )])
+
+    def save_result(self, task_id: str, position: int, result: Dict[str, Any]):
+        now = time.time()
+        url = result["url"]
+        data = {k: v for k, v in result.items() if k not in _RESULT_COLUMNS}
+        statements = [(
+            "INSERT INTO results (task_id, url, position, status, platform, total_found, data, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(task_id, url) DO UPDATE SET position=excluded.position, status=excluded.status, "
+            "platform=excluded.platform, total_found=excluded.total_found, data=excluded.data, updated_at=excluded.updated_at",
+            (task_id, url, position, result.get("status"), result.get("platform"),
+             result.get("total_found", 0), json.dumps(data, default=json_default), now),
+        )]
+        if "jobs" in result:
+            statements.append(("DELETE FROM jobs WHERE task_id = ? AND url = ?", (task_id, url)))
+            rows = self._job_rows(task_id, url, result, now)
+            if rows:
+                statements.append((self._UPSERT_JOB, rows))
+        self._write(statements)
+
+    def save_jobs(self, task_id: str, url: str, jobs: Iterable[Tuple[int, Dict[str, Any]]]):
+        now = time.time()
+        rows = [self._job_row(task_id, url, pos, job, True, now) for pos, job in jobs]
+        if rows:
+            self._write([(self._UPSERT_JOB, rows)])
+
+    _UPSERT_JOB = (
+        "INSERT INTO jobs (task_id, url, job_key, position, link, title, company, platform, posted, filtered, data, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(task_id, url, job_key) DO UPDATE SET position=excluded.position, title=excluded.title, "
+        "company=excluded.company, platform=excluded.platform, posted=excluded.posted, "
+        "filtered=excluded.filtered, data=excluded.data, updated_at=excluded.updated_at"
+    )
+
+    @staticmethod
+    def _job_row(task_id: str, url: str, position: int, job: Dict[str, Any], filtered: bool, now: float) -> tuple:
+        return (task_id, url, _job_key(job), position, job.get("link"), job.get("title"),
+                job.get("company"), job.get("platform"), _posted(job), int(filtered),
+                json.dumps(job, default=json_default), now)
+
+    def _job_rows(self, task_id: str, url: str, result: Dict[str, Any], now: float) -> List[tuple]:
+        shown = result.get("jobs") or []
+        everything = result.get("jobs_unfiltered")
+        if everything is None:
+            return [self._job_row(task_id, url, i, job, True, now) for i, job in enumerate(shown)]
+        # One row per job; the date filtered view is a flag instead of a second copy.
+        # "jobs" holds the same dicts as "jobs_unfiltered", so identity is enough.
+        shown_ids = {id(job) for job in shown}
+        if sum(1 for job in everything if id(job) in shown_ids) == len(shown):
+            return [self._job_row(task_id, url, i, job, id(job) in shown_ids, now)
+                    for i, job in enumerate(everything)]
+        shown_keys = {_job_key(job) for job in shown}
+        return [self._job_row(task_id, url, i, job, _job_key(job) in shown_keys, now)
+                for i, job in enumerate(everything)]
+
+    def _read(self, sql: str, params: tuple) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def load_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._read("SELECT * FROM tasks WHERE task_id = ?", (task_id,))
+        if not rows:
+            return None
+        task = dict(rows[0])
+        results = []
+        for row in self._read("SELECT * FROM results WHERE task_id = ? ORDER BY position", (task_id,)):
+            result = json.loads(row["data"])
+            result.update(url=row["url"], status=row["status"], total_found=row["total_found"])
+            if row["platform"] is not None:
+                result["platform"] = row["platform"]
+            job_rows = self._read(
+                "SELECT data, filtered FROM jobs WHERE task_id = ? AND url = ? ORDER BY position",
+                (task_id, row["url"]),
+            )
+            jobs = [(json.loads(j["data"]), j["filtered"]) for j in job_rows]
+            result["jobs"] = [job for job, filtered in jobs if filtered]
+            if "filtered_count" in result:
+                # Only full results had an unfiltered list
+                result["jobs_unfiltered"] = [job for job, _ in jobs]
+            results.append(result)
+        task["results"] = results
+        return task
+
+    def find_jobs(self, task_id: Optional[str] = None, platform: Optional[str] = None,
+                  url: Optional[str] = None, posted_since: Optional[str] = None,
+                  limit: int = 500) -> List[Dict[str, Any]]:
+        clauses, params = [], []
+        for column, value in (("task_id", task_id), ("platform", platform), ("url", url)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if posted_since is not None:
+            clauses.append("posted >= ?")
+            params.append(posted_since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._read(f"SELECT data FROM jobs {where} ORDER BY updated_at DESC LIMIT ?", (*params, limit))
+        return [json.loads(r["data"]) for r in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def default_store() -> Optional[JobStore]:
+    """Store used by TaskManager unless one is passed; SCRAPER_DB_PATH="" disables it."""
+    if not DB_PATH:
+        return None
+    try:
+        return SQLiteJobStore(DB_PATH)
+    except Exception as e:
+        logger.error(f"[JobStore] Could not open {DB_PATH}, keeping tasks in memory only: {e}")
+        return None
@@ -2,19 +2,81 @@ from typing import List, Dict, Any, Optional
 from playwright.sync_api import Page, Response
 import logging
 import re
-import requests
 import json
 from bs4 import BeautifulSoup
-from urllib.parse import urlparse
+from urllib.parse import urlparse, quote
 import time
 from .base import BaseStrategy
 
 logger = logging.getLogger(__name__)
 
+# Public posting API: the whole board with descriptions and compensation in one response
+POSTING_API = "https://api.ashbyhq.com/posting-api/job-board/{org}?includeCompensation=true"
+
 class AshbyStrategy(BaseStrategy):
+    needs_css = True
+
     def can_handle(self, url: str) -> bool:
         return "ashbyhq.com" in url
 
+    @staticmethod
+    def _org_slug(url: str) -> Optional[str]:
+        # jobs.ashbyhq.com/<org> or jobs.ashbyhq.com/<org>/<job id>
+        parsed = urlparse(url)
+        if not parsed.netloc.startswith("jobs."):
+            return None
+        segments = [p for p in parsed.path.split("/") if p]
+        return segments[0] if segments else None
+
+    def scrape_direct(self, url: str, on_jobs_found=None) -> Optional[List[Dict[str, Any]]]:
+        """Read the board from the posting API, no browser and no detail fetches."""
+        org = self._org_slug(url)
+        if not org:
+            return None
+        try:
+            resp = self.http.get(POSTING_API.format(org=quote(org)), headers={"Accept": "application/json"}, timeout=30)
+            if resp.status_code != 200:
+                logger.warning(f"Ashby posting API refused {org} ({resp.status_code})")
+                return None
+            postings = resp.json().get("jobs") or []
+        except Exception as e:
+            logger.warning(f"Ashby posting API failed for {org}: {e}")
+            return None
+
+        base_url = f"https://jobs.ashbyhq.com/{org}"
+        # Unlisted postings are reachable by link only, the board does not show them
+        jobs = [self._posting_to_job(post, base_url) for post in postings
+                if post.get("id") and post.get("isListed", True)]
+        self.stats["pages"] = 1
+        logger.info(f"Ashby posting API returned {len(jobs)} jobs for {org}")
+        if on_jobs_found and jobs:
+            on_jobs_found(jobs, stats=self.stats)
+        return jobs
+
+    @staticmethod
+    def _posting_to_job(post: Dict[str, Any], base_url: str) -> Dict[str, Any]:
+        location = post.get("location") or "Unknown"
+        if post.get("secondaryLocations"):
+            location += f" (+{len(post['secondaryLocations'])})"
+        description = post.get("descriptionPlain") or ""
+        if not description and post.get("descriptionHtml"):
+            description = BeautifulSoup(post["descriptionHtml"], "html.parser").get_text(separator="\n")
+        compensation = post.get("compensation") or {}
+        return {
+            "title": post.get("title", "Unknown"),
+            "company": "Ashby Board",
+            "location": location,
+            "department": post.get("department") or post.get("team"),
+            "employment_type": post.get("employmentType"),
+            "remote": post.get("isRemote"),
+            "salary": compensation.get("scrapeableCompensationSalarySummary")
+                      or compensation.get("compensationTierSummary"),
+            "link": post.get("jobUrl") or f"{base_url}/{post['id']}",
+            "platform": "Ashby",
+            "posted_at": post.get("publishedAt"),
+            "description": description.strip(),
+        }
+
     def scrape(self, page: Page, url: str, on_jobs_found=None) -> List[Dict[str, Any]]:
         logger.info(f"Scraping Ashby: {url}")
         jobs = []
@@ -207,43 +269,29 @@ class AshbyStrategy(BaseStrategy):
 
         # Fetch Details
         logger.info(f"Fetching details for {len(jobs)} jobs...")
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-
-        for i, job in enumerate(jobs):
-            if job.get("description"): continue # Already has description
-            
-            try:
-                # Hybrid: Try requests first (Much Faster)
-                resp = requests.get(job['link'], headers=headers, timeout=10)
-                if resp.status_code == 200:
-                    soup = BeautifulSoup(resp.text, "html.parser")
-                    
-                    # 1. Try meta description (often a summary)
-                    meta_desc = soup.find("meta", attrs={"name": "description"})
-                    desc_text = ""
-                    if meta_desc:
-                        desc_text = meta_desc.get("content", "").strip()
-                    
-                    # 2. Try to find the full description container
-                    # Ashby structure usually has a main container
-                    desc_el = soup.select_one("div[class*='JobDescription'], div[class*='description'], .job-description, main")
-                    if desc_el:
-                         full_text = desc_el.get_text(separator="\n").strip()
-                         # Prefer full text if significantly longer
-                         if len(full_text) > len(desc_text):
-                             desc_text = full_text
-                    
-                    if desc_text:
-                        job["description"] = desc_text
-                        # Stream update
-                        if on_jobs_found:
-                            on_jobs_found([job], stats=self.stats)
-                            
-            except Exception as e:
-                logger.warning(f"Failed to fetch details for {job['link']}: {e}")
-                # Optional: Fallback to Playwright visit if requests fail repeatedly
-                # but for Ashby, requests usually work fine.
+        # Hybrid: plain HTTP is much faster than visiting each posting, and works fine for Ashby
+        pending = [job for job in jobs if not job.get("description")]
+        self.enrich_details(pending, self._parse_detail, on_jobs_found=on_jobs_found, timeout=10)
 
         return jobs
+
+    @staticmethod
+    def _parse_detail(job: Dict[str, Any], resp) -> Optional[Dict[str, Any]]:
+        soup = BeautifulSoup(resp.text, "html.parser")
+
+        # 1. Try meta description (often a summary)
+        meta_desc = soup.find("meta", attrs={"name": "description"})
+        desc_text = ""
+        if meta_desc:
+            desc_text = meta_desc.get("content", "").strip()
+
+        # 2. Try to find the full description container
+        # Ashby structure usually has a main container
+        desc_el = soup.select_one("div[class*='JobDescription'], div[class*='description'], .job-description, main")
+        if desc_el:
+            full_text = desc_el.get_text(separator="\n").strip()
+            # Prefer full text if significantly longer
+            if len(full_text) > len(desc_text):
+                desc_text = full_text
+
+        return {"description": desc_text} if desc_text else None
@@ -1,15 +1,96 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from playwright.sync_api import Page
 import logging
 from urllib.parse import urlparse
+from bs4 import BeautifulSoup
 from .base import BaseStrategy
 
 logger = logging.getLogger(__name__)
 
 class BambooHRStrategy(BaseStrategy):
+    # Openings rarely change once published
+    http_cache_max_age = 12 * 3600
+
     def can_handle(self, url: str) -> bool:
         return "bamboohr.com" in url
 
+    @staticmethod
+    def _careers_base(url: str) -> Optional[str]:
+        # https://questel.bamboohr.com/careers -> https://questel.bamboohr.com/careers
+        parsed = urlparse(url)
+        if not parsed.netloc.endswith(".bamboohr.com") or parsed.netloc.startswith("www."):
+            return None
+        return f"https://{parsed.netloc}/careers"
+
+    def scrape_direct(self, url: str, on_jobs_found=None) -> Optional[List[Dict[str, Any]]]:
+        """Read the careers list JSON, then each opening's detail JSON in parallel."""
+        base = self._careers_base(url)
+        if not base:
+            return None
+        headers = {"Accept": "application/json"}
+        try:
+            resp = self.http.get(f"{base}/list", headers=headers, timeout=20)
+            if resp.status_code != 200 or "json" not in resp.headers.get("content-type", ""):
+                logger.warning(f"BambooHR careers list refused ({resp.status_code}): {base}")
+                return None
+            openings = resp.json().get("result") or []
+        except Exception as e:
+            logger.warning(f"BambooHR careers list failed for {base}: {e}")
+            return None
+
+        jobs = [self._opening_to_job(opening, base) for opening in openings if opening.get("id")]
+        self.stats["pages"] = 1
+        logger.info(f"BambooHR careers list returned {len(jobs)} openings for {base}")
+        if on_jobs_found and jobs:
+            on_jobs_found(jobs, stats=self.stats)
+
+        self.enrich_details(jobs, self._parse_detail, on_jobs_found=on_jobs_found,
+                            url_for=lambda job: f"{job['link']}/detail", headers=headers, timeout=10)
+        return jobs
+
+    @staticmethod
+    def _location(location: Optional[Dict[str, Any]]) -> Optional[str]:
+        location = location or {}
+        parts = [location.get("city"), location.get("state") or location.get("province"), location.get("country")]
+        return ", ".join(p for p in parts if p) or None
+
+    @classmethod
+    def _opening_to_job(cls, opening: Dict[str, Any], base: str) -> Dict[str, Any]:
+        location = cls._location(opening.get("atsLocation")) or cls._location(opening.get("location"))
+        if opening.get("isRemote") and not location:
+            location = "Remote"
+        return {
+            "title": opening.get("jobOpeningName", "Unknown"),
+            "company": "BambooHR Board",
+            "location": location or "Unknown",
+            "department": opening.get("departmentLabel"),
+            "employment_type": opening.get("employmentStatusLabel"),
+            "remote": opening.get("isRemote"),
+            "link": f"{base}/{opening['id']}",
+            "platform": "BambooHR",
+            "description": "",
+        }
+
+    @classmethod
+    def _parse_detail(cls, job: Dict[str, Any], resp) -> Optional[Dict[str, Any]]:
+        opening = (resp.json().get("result") or {}).get("jobOpening") or {}
+        if not opening:
+            return None
+        update: Dict[str, Any] = {}
+        if opening.get("description"):
+            update["description"] = BeautifulSoup(opening["description"], "html.parser").get_text(separator="\n").strip()
+        if opening.get("datePosted"):
+            update["posted_at"] = opening["datePosted"]
+        location = cls._location(opening.get("atsLocation")) or cls._location(opening.get("location"))
+        if location and job.get("location") in (None, "Unknown", "Remote"):
+            update["location"] = location
+        for field, key in (("department", "departmentLabel"), ("employment_type", "employmentStatusLabel")):
+            if not job.get(field) and opening.get(key):
+                update[field] = opening[key]
+        if opening.get("compensation"):
+            update["salary"] = opening["compensation"]
+        return update or None
+
     def scrape(self, page: Page, url: str) -> List[Dict[str, Any]]:
         logger.info(f"Scraping BambooHR: {url}")
         jobs: List[Dict[str, Any]] = []
@@ -1,15 +1,87 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from playwright.sync_api import Page
+from playwright.async_api import Page as AsyncPage
 import logging
+from ..resource_blocker import BLOCKED_RESOURCE_TYPES
+from ..http_client import HttpClient, get_http_client
+from ..detail_fetcher import get_detail_fetcher, PageDetailFetcher, DETAIL_BACKEND, DETAIL_PAGES, DETAIL_WORKERS
 
 logger = logging.getLogger(__name__)
 
 class BaseStrategy:
-    def __init__(self):
+    # Resource types aborted in the browser context
+    blocked_resources = BLOCKED_RESOURCE_TYPES
+    # Set by strategies that depend on layout (is_visible() checks, scrollHeight
+    # for infinite scroll): stylesheets are then let through
+    needs_css = False
+    # Hosts that are never blocked, e.g. a CDN that serves job data
+    resource_allowlist: tuple = ()
+    # Backend ("threads" or "async") and thread count used by enrich_details()
+    detail_backend = DETAIL_BACKEND
+    detail_workers = DETAIL_WORKERS
+    # Browser tabs used by enrich_details_in_browser()
+    detail_pages = DETAIL_PAGES
+    # Reuse details fetched within this many hours; None uses SCRAPER_SEEN_TTL_HOURS, 0 always fetches
+    detail_ttl_hours: Optional[float] = None
+    # Seconds a cached detail response is served without revalidation; None follows the server's Cache-Control
+    http_cache_max_age: Optional[float] = None
+
+    def __init__(self, http: Optional[HttpClient] = None):
         self.stats = {"pages": 1}
+        # Shared pooled client for listing APIs and detail pages
+        self.http = http or get_http_client()
 
     def can_handle(self, url: str) -> bool:
         return False
 
     def scrape(self, page: Page, url: str, on_jobs_found=None) -> List[Dict[str, Any]]:
         raise NotImplementedError
+
+    def scrape_direct(self, url: str, on_jobs_found=None) -> Optional[List[Dict[str, Any]]]:
+        """Scrape through the board's public API, without a browser.
+
+        Strategies for boards with a usable API override this; the engine
+        calls it before taking a browser from the pool and only falls back
+        to scrape() when it returns None (API refused or not derivable).
+        """
+        return None
+
+    async def scrape_async(self, page: AsyncPage, url: str, on_jobs_found=None) -> List[Dict[str, Any]]:
+        """Async counterpart of scrape() for AsyncScraperEngine.
+
+        Strategies are ported one at a time; anything that does not override
+        this keeps running through the sync scrape() on the browser pool.
+        """
+        raise NotImplementedError
+
+    def enrich_details(self, jobs: List[Dict[str, Any]], parse, on_jobs_found=None, url_for=None, **request_kwargs) -> int:
+        """Fetch detail pages for ``jobs`` concurrently and merge what ``parse(job, resp)`` returns.
+
+        Enriched jobs are streamed through ``on_jobs_found`` in batches, jobs
+        enriched within ``detail_ttl_hours`` are not fetched again, and
+        skipped/fetched counts land in ``self.stats["details"]``.
+        """
+        fetcher = get_detail_fetcher(self.detail_backend, http=self.http, max_workers=self.detail_workers)
+        return fetcher.enrich(jobs, parse, on_jobs_found=on_jobs_found, stats=self.stats,
+                              url_for=url_for, ttl_hours=self.detail_ttl_hours,
+                              cache_max_age=self.http_cache_max_age, **request_kwargs)
+
+    def enrich_details_in_browser(self, page: Page, jobs: List[Dict[str, Any]], extract, on_jobs_found=None,
+                                  url_for=None, wait_selector: Optional[str] = None,
+                                  load_state: str = "domcontentloaded") -> int:
+        """Browser counterpart of enrich_details() for detail pages that need JavaScript.
+
+        ``extract(page, job)`` runs once the page is loaded (and
+        ``wait_selector`` showed up, if given) and returns the fields to merge.
+        """
+        fetcher = PageDetailFetcher(page, pages=self.detail_pages, wait_selector=wait_selector, load_state=load_state)
+        return fetcher.enrich(jobs, extract, on_jobs_found=on_jobs_found, stats=self.stats, url_for=url_for,
+                              ttl_hours=self.detail_ttl_hours)
+
+    @property
+    def supports_async(self) -> bool:
+        return type(self).scrape_async is not BaseStrategy.scrape_async
+
+    @property
+    def supports_direct(self) -> bool:
+        return type(self).scrape_direct is not BaseStrategy.scrape_direct
@@ -1,17 +1,22 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from playwright.sync_api import Page
 import logging
 import re
 from urllib.parse import urlparse
 from datetime import datetime
 import json
-import requests
 from bs4 import BeautifulSoup
 from .base import BaseStrategy
 
 logger = logging.getLogger(__name__)
 
 class BuiltInStrategy(BaseStrategy):
+    needs_css = True
+    # Up to 8 list pages of ~20 jobs each, too many detail pages for a thread each
+    detail_backend = "async"
+    # Listings are edited more often than on the ATS boards
+    http_cache_max_age = 6 * 3600
+
     def can_handle(self, url: str) -> bool:
         return "builtin.com" in url
 
@@ -313,10 +318,6 @@ class BuiltInStrategy(BaseStrategy):
                     # Now fetch details for these jobs using Requests (faster) or Playwright (fallback)
                     # We do this after streaming the basic list so the UI updates
                     
-                    headers = {
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-                    }
-                    
                     # We will handle detail fetching for ALL jobs at the end, not just current page
                     # to ensure API jobs are also covered.
                     pass 
@@ -341,60 +342,34 @@ class BuiltInStrategy(BaseStrategy):
         jobs_to_fetch = [j for j in unique_jobs if not j.get('description')]
         if jobs_to_fetch:
             logger.info(f"Fetching details for {len(jobs_to_fetch)} jobs...")
-            import concurrent.futures
-            
-            def fetch_details(job):
-                try:
-                    headers = {
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-                    }
-                    resp = requests.get(job['link'], headers=headers, timeout=10)
-                    if resp.status_code == 200:
-                        soup = BeautifulSoup(resp.text, "html.parser")
-                        
-                        # 1. Try JSON-LD (Most reliable)
-                        scripts = soup.find_all("script", type="application/ld+json")
-                        for s in scripts:
-                            try:
-                                data = json.loads(s.string)
-                                graph = data.get("@graph", []) if isinstance(data, dict) else (data if isinstance(data, list) else [data])
-                                for item in graph:
-                                    if item.get("@type") == "JobPosting":
-                                        desc = item.get("description")
-                                        if desc:
-                                            # Clean HTML tags if needed, or keep them if frontend renders HTML
-                                            # The sample had <br> tags. Let's keep basic formatting or convert to text.
-                                            # For now, let's strip HTML for consistency with other scrapers, 
-                                            # or use a simple converter.
-                                            clean_desc = BeautifulSoup(desc, "html.parser").get_text(separator="\n\n")
-                                            return clean_desc
-                            except:
-                                pass
-                                
-                        # 2. Try generic selectors (Fallback)
-                        desc_el = soup.select_one("div[class*='description'], .job-description, .job-info, #job-description")
-                        if desc_el:
-                             # Check if it's the generic "fit analysis" text
-                            text = desc_el.get_text(separator="\n").strip()
-                            if len(text) > 200: # Threshold to avoid short banners
-                                return text
-                                
-                except Exception as e:
-                    pass
-                return None
-
-            with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-                future_to_job = {executor.submit(fetch_details, job): job for job in jobs_to_fetch}
-                for future in concurrent.futures.as_completed(future_to_job):
-                    job = future_to_job[future]
-                    try:
-                        desc = future.result()
-                        if desc:
-                            job['description'] = desc
-                            # Stream update
-                            if on_jobs_found:
-                                on_jobs_found([job])
-                    except Exception:
-                        pass
+            self.enrich_details(jobs_to_fetch, self._parse_detail, on_jobs_found=on_jobs_found, timeout=10)
                 
         return unique_jobs
+
+    @staticmethod
+    def _parse_detail(job: Dict[str, Any], resp) -> Optional[Dict[str, Any]]:
+        soup = BeautifulSoup(resp.text, "html.parser")
+
+        # 1. Try JSON-LD (Most reliable)
+        scripts = soup.find_all("script", type="application/ld+json")
+        for s in scripts:
+            try:
+                data = json.loads(s.string)
+                graph = data.get("@graph", []) if isinstance(data, dict) else (data if isinstance(data, list) else [data])
+                for item in graph:
+                    if item.get("@type") == "JobPosting":
+                        desc = item.get("description")
+                        if desc:
+                            # Strip HTML for consistency with other scrapers
+                            return {"description": BeautifulSoup(desc, "html.parser").get_text(separator="\n\n")}
+            except:
+                pass
+
+        # 2. Try generic selectors (Fallback)
+        desc_el = soup.select_one("div[class*='description'], .job-description, .job-info, #job-description")
+        if desc_el:
+            # Check if it's the generic "fit analysis" text
+            text = desc_el.get_text(separator="\n").strip()
+            if len(text) > 200: # Threshold to avoid short banners
+                return {"description": text}
+        return None
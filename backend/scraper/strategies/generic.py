@@ -1,14 +1,32 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from playwright.sync_api import Page
 import logging
-import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 from .base import BaseStrategy
 
 logger = logging.getLogger(__name__)
 
+DESCRIPTION_SELECTORS = [
+    "[itemprop='description']",
+    ".job-description",
+    "#job-description",
+    ".offer-description",
+    "#offer-description",
+    ".description",
+    "[class*='description']",
+    ".ts-offer-page__block",
+    "[class*='offer-page']",
+    ".job-details",
+    "article",
+    "main",
+    ".content",
+    "#content"
+]
+
 class GenericStrategy(BaseStrategy):
+    needs_css = True
+
     def can_handle(self, url: str) -> bool:
         return True # Fallback
 
@@ -203,119 +221,17 @@ class GenericStrategy(BaseStrategy):
             # Fetch descriptions for found jobs
             logger.info(f"Generic: Found {len(jobs)} potential jobs. Fetching details...")
             
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-            
-            for job in jobs:
-                if len(job.get("description", "")) > 50: # Already has description
-                    continue
-
-                # 1. Try requests first (faster)
-                html_content = None
-                try:
-                    resp = requests.get(job['link'], headers=headers, timeout=10, verify=False)
-                    if resp.status_code == 200:
-                        html_content = resp.text
-                except Exception:
-                    pass
-
-                # 2. Try parsing requests result
-                if html_content:
-                    try:
-                        soup = BeautifulSoup(html_content, "html.parser")
-                        desc_text = ""
-                        
-                        # Meta description
-                        meta = soup.find("meta", attrs={"name": "description"})
-                        if meta:
-                            desc_text = meta.get("content", "").strip()
-                            
-                        # Content containers
-                        selectors = [
-                            "[itemprop='description']",
-                            ".job-description",
-                            "#job-description",
-                            ".offer-description",
-                            "#offer-description",
-                            ".description",
-                            "[class*='description']",
-                            ".ts-offer-page__block",
-                            "[class*='offer-page']",
-                            ".job-details",
-                            "article",
-                            "main",
-                            ".content",
-                            "#content"
-                        ]
-                        
-                        best_len = 0
-                        for sel in selectors:
-                            el = soup.select_one(sel)
-                            if el:
-                                text = el.get_text(separator="\n").strip()
-                                if len(text) > best_len and len(text) > 100:
-                                    desc_text = text
-                                    best_len = len(text)
-                                    
-                        if desc_text:
-                            job["description"] = desc_text
-                    except Exception:
-                        pass
+            # 1. Try plain HTTP first (faster), concurrently through the shared detail stage
+            pending = [job for job in jobs if len(job.get("description", "")) <= 50]
+            self.enrich_details(pending, self._parse_detail, on_jobs_found=on_jobs_found, timeout=10, verify=False)
 
-                # 3. Fallback to Playwright if no description found (either requests failed or parsing failed)
-                if not job.get("description"):
-                    try:
-                        logger.info(f"Falling back to Playwright for {job['link']}")
-                        # Use 'load' state to ensure content is ready
-                        page.goto(job['link'], timeout=30000, wait_until="load")
-                        try:
-                            page.wait_for_selector("body", timeout=5000)
-                        except:
-                            pass
-                            
-                        html_content = page.content()
-                        
-                        if html_content:
-                            soup = BeautifulSoup(html_content, "html.parser")
-                            desc_text = ""
-                            
-                            # Same parsing logic for Playwright content
-                            meta = soup.find("meta", attrs={"name": "description"})
-                            if meta:
-                                desc_text = meta.get("content", "").strip()
-                                
-                            selectors = [
-                                "[itemprop='description']",
-                                ".job-description",
-                                "#job-description",
-                                ".offer-description",
-                                "#offer-description",
-                                ".description",
-                                 "[class*='description']",
-                                 ".ts-offer-page__block",
-                                 "[class*='offer-page']",
-                                 ".job-details",
-                                "article",
-                                "main",
-                                ".content",
-                                "#content"
-                            ]
-                            
-                            best_len = 0
-                            for sel in selectors:
-                                el = soup.select_one(sel)
-                                if el:
-                                    text = el.get_text(separator="\n").strip()
-                                    if len(text) > best_len and len(text) > 100:
-                                        desc_text = text
-                                        best_len = len(text)
-                                        
-                            if desc_text:
-                                job["description"] = desc_text
-                                
-                    except Exception as e:
-                        logger.warning(f"Generic Playwright fallback failed for {job['link']}: {e}")
+            # 2. Fallback to Playwright if no description found (either the request or parsing failed)
+            missing = [job for job in pending if not job.get("description")]
+            if missing:
+                logger.info(f"Falling back to Playwright for {len(missing)} jobs")
+                # Use 'load' state to ensure content is ready
+                self.enrich_details_in_browser(page, missing, self._extract_page_detail, on_jobs_found=on_jobs_found,
+                                               wait_selector="body", load_state="load")
             
             if on_jobs_found and jobs:
                 on_jobs_found(jobs)
@@ -324,3 +240,40 @@ class GenericStrategy(BaseStrategy):
             logger.error(f"Generic scrape error: {e}")
             
         return jobs[:20] # Return max 20 to avoid garbage
+
+    @classmethod
+    def _parse_detail(cls, job: Dict[str, Any], resp) -> Optional[Dict[str, Any]]:
+        desc_text = cls._extract_description(resp.text)
+        return {"description": desc_text} if desc_text else None
+
+    @classmethod
+    def _extract_page_detail(cls, page: Page, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # Same parsing logic as for the HTTP response
+        desc_text = cls._extract_description(page.content())
+        return {"description": desc_text} if desc_text else None
+
+    @staticmethod
+    def _extract_description(html_content: str) -> str:
+        if not html_content:
+            return ""
+        try:
+            soup = BeautifulSoup(html_content, "html.parser")
+        except Exception:
+            return ""
+        desc_text = ""
+
+        # Meta description
+        meta = soup.find("meta", attrs={"name": "description"})
+        if meta:
+            desc_text = meta.get("content", "").strip()
+
+        # Content containers, longest match wins
+        best_len = 0
+        for sel in DESCRIPTION_SELECTORS:
+            el = soup.select_one(sel)
+            if el:
+                text = el.get_text(separator="\n").strip()
+                if len(text) > best_len and len(text) > 100:
+                    desc_text = text
+                    best_len = len(text)
+        return desc_text
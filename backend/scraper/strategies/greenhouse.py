@@ -1,17 +1,81 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from playwright.sync_api import Page
+import html
 import logging
-from urllib.parse import urlparse
-import requests
+from urllib.parse import urlparse, parse_qs
 from bs4 import BeautifulSoup
 from .base import BaseStrategy
 
 logger = logging.getLogger(__name__)
 
+# Public board API: every job with its content in one response
+BOARD_API = "https://boards-api{region}.greenhouse.io/v1/boards/{token}/jobs?content=true"
+# First path segments that are not board tokens
+NON_TOKEN_SEGMENTS = ("embed", "jobs", "v1")
+
 class GreenhouseStrategy(BaseStrategy):
+    needs_css = True
+    # Posting pages rarely change once published
+    http_cache_max_age = 12 * 3600
+
     def can_handle(self, url: str) -> bool:
         return "greenhouse.io" in url
 
+    @staticmethod
+    def _board_token(url: str) -> Optional[str]:
+        # job-boards.greenhouse.io/<token>, boards.greenhouse.io/<token>/jobs/123,
+        # boards.greenhouse.io/embed/job_board?for=<token>
+        parsed = urlparse(url)
+        if "boards" not in parsed.netloc:
+            return None
+        embedded = parse_qs(parsed.query).get("for")
+        if embedded:
+            return embedded[0]
+        segments = [p for p in parsed.path.split("/") if p]
+        if segments and segments[0] not in NON_TOKEN_SEGMENTS:
+            return segments[0]
+        return None
+
+    def scrape_direct(self, url: str, on_jobs_found=None) -> Optional[List[Dict[str, Any]]]:
+        """List the board and its descriptions with one call to the boards API."""
+        token = self._board_token(url)
+        if not token:
+            return None
+        region = ".eu" if ".eu." in urlparse(url).netloc else ""
+        api_url = BOARD_API.format(region=region, token=token)
+        try:
+            resp = self.http.get(api_url, headers={"Accept": "application/json"}, timeout=30)
+            if resp.status_code != 200:
+                logger.warning(f"Greenhouse boards API refused {token} ({resp.status_code})")
+                return None
+            postings = resp.json().get("jobs") or []
+        except Exception as e:
+            logger.warning(f"Greenhouse boards API failed for {token}: {e}")
+            return None
+
+        jobs = [self._posting_to_job(posting) for posting in postings if posting.get("absolute_url")]
+        logger.info(f"Greenhouse boards API returned {len(jobs)} jobs for {token}")
+        if on_jobs_found and jobs:
+            on_jobs_found(jobs, stats=self.stats)
+        return jobs
+
+    @staticmethod
+    def _posting_to_job(posting: Dict[str, Any]) -> Dict[str, Any]:
+        # "content" is HTML, itself HTML-escaped
+        content = html.unescape(posting.get("content") or "")
+        description = BeautifulSoup(content, "html.parser").get_text(separator="\n").strip() if content else ""
+        departments = ", ".join(d["name"] for d in posting.get("departments") or [] if d.get("name"))
+        return {
+            "title": posting.get("title", "Unknown"),
+            "company": "Greenhouse Board",
+            "location": (posting.get("location") or {}).get("name") or "Unknown",
+            "department": departments or None,
+            "link": posting["absolute_url"],
+            "platform": "Greenhouse",
+            "posted_at": posting.get("first_published") or posting.get("updated_at"),
+            "description": description,
+        }
+
     def scrape(self, page: Page, url: str, on_jobs_found=None) -> List[Dict[str, Any]]:
         logger.info(f"Scraping Greenhouse: {url}")
         jobs = []
@@ -110,29 +174,16 @@ class GreenhouseStrategy(BaseStrategy):
 
         # Fetch details
         logger.info(f"Fetching details for {len(jobs)} jobs...")
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
+        pending = [job for job in jobs if not job.get("description")]
+        self.enrich_details(pending, self._parse_detail, on_jobs_found=on_jobs_found, timeout=30, verify=False)
 
-        for job in jobs:
-            if job.get("description"): continue
-            
-            try:
-                # Use Playwright for details if available, otherwise requests
-                # But here we are inside scrape, so we have 'page' available.
-                # However, navigating 'page' might be slow if we have many jobs.
-                # Let's stick to requests for speed, but handle timeouts better.
-                
-                resp = requests.get(job['link'], headers=headers, timeout=30, verify=False)
-                if resp.status_code == 200:
-                    soup = BeautifulSoup(resp.text, "html.parser")
-                    # Try common content containers
-                    desc_el = soup.select_one("#content, #main, .content, .main, .job-description, [itemprop='description']")
-                    if desc_el:
-                        job["description"] = desc_el.get_text(separator="\n").strip()
-                        if on_jobs_found:
-                            on_jobs_found([job])
-            except Exception as e:
-                logger.warning(f"Failed to fetch details for {job['link']}: {e}")
-                
         return jobs
+
+    @staticmethod
+    def _parse_detail(job: Dict[str, Any], resp) -> Optional[Dict[str, Any]]:
+        soup = BeautifulSoup(resp.text, "html.parser")
+        # Try common content containers
+        desc_el = soup.select_one("#content, #main, .content, .main, .job-description, [itemprop='description']")
+        if desc_el:
+            return {"description": desc_el.get_text(separator="\n").strip()}
+        return None
@@ -1,14 +1,15 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from playwright.sync_api import Page
 import logging
 from urllib.parse import urlparse
-import requests
 from bs4 import BeautifulSoup
 from .base import BaseStrategy
 
 logger = logging.getLogger(__name__)
 
 class InforStrategy(BaseStrategy):
+    needs_css = True
+
     def can_handle(self, url: str) -> bool:
         return "careers.infor.com" in url
 
@@ -397,82 +398,62 @@ class InforStrategy(BaseStrategy):
             print(f"DEBUG: STARTING DETAIL FETCH FOR {len(jobs)} JOBS")
             logger.info(f"Fetching details for {len(jobs)} jobs via Playwright navigation...")
             
-            for i, job in enumerate(jobs):
-                if job.get("description") and len(job.get("description")) > 100: 
-                    continue
-                
-                # Progress Log
-                logger.info(f"[{i+1}/{len(jobs)}] Fetching details for: {job['title']}")
-                
-                try:
-                    # Optimized Navigation
-                    try:
-                        page.goto(job['link'], wait_until="domcontentloaded", timeout=30000)
-                        # Wait for content instead of hard sleep
-                        try:
-                            page.wait_for_selector(".article__content, .article__header", timeout=5000)
-                        except:
-                            # Proceed anyway, maybe it loaded fast or different structure
-                            pass
-                    except Exception as nav_err:
-                        logger.warning(f"Navigation error for {job['link']}: {nav_err}")
-                        continue
-                    
-                    desc_text = ""
-                    
-                    # Strategy 1: Fast Generic Class Search (Most reliable for Infor)
-                    try:
-                        content_els = page.query_selector_all(".article__content")
-                        for el in content_els:
-                            txt = el.inner_text()
-                            # Skip short or "General Info" blocks
-                            if len(txt) > 200 and "Job ID" not in txt[:100]:
-                                desc_text = txt
-                                break
-                    except:
-                        pass
-
-                    # Strategy 2: Header Search (Fallback)
-                    if not desc_text:
-                        try:
-                            # Look for header and get parent text
-                            header = page.query_selector("h3:has-text('Description & Requirements'), h4:has-text('Description & Requirements')")
-                            if header:
-                                # Try to get the whole container text
-                                container = header.evaluate_handle("el => el.closest('.article, .section') || el.parentElement")
-                                if container:
-                                    desc_text = container.inner_text()
-                        except:
-                            pass
-
-                    # Strategy 3: Blind Text Grab (Last Resort)
-                    if not desc_text:
-                         try:
-                             # Grab the largest text block on the page
-                             desc_text = page.evaluate("""() => {
-                                 let maxLen = 0;
-                                 let maxEl = null;
-                                 document.querySelectorAll('div, section, article').forEach(el => {
-                                     if (el.innerText.length > maxLen && el.innerText.length < 10000) {
-                                         maxLen = el.innerText.length;
-                                         maxEl = el;
-                                     }
-                                 });
-                                 return maxEl ? maxEl.innerText : "";
-                             }""")
-                         except:
-                             pass
-                    
-                    if desc_text:
-                        job["description"] = desc_text
-                        logger.info(f"  -> Success. Length: {len(desc_text)}")
-                    else:
-                        logger.warning("  -> Failed to extract description.")
-                        
-                except Exception as e:
-                    logger.warning(f"Error fetching details for {job['link']}: {e}")
-                    pass
+            pending = [job for job in jobs if len(job.get("description") or "") <= 100]
+            self.enrich_details_in_browser(page, pending, self._extract_detail, on_jobs_found=on_jobs_found,
+                                           wait_selector=".article__content, .article__header")
         else:
              logger.info("No jobs to fetch details for.")
 
         return jobs
+
+    @staticmethod
+    def _extract_detail(page: Page, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        desc_text = ""
+
+        # Strategy 1: Fast Generic Class Search (Most reliable for Infor)
+        try:
+            content_els = page.query_selector_all(".article__content")
+            for el in content_els:
+                txt = el.inner_text()
+                # Skip short or "General Info" blocks
+                if len(txt) > 200 and "Job ID" not in txt[:100]:
+                    desc_text = txt
+                    break
+        except:
+            pass
+
+        # Strategy 2: Header Search (Fallback)
+        if not desc_text:
+            try:
+                # Look for header and get parent text
+                header = page.query_selector("h3:has-text('Description & Requirements'), h4:has-text('Description & Requirements')")
+                if header:
+                    # Try to get the whole container text
+                    container = header.evaluate_handle("el => el.closest('.article, .section') || el.parentElement")
+                    if container:
+                        desc_text = container.inner_text()
+            except:
+                pass
+
+        # Strategy 3: Blind Text Grab (Last Resort)
+        if not desc_text:
+            try:
+                # Grab the largest text block on the page
+                desc_text = page.evaluate("""() => {
+                    let maxLen = 0;
+                    let maxEl = null;
+                    document.querySelectorAll('div, section, article').forEach(el => {
+                        if (el.innerText.length > maxLen && el.innerText.length < 10000) {
+                            maxLen = el.innerText.length;
+                            maxEl = el;
+                        }
+                    });
+                    return maxEl ? maxEl.innerText : "";
+                }""")
+            except:
+                pass
+
+        if not desc_text:
+            logger.warning(f"Failed to extract description for {job['link']}")
+            return None
+        return {"description": desc_text}
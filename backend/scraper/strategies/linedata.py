@@ -1,4 +1,4 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from playwright.sync_api import Page
 import logging
 from urllib.parse import urlparse
@@ -7,6 +7,8 @@ from .base import BaseStrategy
 logger = logging.getLogger(__name__)
 
 class LinedataStrategy(BaseStrategy):
+    needs_css = True
+
     def can_handle(self, url: str) -> bool:
         return "linedata.com" in url
 
@@ -119,60 +121,35 @@ class LinedataStrategy(BaseStrategy):
         # Linedata links redirect to Ceipal (SPA), so we must use Playwright
         if jobs:
             logger.info(f"Fetching details for {len(jobs)} jobs (Ceipal)...")
-            for i, job in enumerate(jobs):
-                try:
-                    # Stream update every 5 jobs or so to keep UI alive
-                    if i % 5 == 0 and on_jobs_found:
-                         on_jobs_found([], stats=self.stats)
-                         
-                    url = job["link"]
-                    logger.info(f"Visiting {url}")
-                    
-                    try:
-                        # Use the existing page to navigate
-                        page.goto(url, wait_until="domcontentloaded", timeout=30000)
-                        
-                        # Wait for the card content
-                        try:
-                            page.wait_for_selector(".p-card-content", timeout=5000)
-                        except:
-                            pass
-                        
-                        # Handle "Show More" button if present
-                        # Look for button with text "Show More" or class .showmore-link
-                        try:
-                            show_more = page.query_selector("button:has-text('Show More'), .showmore-link button")
-                            if show_more and show_more.is_visible():
-                                logger.info("Clicking 'Show More' button...")
-                                show_more.click()
-                                page.wait_for_timeout(1000) # Wait for expansion
-                        except Exception as e:
-                            logger.warning(f"Error handling Show More button: {e}")
+            self.enrich_details_in_browser(page, jobs, self._extract_detail, on_jobs_found=on_jobs_found,
+                                           wait_selector=".p-card-content")
 
-                        # Extract description
-                        # Ceipal uses PrimeNG cards. The description is usually in one of them.
-                        # We'll grab all text from p-card-content
-                        cards = page.query_selector_all(".p-card-content")
-                        full_desc = []
-                        for card in cards:
-                            text = card.inner_text().strip()
-                            if text:
-                                full_desc.append(text)
-                        
-                        if full_desc:
-                            job["description"] = "\n\n".join(full_desc)
-                        else:
-                            # Fallback to body text if no cards found
-                            job["description"] = page.inner_text()
-                            
-                        # Update the job in the stream
-                        if on_jobs_found:
-                            on_jobs_found([job], stats=self.stats)
-                            
-                    except Exception as nav_err:
-                        logger.error(f"Failed to load job page {url}: {nav_err}")
-                        
-                except Exception as e:
-                    logger.error(f"Error fetching details for {job['link']}: {e}")
-                    
         return jobs
+
+    @staticmethod
+    def _extract_detail(page: Page, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # Handle "Show More" button if present
+        # Look for button with text "Show More" or class .showmore-link
+        try:
+            show_more = page.query_selector("button:has-text('Show More'), .showmore-link button")
+            if show_more and show_more.is_visible():
+                logger.info("Clicking 'Show More' button...")
+                show_more.click()
+                page.wait_for_timeout(1000) # Wait for expansion
+        except Exception as e:
+            logger.warning(f"Error handling Show More button: {e}")
+
+        # Extract description
+        # Ceipal uses PrimeNG cards. The description is usually in one of them.
+        # We'll grab all text from p-card-content
+        cards = page.query_selector_all(".p-card-content")
+        full_desc = []
+        for card in cards:
+            text = card.inner_text().strip()
+            if text:
+                full_desc.append(text)
+
+        if full_desc:
+            return {"description": "\n\n".join(full_desc)}
+        # Fallback to body text if no cards found
+        return {"description": page.inner_text("body")}
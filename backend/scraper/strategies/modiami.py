@@ -1,5 +1,6 @@
 from typing import List, Dict, Any
 from playwright.sync_api import Page
+from playwright.async_api import Page as AsyncPage
 import logging
 from urllib.parse import urlparse
 from .base import BaseStrategy
@@ -10,38 +11,58 @@ class ModiamiStrategy(BaseStrategy):
     def can_handle(self, url: str) -> bool:
         return "modiami.com" in url
 
+    # Collect (href, text) pairs in one round trip so sync and async share the parsing
+    ANCHOR_SELECTOR = 'article a[href], a[href*="modiami.com"]'
+    ANCHOR_SCRIPT = "els => els.map(a => [a.getAttribute('href') || '', a.innerText || ''])"
+
     def scrape(self, page: Page, url: str) -> List[Dict[str, Any]]:
         logger.info(f"Scraping Modiami: {url}")
-        jobs: List[Dict[str, Any]] = []
         try:
             try:
                 page.wait_for_selector("a[href]", timeout=8000)
             except:
                 pass
-            anchors = page.query_selector_all('article a[href], a[href*="modiami.com"]')
-            parsed = urlparse(url)
-            base = f"{parsed.scheme}://{parsed.netloc}"
-            for a in anchors:
-                try:
-                    href = a.get_attribute("href") or ""
-                    if not href:
-                        continue
-                    if href.startswith("/"):
-                        href = f"{base}{href}"
-                    if "search/label" in href:
-                        continue
-                    title = a.inner_text().strip()
-                    if not title or len(title) < 3:
-                        continue
-                    jobs.append({
-                        "title": title[:120],
-                        "company": "Modiami",
-                        "location": "Unknown",
-                        "link": href,
-                        "platform": "Modiami"
-                    })
-                except Exception:
-                    continue
+            anchors = page.eval_on_selector_all(self.ANCHOR_SELECTOR, self.ANCHOR_SCRIPT)
+        except Exception as e:
+            logger.error(f"Modiami scrape error: {e}")
+            return []
+        return self._parse_anchors(anchors, url)
+
+    async def scrape_async(self, page: AsyncPage, url: str, on_jobs_found=None) -> List[Dict[str, Any]]:
+        logger.info(f"Scraping Modiami (async): {url}")
+        try:
+            try:
+                await page.wait_for_selector("a[href]", timeout=8000)
+            except:
+                pass
+            anchors = await page.eval_on_selector_all(self.ANCHOR_SELECTOR, self.ANCHOR_SCRIPT)
         except Exception as e:
             logger.error(f"Modiami scrape error: {e}")
+            return []
+        return self._parse_anchors(anchors, url)
+
+    def _parse_anchors(self, anchors: List[List[str]], url: str) -> List[Dict[str, Any]]:
+        jobs: List[Dict[str, Any]] = []
+        parsed = urlparse(url)
+        base = f"{parsed.scheme}://{parsed.netloc}"
+        for href, text in anchors:
+            try:
+                if not href:
+                    continue
+                if href.startswith("/"):
+                    href = f"{base}{href}"
+                if "search/label" in href:
+                    continue
+                title = text.strip()
+                if not title or len(title) < 3:
+                    continue
+                jobs.append({
+                    "title": title[:120],
+                    "company": "Modiami",
+                    "location": "Unknown",
+                    "link": href,
+                    "platform": "Modiami"
+                })
+            except Exception:
+                continue
         return jobs[:100]
@@ -1,14 +1,17 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from playwright.sync_api import Page
 import logging
 import time
-import requests
 from bs4 import BeautifulSoup
 from .base import BaseStrategy
 
 logger = logging.getLogger(__name__)
 
 class PowerToFlyStrategy(BaseStrategy):
+    needs_css = True
+    # PowerToFly starts answering 5xx under heavier parallel load
+    detail_workers = 5
+
     def can_handle(self, url: str) -> bool:
         return "powertofly.com" in url
 
@@ -246,63 +249,18 @@ class PowerToFlyStrategy(BaseStrategy):
             logger.info(f"Finished scrolling. Total jobs: {len(jobs)}. Now fetching details...")
             
             # Now fetch details for each job
-            # Use requests for faster fetching since content is SSR
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-            
-            # Parallel fetching using ThreadPoolExecutor for speed
-            from concurrent.futures import ThreadPoolExecutor, as_completed
-            
-            def fetch_detail(job):
+            # Content is SSR, so the shared detail stage fetches it over plain HTTP in parallel
+            def detail_url(job):
                 link = job.get('link')
                 if not link or link == url:
                     return None
-                
                 # Ensure absolute URL
                 if link.startswith("/"):
                     link = f"https://powertofly.com{link}"
-                
-                try:
-                    # Use Session with Retries for stability
-                    with requests.Session() as session:
-                        from requests.adapters import HTTPAdapter
-                        from urllib3.util.retry import Retry
-                        
-                        retries = Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
-                        adapter = HTTPAdapter(max_retries=retries)
-                        session.mount('http://', adapter)
-                        session.mount('https://', adapter)
-                        
-                        resp = session.get(link, headers=headers, timeout=15)
-                        
-                        if resp.status_code == 200:
-                            soup = BeautifulSoup(resp.text, "html.parser")
-                            desc_el = soup.select_one("#job-description, .job-description, .body, article")
-                            if desc_el:
-                                description = desc_el.get_text(separator="\n").strip()
-                                job["description"] = description
-                                return job
-                            else:
-                                logger.warning(f"No description element found for {link}")
-                        else:
-                            logger.warning(f"Requests failed for {link} (Status: {resp.status_code})")
-                except Exception as req_err:
-                    logger.warning(f"Requests exception for {link}: {req_err}")
-                return None
+                return link
 
             logger.info(f"Fetching details for {len(jobs)} jobs in parallel...")
-            
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                future_to_job = {executor.submit(fetch_detail, job): job for job in jobs}
-                count_updated = 0
-                for future in as_completed(future_to_job):
-                    updated_job = future.result()
-                    if updated_job:
-                        count_updated += 1
-                        if on_jobs_found:
-                            on_jobs_found([updated_job])
-                logger.info(f"Updated details for {count_updated}/{len(jobs)} jobs")
+            self.enrich_details(jobs, self._parse_detail, on_jobs_found=on_jobs_found, url_for=detail_url, timeout=15)
             
             # Note: We rely on requests. If requests fails (e.g. 403), we might miss details.
             # But falling back to Playwright for 200+ jobs is too slow.
@@ -314,6 +272,15 @@ class PowerToFlyStrategy(BaseStrategy):
             
         return jobs
 
+    @staticmethod
+    def _parse_detail(job: Dict[str, Any], resp) -> Optional[Dict[str, Any]]:
+        soup = BeautifulSoup(resp.text, "html.parser")
+        desc_el = soup.select_one("#job-description, .job-description, .body, article")
+        if desc_el:
+            return {"description": desc_el.get_text(separator="\n").strip()}
+        logger.warning(f"No description element found for {resp.url}")
+        return None
+
     def _parse_api_job(self, item: Dict[str, Any]) -> Dict[str, Any]:
         """Helper to parse raw API job data"""
         try:
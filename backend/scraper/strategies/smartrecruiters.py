@@ -1,17 +1,140 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from playwright.sync_api import Page
+from concurrent.futures import ThreadPoolExecutor
 import logging
-from urllib.parse import urlparse
-import requests
+import os
+from urllib.parse import urlparse, quote
 from bs4 import BeautifulSoup
 from .base import BaseStrategy
 
 logger = logging.getLogger(__name__)
 
+# Public postings API, per company identifier
+POSTINGS_API = "https://api.smartrecruiters.com/v1/companies/{company}/postings"
+# Postings collected through the API before stopping
+MAX_JOBS = int(os.environ.get("SCRAPER_SMARTRECRUITERS_MAX_JOBS", "1000"))
+# Largest page the postings endpoint returns
+PAGE_SIZE = 100
+# Listing pages fetched at once once the total is known
+PAGE_WORKERS = 4
+# jobAd sections, in the order a posting page shows them
+JOB_AD_SECTIONS = ("companyDescription", "jobDescription", "qualifications", "additionalInformation")
+
 class SmartRecruitersStrategy(BaseStrategy):
+    # Posting pages rarely change once published
+    http_cache_max_age = 12 * 3600
+
     def can_handle(self, url: str) -> bool:
         return "smartrecruiters.com" in url
 
+    @staticmethod
+    def _company_id(url: str) -> Optional[str]:
+        # jobs.smartrecruiters.com/<company>, careers.smartrecruiters.com/<company>, .../<company>/<posting id>
+        parsed = urlparse(url)
+        if parsed.netloc.split(".")[0] not in ("jobs", "careers"):
+            return None
+        segments = [p for p in parsed.path.split("/") if p]
+        return segments[0] if segments else None
+
+    def scrape_direct(self, url: str, on_jobs_found=None) -> Optional[List[Dict[str, Any]]]:
+        """Page through the public postings API, then fetch posting details in parallel.
+
+        Returns None (so the engine falls back to scrape()) when the URL has
+        no company identifier or the API refuses the listing.
+        """
+        company = self._company_id(url)
+        if not company:
+            return None
+        self.api_base = POSTINGS_API.format(company=quote(company))
+        headers = {"Accept": "application/json"}
+
+        def fetch(offset: int) -> Optional[Dict[str, Any]]:
+            resp = self.http.get(self.api_base, params={"limit": PAGE_SIZE, "offset": offset},
+                                 headers=headers, timeout=20)
+            if resp.status_code != 200:
+                logger.warning(f"SmartRecruiters postings API refused ({resp.status_code}) at offset {offset}: {company}")
+                return None
+            return resp.json()
+
+        try:
+            first = fetch(0)
+        except Exception as e:
+            logger.warning(f"SmartRecruiters postings API failed for {company}: {e}")
+            return None
+        if first is None:
+            return None
+
+        total = first.get("totalFound") or 0
+        target = min(total, MAX_JOBS)
+        logger.info(f"SmartRecruiters API Total: {total}, collecting up to {target}")
+        jobs: List[Dict[str, Any]] = []
+        seen = set()
+
+        def add_page(data: Optional[Dict[str, Any]]) -> None:
+            page_jobs = []
+            for posting in (data or {}).get("content") or []:
+                job = self._posting_to_job(posting, company)
+                if job and job["link"] not in seen and len(jobs) < MAX_JOBS:
+                    seen.add(job["link"])
+                    jobs.append(job)
+                    page_jobs.append(job)
+            if on_jobs_found and page_jobs:
+                on_jobs_found(page_jobs, stats=self.stats)
+
+        add_page(first)
+        offsets = list(range(PAGE_SIZE, target, PAGE_SIZE))
+        self.stats["pages"] = 1 + len(offsets)
+        if offsets:
+            with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as pool:
+                # map keeps offset order, so jobs stay in board order
+                try:
+                    for data in pool.map(fetch, offsets):
+                        add_page(data)
+                except Exception as e:
+                    logger.warning(f"SmartRecruiters paging stopped early: {e}")
+        logger.info(f"SmartRecruiters API returned {len(jobs)} postings for {company}")
+
+        self.enrich_details(jobs, self._parse_posting_detail, on_jobs_found=on_jobs_found,
+                            url_for=self._detail_url, headers=headers, timeout=10)
+        return jobs
+
+    @staticmethod
+    def _posting_to_job(posting: Dict[str, Any], company: str) -> Optional[Dict[str, Any]]:
+        posting_id = posting.get("id")
+        if not posting_id:
+            return None
+        location = posting.get("location") or {}
+        place = location.get("fullLocation") or ", ".join(
+            part for part in (location.get("city"), location.get("region"), (location.get("country") or "").upper())
+            if part)
+        return {
+            "title": posting.get("name", "Unknown"),
+            "company": (posting.get("company") or {}).get("name") or "SmartRecruiters Board",
+            "location": place or "Unknown",
+            "remote": location.get("remote"),
+            "department": (posting.get("department") or {}).get("label") or (posting.get("function") or {}).get("label"),
+            "employment_type": (posting.get("typeOfEmployment") or {}).get("label"),
+            "link": f"https://jobs.smartrecruiters.com/{company}/{posting_id}",
+            "platform": "SmartRecruiters",
+            "posted_at": posting.get("releasedDate"),
+            "description": "",
+        }
+
+    def _detail_url(self, job: Dict[str, Any]) -> str:
+        # Link: https://jobs.smartrecruiters.com/<company>/<posting id>
+        return f"{self.api_base}/{job['link'].rstrip('/').split('/')[-1]}"
+
+    @staticmethod
+    def _parse_posting_detail(job: Dict[str, Any], resp) -> Optional[Dict[str, Any]]:
+        sections = (resp.json().get("jobAd") or {}).get("sections") or {}
+        parts = []
+        for key in JOB_AD_SECTIONS:
+            section = sections.get(key) or {}
+            if section.get("text"):
+                text = BeautifulSoup(section["text"], "html.parser").get_text(separator="\n").strip()
+                parts.append(f"{section.get('title')}\n{text}" if section.get("title") else text)
+        return {"description": "\n\n".join(parts)} if parts else None
+
     def scrape(self, page: Page, url: str, on_jobs_found=None) -> List[Dict[str, Any]]:
         logger.info(f"Scraping SmartRecruiters: {url}")
         jobs: List[Dict[str, Any]] = []
@@ -83,25 +206,18 @@ class SmartRecruitersStrategy(BaseStrategy):
 
             # Fetch Details
             logger.info(f"Fetching details for {len(jobs)} jobs...")
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-            
-            for job in jobs:
-                try:
-                    resp = requests.get(job['link'], headers=headers, timeout=10)
-                    if resp.status_code == 200:
-                        soup = BeautifulSoup(resp.text, "html.parser")
-                        # SmartRecruiters details usually in .job-sections or #job-details
-                        desc_el = soup.select_one(".job-sections, #job-details, main, article")
-                        if desc_el:
-                            job["description"] = desc_el.get_text(separator="\n").strip()
-                            if on_jobs_found:
-                                on_jobs_found([job])
-                except Exception as e:
-                    logger.warning(f"Failed to fetch details for {job['link']}: {e}")
+            self.enrich_details(jobs, self._parse_detail, on_jobs_found=on_jobs_found, timeout=10)
 
         except Exception as e:
             logger.error(f"SmartRecruiters scrape error: {e}")
             
         return jobs
+
+    @staticmethod
+    def _parse_detail(job: Dict[str, Any], resp) -> Optional[Dict[str, Any]]:
+        soup = BeautifulSoup(resp.text, "html.parser")
+        # SmartRecruiters details usually in .job-sections or #job-details
+        desc_el = soup.select_one(".job-sections, #job-details, main, article")
+        if desc_el:
+            return {"description": desc_el.get_text(separator="\n").strip()}
+        return None
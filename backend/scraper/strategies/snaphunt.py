@@ -1,16 +1,27 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from playwright.sync_api import Page, Response
 import logging
 import json
-import requests
 from bs4 import BeautifulSoup
 from .base import BaseStrategy
 
 logger = logging.getLogger(__name__)
 
+# Detail page description containers, most specific first
+DESCRIPTION_SELECTORS = [
+    ".job-description",
+    "[data-testid='job-description']",
+    "div[class*='JobDescription']",
+    "div[class*='jobDescription']",
+    "div[class*='Description']",
+    "article"
+]
+
 print("!!!!!!!!!!!!!!!! SNAPHUNT MODULE LOADED !!!!!!!!!!!!!!!!")
 
 class SnaphuntStrategy(BaseStrategy):
+    needs_css = True
+
     def can_handle(self, url: str) -> bool:
         return "snaphunt.com" in url
 
@@ -25,6 +36,8 @@ class SnaphuntStrategy(BaseStrategy):
         logger.info(f"DEBUG: Entering SnaphuntStrategy.scrape (MODIFIED) for {url}")
         logger.info(f"Scraping Snaphunt: {url}")
         jobs = []
+        # unique key -> job, so each API response is matched in O(len(response))
+        jobs_by_key: Dict[str, Dict[str, Any]] = {}
         self.stats["pages"] = 0
         self.total_jobs_from_api = 0
         self.seen_ids = set()
@@ -78,7 +91,9 @@ class SnaphuntStrategy(BaseStrategy):
 
                     if job_list:
                         # logger.info(f"Intercepted Snaphunt API with {len(job_list)} jobs")
-                            
+                        # Only new or updated jobs are streamed, TaskManager merges by link
+                        changed = []
+
                         for post in job_list:
                             # Map fields
                             title = post.get("title") or post.get("jobTitle", "Unknown")
@@ -89,11 +104,7 @@ class SnaphuntStrategy(BaseStrategy):
                             unique_key = job_id or ref_id or title
                             
                             # Check if we already have this job
-                            existing_job = None
-                            for j in jobs:
-                                if j.get("_id") == unique_key:
-                                    existing_job = j
-                                    break
+                            existing_job = jobs_by_key.get(unique_key)
                             
                             if unique_key in self.seen_ids and not existing_job:
                                 continue
@@ -127,6 +138,7 @@ class SnaphuntStrategy(BaseStrategy):
                                 current_desc = existing_job.get("description", "")
                                 if (not current_desc or len(current_desc) < 50) and description and len(description) > 50:
                                     existing_job["description"] = description
+                                    changed.append(existing_job)
                                     logger.info(f"Updated description for job: {title}")
                                 continue
 
@@ -167,13 +179,15 @@ class SnaphuntStrategy(BaseStrategy):
                                 "_id": unique_key # Store for update matching
                             }
                             jobs.append(job)
+                            jobs_by_key[unique_key] = job
+                            changed.append(job)
                             
                         # Update stats
                         import math
                         self.stats["pages"] = math.ceil(len(jobs) / 20)
                         
-                        if on_jobs_found:
-                            on_jobs_found(jobs, stats=self.stats)
+                        if on_jobs_found and changed:
+                            on_jobs_found(changed, stats=self.stats)
                             
                 except Exception as e:
                     logger.error(f"Error parsing Snaphunt API: {e}")
@@ -251,49 +265,27 @@ class SnaphuntStrategy(BaseStrategy):
             logger.info(f"Collected {len(jobs)} jobs. Checking for missing descriptions...")
             print(f"DEBUG: Starting detail scraping for {len(jobs)} jobs...", flush=True)
             
-            for i, job in enumerate(jobs):
-                # If description is too short (likely just a summary) or empty
-                if len(job.get("description", "")) < 100:
-                    link = job.get("link")
-                    if link and "snaphunt.com" in link:
-                        try:
-                            logger.info(f"Fetching details for job {i+1}/{len(jobs)}: {link}")
-                            print(f"DEBUG: Fetching details for job {i+1}: {link}", flush=True)
-                            
-                            page.goto(link, wait_until="domcontentloaded", timeout=30000)
-                            page.wait_for_timeout(2000) # Wait for React to render
-                            
-                            # Selectors to try
-                            selectors = [
-                                ".job-description", 
-                                "[data-testid='job-description']", 
-                                "div[class*='JobDescription']", 
-                                "div[class*='jobDescription']",
-                                "div[class*='Description']",
-                                "article"
-                            ]
-                            
-                            full_desc = ""
-                            for sel in selectors:
-                                try:
-                                    el = page.query_selector(sel)
-                                    if el and el.is_visible():
-                                        text = el.inner_html() # Use HTML to preserve formatting if possible, or inner_text
-                                        # If text is substantial
-                                        if len(text) > 100:
-                                            full_desc = text
-                                            logger.info(f"Found description with selector: {sel}")
-                                            break
-                                except:
-                                    continue
-                            
-                            if full_desc:
-                                job["description"] = full_desc
-                            else:
-                                logger.warning(f"Could not find description for {link}")
-                                
-                        except Exception as e:
-                            logger.error(f"Failed to fetch details for {link}: {e}")
-                            print(f"DEBUG: Error fetching details: {e}", flush=True)
-                            
+            # If description is too short (likely just a summary) or empty
+            pending = [job for job in jobs
+                       if len(job.get("description", "")) < 100 and "snaphunt.com" in (job.get("link") or "")]
+            # Wait for React to render the description instead of a fixed delay
+            self.enrich_details_in_browser(page, pending, self._extract_detail, on_jobs_found=on_jobs_found,
+                                           wait_selector=", ".join(DESCRIPTION_SELECTORS))
+
         return jobs
+
+    @staticmethod
+    def _extract_detail(page: Page, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        for sel in DESCRIPTION_SELECTORS:
+            try:
+                el = page.query_selector(sel)
+                if el and el.is_visible():
+                    text = el.inner_html() # Use HTML to preserve formatting if possible, or inner_text
+                    # If text is substantial
+                    if len(text) > 100:
+                        logger.info(f"Found description with selector: {sel}")
+                        return {"description": text}
+            except:
+                continue
+        logger.warning(f"Could not find description for {job['link']}")
+        return None
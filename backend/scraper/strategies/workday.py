@@ -1,18 +1,135 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from playwright.sync_api import Page, Response
+from concurrent.futures import ThreadPoolExecutor
 import logging
-from urllib.parse import urlparse
+import os
+from urllib.parse import urlparse, parse_qs
 import time
-import requests
 from .base import BaseStrategy
 
 logger = logging.getLogger(__name__)
 
+# Postings collected through the CXS search API before stopping
+MAX_JOBS = int(os.environ.get("SCRAPER_WORKDAY_MAX_JOBS", "1000"))
+# The CXS search endpoint rejects larger pages
+PAGE_SIZE = 20
+# Search pages fetched at once once the total is known
+PAGE_WORKERS = 4
+# Query parameters of a board URL that are not search facets: the search text and
+# campaign / referral tracking that CXS rejects with a 400 when sent as a facet
+NON_FACET_PARAMS = frozenset({
+    "q", "source", "src", "ref", "referrer", "gh_src", "lever-source", "trk", "trackingid",
+    "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "_ga", "_gl", "clientrequestid", "redirect",
+})
+# Any parameter with one of these prefixes is tracking too (utm_source, utm_medium, ...)
+NON_FACET_PREFIXES = ("utm_", "ga_", "hsa_")
+
 class WorkdayStrategy(BaseStrategy):
+    needs_css = True
+    # CXS job details rarely change once published
+    http_cache_max_age = 12 * 3600
+    max_jobs = MAX_JOBS
+
     def can_handle(self, url: str) -> bool:
         return "myworkdayjobs.com" in url
 
-    def scrape(self, page: Page, url: str) -> List[Dict[str, Any]]:
+    def scrape_direct(self, url: str, on_jobs_found=None) -> Optional[List[Dict[str, Any]]]:
+        """Collect postings from the CXS search API without a browser.
+
+        Returns None (so the engine falls back to scrape()) when the API
+        cannot be derived or refuses the search.
+        """
+        self.base_api_url = self._derive_api_url(url)
+        if not self.base_api_url:
+            return None
+        search_url = f"{self.base_api_url}/jobs"
+        body = self._search_body(url)
+        headers = {"Accept": "application/json", "Content-Type": "application/json"}
+
+        def fetch(offset: int) -> Optional[Dict[str, Any]]:
+            resp = self.http.post(search_url, json={**body, "offset": offset}, headers=headers, timeout=20)
+            if resp.status_code != 200 or "json" not in resp.headers.get("content-type", ""):
+                logger.warning(f"Workday CXS search refused ({resp.status_code}) at offset {offset}: {search_url}")
+                return None
+            return resp.json()
+
+        try:
+            first = fetch(0)
+        except Exception as e:
+            logger.warning(f"Workday CXS search failed for {url}: {e}")
+            return None
+        if first is None:
+            return None
+
+        # Only the first page reliably carries the total
+        self.api_jobs_total = first.get("total") or 0
+        target = min(self.api_jobs_total, self.max_jobs)
+        logger.info(f"Workday API Total: {self.api_jobs_total}, collecting up to {target}")
+        site_base = self._site_base(url)
+        jobs: List[Dict[str, Any]] = []
+        seen = set()
+
+        def add_page(data: Optional[Dict[str, Any]]) -> int:
+            page_jobs = []
+            for posting in (data or {}).get("jobPostings") or []:
+                job = self._posting_to_job(posting, site_base)
+                if job and job["link"] not in seen and len(jobs) < self.max_jobs:
+                    seen.add(job["link"])
+                    jobs.append(job)
+                    page_jobs.append(job)
+            if on_jobs_found and page_jobs:
+                on_jobs_found(page_jobs, stats=self.stats)
+            return len(page_jobs)
+
+        add_page(first)
+        offsets = list(range(PAGE_SIZE, target, PAGE_SIZE))
+        self.stats["pages"] = 1 + len(offsets)
+        if offsets:
+            with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as pool:
+                # map keeps offset order, so jobs stay in board order
+                try:
+                    for data in pool.map(fetch, offsets):
+                        add_page(data)
+                except Exception as e:
+                    logger.warning(f"Workday CXS paging stopped early: {e}")
+        logger.info(f"Workday API returned {len(jobs)} postings for {url}")
+
+        self.enrich_details(jobs, self._parse_detail, on_jobs_found=on_jobs_found,
+                            url_for=self._detail_url, headers={"Accept": "application/json"}, timeout=10)
+        return jobs
+
+    @staticmethod
+    def _search_body(url: str) -> Dict[str, Any]:
+        # Board URLs carry the search facets as query parameters (?locations=...&jobFamilyGroup=...)
+        query = parse_qs(urlparse(url).query)
+        facets = {k: v for k, v in query.items()
+                  if k.lower() not in NON_FACET_PARAMS and not k.lower().startswith(NON_FACET_PREFIXES)}
+        return {"appliedFacets": facets, "limit": PAGE_SIZE, "offset": 0,
+                "searchText": (query.get("q") or [""])[0]}
+
+    @staticmethod
+    def _site_base(url: str) -> str:
+        # https://tenant.wd3.myworkdayjobs.com/en-US/Careers?x=y -> https://tenant.wd3.myworkdayjobs.com/en-US/Careers
+        parsed = urlparse(url)
+        path = parsed.path.split("/job/")[0].rstrip("/")
+        return f"{parsed.scheme}://{parsed.netloc}{path}"
+
+    @staticmethod
+    def _posting_to_job(posting: Dict[str, Any], site_base: str) -> Optional[Dict[str, Any]]:
+        path = posting.get("externalPath")
+        if not path:
+            return None
+        return {
+            "title": posting.get("title", "Unknown"),
+            "link": f"{site_base}{path}",
+            "location": posting.get("locationsText") or "Unknown",
+            "company": "Workday Board",
+            "platform": "Workday",
+            "posted": posting.get("postedOn"),
+            "description": "",
+        }
+
+    def scrape(self, page: Page, url: str, on_jobs_found=None) -> List[Dict[str, Any]]:
         logger.info(f"Scraping Workday: {url}")
         jobs: List[Dict[str, Any]] = []
         self.api_jobs_total = 0
@@ -115,67 +232,66 @@ class WorkdayStrategy(BaseStrategy):
             
             # Fallback: Construct Base API URL if not intercepted
             if not self.base_api_url:
-                try:
-                    parsed = urlparse(url)
-                    # Host: tenant.wdX.myworkdayjobs.com
-                    parts = parsed.netloc.split(".")
-                    tenant = parts[0]
-                    
-                    # Path: /en-US/site or /site
-                    path_parts = [p for p in parsed.path.split("/") if p]
-                    site = ""
-                    if path_parts:
-                        # Skip locale if present
-                        if len(path_parts[0]) == 5 and "-" in path_parts[0]:
-                            if len(path_parts) > 1:
-                                site = path_parts[1]
-                        else:
-                            site = path_parts[0]
-                    
-                    if site:
-                        self.base_api_url = f"https://{parsed.netloc}/wday/cxs/{tenant}/{site}"
-                        logger.info(f"Constructed Base API URL fallback: {self.base_api_url}")
-                except Exception as e:
-                    logger.warning(f"Failed to construct fallback API URL: {e}")
+                self.base_api_url = self._derive_api_url(url)
             
-            # Fetch details
             for job in collected_job_data:
-                description = ""
-                location = "Unknown"
-                
-                if self.base_api_url:
-                    # Construct detail API URL
-                    # Link: .../job/Douala/Senior-Audit-IT--F-H-_R-7763
-                    # API: .../job/Senior-Audit-IT--F-H-_R-7763
-                    try:
-                        slug = job["link"].split("/")[-1]
-                        detail_url = f"{self.base_api_url}/job/{slug}"
-                        
-                        # We use requests here for speed, assuming public API
-                        # Headers might be needed? Usually Accept: application/json is enough
-                        headers = {
-                            "Accept": "application/json",
-                            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-                        }
-                        
-                        resp = requests.get(detail_url, headers=headers, timeout=10)
-                        if resp.status_code == 200:
-                            data = resp.json()
-                            if "jobPostingInfo" in data:
-                                info = data["jobPostingInfo"]
-                                description = info.get("jobDescription", "")
-                                location = info.get("location", location)
-                                # Additional location info
-                                if info.get("additionalLocations"):
-                                    location += f", {', '.join(info.get('additionalLocations'))}"
-                    except Exception as e:
-                        logger.error(f"Failed to fetch details for {job['link']}: {e}")
-                
-                job["description"] = description
-                job["location"] = location
+                job["description"] = ""
                 jobs.append(job)
 
+            if on_jobs_found and jobs:
+                on_jobs_found(jobs, stats=self.stats)
+
+            # Fetch details from the public CXS API through the shared detail stage
+            if self.base_api_url:
+                self.enrich_details(jobs, self._parse_detail, on_jobs_found=on_jobs_found,
+                                    url_for=self._detail_url, headers={"Accept": "application/json"}, timeout=10)
+
         except Exception as e:
             logger.error(f"Workday scrape error: {e}")
             
         return jobs
+
+    @staticmethod
+    def _derive_api_url(url: str) -> Optional[str]:
+        try:
+            parsed = urlparse(url)
+            # Host: tenant.wdX.myworkdayjobs.com
+            parts = parsed.netloc.split(".")
+            tenant = parts[0]
+            
+            # Path: /en-US/site or /site
+            path_parts = [p for p in parsed.path.split("/") if p]
+            site = ""
+            if path_parts:
+                # Skip locale if present
+                if len(path_parts[0]) == 5 and "-" in path_parts[0]:
+                    if len(path_parts) > 1:
+                        site = path_parts[1]
+                else:
+                    site = path_parts[0]
+            
+            if site:
+                api_url = f"https://{parsed.netloc}/wday/cxs/{tenant}/{site}"
+                logger.info(f"Constructed Base API URL fallback: {api_url}")
+                return api_url
+        except Exception as e:
+            logger.warning(f"Failed to construct fallback API URL: {e}")
+        return None
+
+    def _detail_url(self, job: Dict[str, Any]) -> str:
+        # Link: .../job/Douala/Senior-Audit-IT--F-H-_R-7763
+        # API: .../job/Senior-Audit-IT--F-H-_R-7763
+        slug = job["link"].split("/")[-1]
+        return f"{self.base_api_url}/job/{slug}"
+
+    @staticmethod
+    def _parse_detail(job: Dict[str, Any], resp) -> Optional[Dict[str, Any]]:
+        data = resp.json()
+        if "jobPostingInfo" not in data:
+            return None
+        info = data["jobPostingInfo"]
+        location = info.get("location", job.get("location", "Unknown"))
+        # Additional location info
+        if info.get("additionalLocations"):
+            location += f", {', '.join(info.get('additionalLocations'))}"
+        return {"description": info.get("jobDescription", ""), "location": location}
@@ -3,7 +3,6 @@ from playwright.sync_api import Page
 import logging
 import re
 from datetime import datetime
-import requests
 from .base import BaseStrategy
 
 logger = logging.getLogger(__name__)
@@ -18,7 +17,7 @@ class WorkingNomadsStrategy(BaseStrategy):
         try:
             api_url = "https://www.workingnomads.com/api/exposed_jobs/"
             try:
-                resp = requests.get(api_url, timeout=20)
+                resp = self.http.get(api_url, timeout=20)
                 if resp.status_code == 200:
                     data = resp.json()
                     items = data.get("jobs") or data
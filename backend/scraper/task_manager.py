@@ -1,120 +1,545 @@
 import uuid
-from dataclasses import dataclass, field
-from typing import Dict, Any, List
+import json
+import os
+import queue
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field, fields
+from typing import Deque, Dict, Any, IO, Iterable, List, Optional, Tuple
 import threading
 import logging
+from .dates import merge_job
+from .storage import JobStore, default_store
+from .utils import json_default
 
 logger = logging.getLogger(__name__)
 
+# Retention of finished tasks in memory; running tasks are never evicted.
+# 0 disables a limit.
+MAX_TASKS = int(os.environ.get("SCRAPER_MAX_TASKS", "50"))
+TASK_MAX_AGE_HOURS = float(os.environ.get("SCRAPER_TASK_MAX_AGE_HOURS", "24"))
+MAX_JOBS_IN_MEMORY = int(os.environ.get("SCRAPER_MAX_JOBS_IN_MEMORY", "100000"))
+# Write evicted tasks out in full before dropping them (needs a store)
+SPILL_EVICTED = os.environ.get("SCRAPER_SPILL_EVICTED", "1").lower() not in ("0", "false", "no")
+
+# Log records kept per task; older ones only survive in the optional log file
+LOG_CAPACITY = int(os.environ.get("SCRAPER_LOG_CAPACITY", "500"))
+# Records the status endpoint returns unless asked for all of them
+LOG_TAIL = int(os.environ.get("SCRAPER_LOG_TAIL", "50"))
+# When set, every record is also appended as a JSON line to <dir>/<task_id>.log
+LOG_DIR = os.environ.get("SCRAPER_TASK_LOG_DIR", "")
+
 @dataclass
 class ScrapingTask:
     task_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     status: str = "pending"
     progress: int = 0
     total: int = 0
-    logs: List[str] = field(default_factory=list)
+    # Ring buffer of {"seq", "ts", "level", "event", "url", "message", counts...}
+    logs: Deque[Dict[str, Any]] = field(default_factory=lambda: deque(maxlen=LOG_CAPACITY))
     results: List[Dict[str, Any]] = field(default_factory=list)
     awaiting_approval: bool = False
     next_url: str = ""
     approve_all: bool = False
     skip_next: bool = False
+    # Bumped on every change; clients pass it back as ?since= to get a delta
+    seq: int = 0
 
 class TaskManager:
-    def __init__(self):
-        self.tasks: Dict[str, ScrapingTask] = {}
+    # Result statuses that count towards task progress
+    FINAL_STATUSES = ("success", "error", "skipped")
+    # Job fields left out of summary deltas, they dominate the payload
+    SUMMARY_OMIT = ("description", "details")
+    # Task fields sent with every delta
+    TASK_FIELDS = ("task_id", "status", "progress", "total", "awaiting_approval", "next_url",
+                   "approve_all", "skip_next", "seq")
+
+    def __init__(self, store: Optional[JobStore] = None, max_tasks: int = MAX_TASKS,
+                 max_age_hours: float = TASK_MAX_AGE_HOURS, max_jobs: int = MAX_JOBS_IN_MEMORY,
+                 spill: bool = SPILL_EVICTED):
+        # Least recently used first, finished tasks are evicted from the front
+        self.tasks: "OrderedDict[str, ScrapingTask]" = OrderedDict()
+        self.max_tasks = max_tasks
+        self.max_age_hours = max_age_hours
+        self.max_jobs = max_jobs
+        self.spill = spill
+        # task_id -> time the task finished (or was reloaded), for max_age_hours
+        self._finished_at: Dict[str, float] = {}
+        self._evicted = 0
         self.lock = threading.Lock()
+        # Notified on every change so event streams wake up instead of polling
+        self.changed = threading.Condition(self.lock)
+        # Lookup indexes kept next to the tasks so streamed batches cost O(batch):
+        # task_id -> url -> position in task.results
+        self._result_index: Dict[str, Dict[str, int]] = {}
+        # (task_id, url) -> job link -> position in result["jobs"]
+        self._job_index: Dict[Tuple[str, str], Dict[str, int]] = {}
+        # task_id -> {(kind, ref): latest seq}, oldest change first. kind is "result"
+        # (ref: url) or "job" (ref: (url, position)); a ref moves to the end when it
+        # changes again, so the map stays as large as the task itself. Task fields
+        # are sent with every delta and logs carry their own seq.
+        self._journal: Dict[str, "OrderedDict[Tuple[str, Any], int]"] = {}
+        self.log_dir = LOG_DIR
+        self._log_files: Dict[str, IO[str]] = {}
+        # Tasks, results and jobs are written through so they survive restarts
+        self.store = store if store is not None else default_store()
+        # Writes are queued under the lock and done (serialization included) by
+        # one background thread, so readers never wait on SQLite
+        self._writes: "queue.Queue[Optional[Tuple[str, tuple]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+
+    def _persist(self, method: str, *args):
+        if self.store is None:
+            return
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name="task-store-writer", daemon=True)
+            self._writer.start()
+        self._writes.put((method, args))
+
+    def _write_loop(self):
+        while True:
+            item = self._writes.get()
+            try:
+                if item is None:
+                    return
+                method, args = item
+                try:
+                    getattr(self.store, method)(*args)
+                except Exception as e:
+                    # The in-memory copy stays authoritative, a failed write must not stop a scrape
+                    logger.error(f"[TaskManager] Failed to persist {method} for task {args[0]}: {e}")
+            finally:
+                self._writes.task_done()
+
+    def flush(self):
+        """Wait until every queued store write is done."""
+        if self._writer is not None:
+            self._writes.join()
+
+    def _persist_task(self, task: ScrapingTask):
+        self._persist("save_task", task.task_id, task.status, task.progress, task.total)
+
+    def _persist_result(self, task: ScrapingTask, result: Dict[str, Any], with_jobs: bool = True):
+        position = self._result_index.get(task.task_id, {}).get(result["url"], len(task.results))
+        self._persist("save_result", task.task_id, position, self._snapshot(result, with_jobs))
+
+    @staticmethod
+    def _snapshot(result: Dict[str, Any], with_jobs: bool, omit: Iterable[str] = ()) -> Dict[str, Any]:
+        # Shallow copies taken under the lock, the writer serializes them while scrapes go on.
+        # "jobs" and "jobs_unfiltered" share their dicts, and so do the copies.
+        copies: Dict[int, Dict[str, Any]] = {}
+
+        def copy(job: Dict[str, Any]) -> Dict[str, Any]:
+            if id(job) not in copies:
+                copies[id(job)] = dict(job)
+            return copies[id(job)]
+
+        snapshot = {}
+        for key, value in result.items():
+            if key in omit:
+                continue
+            if key in ("jobs", "jobs_unfiltered"):
+                if with_jobs:
+                    snapshot[key] = [copy(job) for job in value or []]
+            else:
+                snapshot[key] = dict(value) if isinstance(value, dict) else value
+        return snapshot
+
+    def _next_seq(self, task: ScrapingTask) -> int:
+        task.seq += 1
+        self.changed.notify_all()
+        return task.seq
+
+    def _bump(self, task: ScrapingTask, kind: str, ref: Any = None):
+        seq = self._next_seq(task)
+        if kind == "task":
+            return
+        journal = self._journal.setdefault(task.task_id, OrderedDict())
+        journal[(kind, ref)] = seq
+        journal.move_to_end((kind, ref))
+
+    def _append_log(self, task: ScrapingTask, message: str, level: str = "info", url: Optional[str] = None,
+                    event: Optional[str] = None, **counts: int):
+        record = {"seq": self._next_seq(task), "ts": time.time(), "level": level, "event": event,
+                  "url": url, "message": message, **counts}
+        task.logs.append(record)
+        if self.log_dir:
+            self._write_log_file(task.task_id, record)
+
+    def _write_log_file(self, task_id: str, record: Dict[str, Any]):
+        try:
+            handle = self._log_files.get(task_id)
+            if handle is None:
+                os.makedirs(self.log_dir, exist_ok=True)
+                handle = open(os.path.join(self.log_dir, f"{task_id}.log"), "a", encoding="utf-8")
+                self._log_files[task_id] = handle
+            handle.write(json.dumps(record, default=json_default) + "\n")
+            handle.flush()
+        except OSError as e:
+            logger.error(f"[TaskManager] Failed to write log file for task {task_id}: {e}")
+
+    def _close_log_file(self, task_id: str):
+        handle = self._log_files.pop(task_id, None)
+        if handle is not None:
+            handle.close()
+
+    def _find_result(self, task: ScrapingTask, url: str) -> Optional[Dict[str, Any]]:
+        position = self._result_index.get(task.task_id, {}).get(url)
+        return task.results[position] if position is not None else None
+
+    def _append_result(self, task: ScrapingTask, result: Dict[str, Any]):
+        self._result_index.setdefault(task.task_id, {})[result["url"]] = len(task.results)
+        task.results.append(result)
+
+    def _links(self, task_id: str, result: Dict[str, Any]) -> Dict[str, int]:
+        key = (task_id, result["url"])
+        links = self._job_index.get(key)
+        if links is None:
+            # Built once per result (or after its job list was replaced), then kept up to date
+            links = {j.get("link"): i for i, j in enumerate(result["jobs"]) if j.get("link")}
+            self._job_index[key] = links
+        return links
 
     def create_task(self, total_urls: int) -> ScrapingTask:
         with self.lock:
             task = ScrapingTask(total=total_urls)
             self.tasks[task.task_id] = task
+            self._result_index[task.task_id] = {}
+            self._journal[task.task_id] = OrderedDict()
+            self._persist_task(task)
+            self._enforce_retention()
             return task
 
     def get_task(self, task_id: str) -> ScrapingTask:
         with self.lock:
-            return self.tasks.get(task_id)
+            task = self.tasks.get(task_id)
+            if task is not None:
+                self.tasks.move_to_end(task_id)
+                return task
+        if self.store is None:
+            return None
+        # Read outside the lock: draining the write queue and SQLite must not stall
+        # every other caller, least of all for ids that turn out to be unknown
+        row = self._read_task(task_id)
+        if row is None:
+            return None
+        with self.lock:
+            return self._install_task(row)
+
+    def _read_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            # An evicted task may still have writes queued
+            self.flush()
+            return self.store.load_task(task_id)
+        except Exception as e:
+            logger.error(f"[TaskManager] Failed to load task {task_id}: {e}")
+            return None
+
+    def _install_task(self, row: Dict[str, Any]) -> ScrapingTask:
+        task_id = row["task_id"]
+        if task_id in self.tasks:
+            # Loaded by another caller meanwhile
+            self.tasks.move_to_end(task_id)
+            return self.tasks[task_id]
+        task = ScrapingTask(task_id=row["task_id"], status=row["status"], progress=row["progress"],
+                            total=row["total"], results=row["results"])
+        if task.status not in ("completed", "failed"):
+            # Nothing is running it anymore after a restart
+            task.status = "failed"
+            self._persist_task(task)
+        self.tasks[task_id] = task
+        self._finished_at[task_id] = time.time()
+        self._result_index[task_id] = {r["url"]: i for i, r in enumerate(task.results)}
+        # Replay the restored state so ?since=0 returns all of it
+        self._journal[task_id] = OrderedDict()
+        for result in task.results:
+            self._bump(task, "result", result["url"])
+            for position in range(len(result.get("jobs") or [])):
+                self._bump(task, "job", (result["url"], position))
+        if row["status"] not in ("completed", "failed"):
+            self._append_log(task, "Task was interrupted by a server restart", level="warning", event="interrupted")
+        self._enforce_retention(keep=task_id)
+        return task
+
+    @staticmethod
+    def _count_jobs(task: ScrapingTask) -> int:
+        # "jobs" is a view on "jobs_unfiltered" when both are present
+        return sum(len(r.get("jobs_unfiltered") or r.get("jobs") or []) for r in task.results)
+
+    def _enforce_retention(self, keep: Optional[str] = None):
+        """Evict finished tasks, oldest access first, until every limit holds.
+
+        ``keep`` is the task being handed to a caller, it stays even if over a limit.
+        """
+        finished = [tid for tid, t in self.tasks.items()
+                    if t.status in ("completed", "failed") and tid != keep]
+        if not finished:
+            return
+        if self.max_age_hours > 0:
+            cutoff = time.time() - self.max_age_hours * 3600
+            for tid in [tid for tid in finished if self._finished_at.get(tid, 0) < cutoff]:
+                self._evict(tid, "age")
+                finished.remove(tid)
+        jobs_held = self._count_jobs_held() if self.max_jobs > 0 else 0
+        for tid in finished:
+            over_tasks = self.max_tasks > 0 and len(self.tasks) > self.max_tasks
+            over_jobs = self.max_jobs > 0 and jobs_held > self.max_jobs
+            if not over_tasks and not over_jobs:
+                break
+            jobs_held -= self._count_jobs(self.tasks[tid])
+            self._evict(tid, "tasks" if over_tasks else "jobs")
+
+    def _count_jobs_held(self) -> int:
+        return sum(self._count_jobs(t) for t in self.tasks.values())
+
+    def _evict(self, task_id: str, reason: str):
+        task = self.tasks.pop(task_id)
+        if self.spill and self.store is not None:
+            # Write-through already saved it; a full rewrite covers writes that failed
+            self._persist_task(task)
+            for result in task.results:
+                self._persist_result(task, result)
+        for url in self._result_index.pop(task_id, {}):
+            self._job_index.pop((task_id, url), None)
+        self._journal.pop(task_id, None)
+        self._finished_at.pop(task_id, None)
+        self._close_log_file(task_id)
+        self._evicted += 1
+        where = "spilled to the store" if self.spill and self.store is not None else "dropped"
+        logger.info(f"[TaskManager] Evicted task {task_id} ({reason} limit), {where}")
+
+    def metrics(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "tasks_in_memory": len(self.tasks),
+                "tasks_running": sum(1 for t in self.tasks.values() if t.status not in ("completed", "failed")),
+                "jobs_in_memory": self._count_jobs_held(),
+                "tasks_evicted": self._evicted,
+                "limits": {
+                    "max_tasks": self.max_tasks,
+                    "max_age_hours": self.max_age_hours,
+                    "max_jobs": self.max_jobs,
+                    "spill": self.spill and self.store is not None,
+                },
+            }
 
     def update_task_status(self, task_id: str, status: str):
         with self.lock:
             if task := self.tasks.get(task_id):
                 task.status = status
+                self._bump(task, "task")
+                self._persist_task(task)
+                if status in ("completed", "failed"):
+                    self._finished_at[task_id] = time.time()
+                    self._close_log_file(task_id)
+                    self._enforce_retention(keep=task_id)
 
-    def add_log(self, task_id: str, message: str):
+    def add_log(self, task_id: str, message: str, level: str = "info", url: Optional[str] = None,
+                event: Optional[str] = None, **counts: int):
+        """Append a structured log record; ``counts`` are extra numeric fields (jobs=12, ...)."""
         with self.lock:
             if task := self.tasks.get(task_id):
-                task.logs.append(message)
+                self._append_log(task, message, level=level, url=url, event=event, **counts)
+
+    def log_tail(self, task: ScrapingTask, limit: Optional[int] = LOG_TAIL) -> List[Dict[str, Any]]:
+        with self.lock:
+            logs = list(task.logs)
+        if limit is None:
+            return logs
+        return logs[-limit:] if limit > 0 else []
+
+    def task_snapshot(self, task: ScrapingTask, log_limit: Optional[int] = LOG_TAIL,
+                      omit: Iterable[str] = ()) -> Dict[str, Any]:
+        """The task as a dict of shallow copies, taken under the lock.
+
+        Scrape threads keep changing the live results and jobs; serializing the
+        copies cannot see a dict change size halfway. ``omit`` lists result
+        keys to leave out, ``log_limit`` keeps only the newest log records.
+        """
+        with self.lock:
+            data = {f.name: getattr(task, f.name) for f in fields(task) if f.name not in ("logs", "results")}
+            data["results"] = [self._snapshot(r, with_jobs=True, omit=omit) for r in task.results]
+            logs = list(task.logs)
+            if log_limit is not None:
+                logs = logs[-log_limit:] if log_limit > 0 else []
+            data["logs"] = [dict(r) for r in logs]
+        return data
 
     def add_result(self, task_id: str, result: Dict[str, Any]):
         with self.lock:
             if task := self.tasks.get(task_id):
                 # Check if result for this URL already exists (partial update case)
-                existing = next((r for r in task.results if r["url"] == result["url"]), None)
+                existing = self._find_result(task, result["url"])
                 if existing:
-                    # Update existing result
+                    # Update existing result; progress is the count of completed URLs,
+                    # so only count the first transition into a final status
+                    was_final = existing.get("status") in self.FINAL_STATUSES
                     existing.update(result)
-                    if result.get("status") in ["success", "error"]:
-                        # Only increment progress if it's a completion update and wasn't already counted?
-                        # Actually progress is usually just "count of completed URLs".
-                        # If we initialized it earlier, we shouldn't increment again?
-                        # Let's handle progress separately or assume add_result is final.
-                        pass
+                    if "jobs" in result:
+                        # The job list was replaced, rebuild its link index on next use
+                        self._job_index.pop((task_id, result["url"]), None)
+                    if not was_final and result.get("status") in self.FINAL_STATUSES:
+                        task.progress += 1
+                    self._persist_result(task, existing)
                 else:
-                    task.results.append(result)
+                    self._append_result(task, result)
                     task.progress += 1
+                    self._persist_result(task, result)
+                self._bump(task, "result", result["url"])
+                for position in range(len(result.get("jobs") or [])):
+                    self._bump(task, "job", (result["url"], position))
+                self._persist_task(task)
 
-    def init_result(self, task_id: str, url: str):
+    def init_result(self, task_id: str, url: str, status: str = "running"):
         with self.lock:
             if task := self.tasks.get(task_id):
+                existing = self._find_result(task, url)
+                if existing:
+                    # Placeholder was registered ahead of time (parallel runs), keep its position
+                    existing["status"] = status
+                    self._bump(task, "result", url)
+                    self._persist_result(task, existing, with_jobs=False)
+                    return
                 # Add placeholder result
                 logger.info(f"[TaskManager] Init result for task {task_id}, url {url}")
-                task.results.append({
+                placeholder = {
                     "url": url,
-                    "status": "running",
+                    "status": status,
                     "jobs": [],
                     "platform": "Pending...",
                     "total_found": 0
-                })
+                }
+                self._append_result(task, placeholder)
+                self._bump(task, "result", url)
+                self._persist_result(task, placeholder)
                 # We don't increment progress yet, progress is completed URLs
 
-    def update_result_jobs(self, task_id: str, url: str, new_jobs: List[Dict[str, Any]], stats: Dict[str, Any] = None):
+    def update_result_jobs(self, task_id: str, url: str, new_jobs: List[Dict[str, Any]],
+                           stats: Dict[str, Any] = None) -> Tuple[int, int]:
+        """Merge streamed jobs into the URL's result; returns ``(added, updated)``."""
         with self.lock:
             if task := self.tasks.get(task_id):
-                for res in task.results:
-                    if res["url"] == url:
-                        # Update stats if provided
-                        if stats:
-                            res["stats"] = stats
-                        
-                        # Merge logic: use link as unique key
-                        existing_map = {j.get("link"): j for j in res["jobs"] if j.get("link")}
-                        added_count = 0
-                        
-                        for job in new_jobs:
-                            link = job.get("link")
-                            if link and link in existing_map:
-                                # Update existing job
-                                existing_map[link].update(job)
-                            else:
-                                # Add new job
-                                res["jobs"].append(job)
-                                added_count += 1
-                        
-                        logger.info(f"[TaskManager] Streamed jobs for task {task_id}. Added: {added_count}, Updated: {len(new_jobs) - added_count}. Total: {len(res['jobs'])}")
-                        res["total_found"] = len(res["jobs"])
-                        break
+                res = self._find_result(task, url)
+                if res is None:
+                    return 0, 0
+                # Update stats if provided
+                if stats:
+                    res["stats"] = stats
+
+                # Merge logic: use link as unique key
+                links = self._links(task_id, res)
+                added_count = 0
+                touched = []
+
+                for job in new_jobs:
+                    link = job.get("link")
+                    position = links.get(link) if link else None
+                    if position is not None:
+                        stored = res["jobs"][position]
+                        if job.items() <= stored.items():
+                            # Re-sent unchanged (strategies that stream their whole list each batch)
+                            continue
+                        merge_job(stored, job)
+                    else:
+                        # Add new job
+                        position = len(res["jobs"])
+                        res["jobs"].append(job)
+                        added_count += 1
+                        if link:
+                            links[link] = position
+                    touched.append((position, dict(res["jobs"][position])))
+                    self._bump(task, "job", (url, position))
+
+                if not touched and not stats:
+                    return 0, 0
+                logger.info(f"[TaskManager] Streamed jobs for task {task_id}. Added: {added_count}, Updated: {len(touched) - added_count}. Total: {len(res['jobs'])}")
+                res["total_found"] = len(res["jobs"])
+                self._bump(task, "result", url)
+                if touched:
+                    self._persist("save_jobs", task_id, url, touched)
+                self._persist_result(task, res, with_jobs=False)
+                return added_count, len(touched) - added_count
+        return 0, 0
+
+    def changes_since(self, task_id: str, since: int = 0, summary: bool = False) -> Optional[Dict[str, Any]]:
+        """Task state plus the logs, results and jobs changed after ``since``.
+
+        Results come without their job lists (``job_count`` gives the current
+        length, streamed lists can shrink when the final result lands); jobs
+        are sent as ``{"seq", "url", "position", "job"}`` entries. With
+        ``summary`` job descriptions and details are left out.
+        """
+        if self.get_task(task_id) is None:
+            return None
+        with self.lock:
+            task = self.tasks.get(task_id)
+            if task is None:
+                # Evicted again in between
+                return None
+            # Newest first, stopping at the first ref not changed since: O(changes)
+            changed: List[Tuple[Tuple[str, Any], int]] = []
+            for key, seq in reversed(self._journal.get(task_id, {}).items()):
+                if seq <= since:
+                    break
+                changed.append((key, seq))
+
+            delta: Dict[str, Any] = {name: getattr(task, name) for name in self.TASK_FIELDS}
+            # Records that already left the ring buffer are only in the log file
+            delta.update(since=since, logs=[dict(r) for r in task.logs if r["seq"] > since], results=[], jobs=[])
+            for (kind, ref), seq in reversed(changed):
+                if kind == "result":
+                    result = self._find_result(task, ref)
+                    entry = {k: v for k, v in result.items() if k not in ("jobs", "jobs_unfiltered")}
+                    entry.update(seq=seq, job_count=len(result.get("jobs") or []))
+                    delta["results"].append(entry)
+                else:
+                    url, position = ref
+                    jobs = self._find_result(task, url).get("jobs") or []
+                    if position >= len(jobs):
+                        # Dropped when the final (date filtered) list replaced the streamed one
+                        continue
+                    job = jobs[position]
+                    if summary:
+                        job = {k: v for k, v in job.items() if k not in self.SUMMARY_OMIT}
+                    else:
+                        job = dict(job)
+                    delta["jobs"].append({"seq": seq, "url": url, "position": position, "job": job})
+            return delta
+
+    def wait_for_changes(self, task_id: str, since: int, timeout: float) -> bool:
+        """Block until the task moves past ``since``; False on timeout."""
+        with self.changed:
+            def moved():
+                task = self.tasks.get(task_id)
+                return task is None or task.seq > since
+            return self.changed.wait_for(moved, timeout)
+
+    def wait_until_done(self, task_id: str, timeout: Optional[float]) -> Optional[ScrapingTask]:
+        """Block until the task is completed or failed (or ``timeout`` passes, None waits forever) and return it."""
+        with self.changed:
+            def done():
+                task = self.tasks.get(task_id)
+                return task is None or task.status in ("completed", "failed")
+            self.changed.wait_for(done, timeout)
+            task = self.tasks.get(task_id)
+        # Finished and evicted before we woke up: it is in the store, if anywhere
+        return task if task is not None else self.get_task(task_id)
 
     def set_approval(self, task_id: str, awaiting: bool, next_url: str = ""):
         with self.lock:
             if task := self.tasks.get(task_id):
                 task.awaiting_approval = awaiting
                 task.next_url = next_url
+                self._bump(task, "task")
 
     def set_approve_all(self, task_id: str, value: bool):
         with self.lock:
             if task := self.tasks.get(task_id):
                 task.approve_all = value
+                self._bump(task, "task")
 
     def set_skip_next(self, task_id: str, value: bool):
         with self.lock:
             if task := self.tasks.get(task_id):
                 task.skip_next = value
+                self._bump(task, "task")
@@ -1,10 +1,18 @@
 import re
 from typing import List, Dict, Any
-from datetime import datetime, timedelta
+from datetime import date, datetime
 import logging
+import time
+from .dates import normalize_job, parse_posted
 
 logger = logging.getLogger(__name__)
 
+def json_default(value: Any) -> Any:
+    """``default=`` hook for json.dumps: jobs keep datetimes until they are serialized."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
 def parse_platforms_file(file_path: str) -> List[str]:
     urls = []
     try:
@@ -23,33 +31,19 @@ def parse_platforms_file(file_path: str) -> List[str]:
 def filter_jobs_by_date(jobs: List[Dict[str, Any]], hours_back: int = 24, require_date: bool = False) -> List[Dict[str, Any]]:
     if not jobs:
         return jobs
-    
-    cutoff_time = datetime.now() - timedelta(hours=hours_back)
+
+    # Each job is parsed once (normalize_job keeps posted_ts), after that this is a comparison
+    now = time.time()
+    cutoff = now - hours_back * 3600
     filtered_jobs = []
-    
     for job in jobs:
-        job_date = None
-
-        for key in ("posted_at", "posted", "date", "age", "age_text"):
-            value = job.get(key)
-            if not value:
-                continue
-            if isinstance(value, datetime):
-                job_date = value
-                break
-            if isinstance(value, str):
-                job_date = _parse_posted_time(value)
-                if job_date:
-                    break
-
-        if job_date is None:
+        posted_ts = normalize_job(job, now)
+        if posted_ts is None:
             if not require_date:
                 filtered_jobs.append(job)
             continue
-
-        if job_date >= cutoff_time:
+        if posted_ts >= cutoff:
             filtered_jobs.append(job)
-    
     return filtered_jobs
 
 def is_recent_job(job_text: str, hours_back: int = 24) -> bool:
@@ -60,43 +54,14 @@ def is_recent_job(job_text: str, hours_back: int = 24) -> bool:
         if keyword in job_text_lower:
             return True
     
-    dt = _parse_posted_time(job_text_lower)
-    if dt is None:
+    parsed = parse_posted(job_text_lower)
+    if parsed is None:
         return False
-    return dt >= (datetime.now() - timedelta(hours=hours_back))
+    return parsed[0] >= time.time() - hours_back * 3600
 
 def _parse_posted_time(text: str):
-    if not text:
+    """Local naive datetime for a posting phrase; kept for callers of the old helper."""
+    parsed = parse_posted(text)
+    if parsed is None:
         return None
-    t = text.strip().lower()
-
-    if "just posted" in t:
-        return datetime.now()
-    if "today" in t:
-        return datetime.now()
-    if "yesterday" in t:
-        return datetime.now() - timedelta(days=1)
-
-    m = re.search(r'(\d+)\s*(minute|minutes|hour|hours|day|days)\s*ago', t)
-    if m:
-        amount = int(m.group(1))
-        unit = m.group(2)
-        if unit.startswith("minute"):
-            return datetime.now() - timedelta(minutes=amount)
-        if unit.startswith("hour"):
-            return datetime.now() - timedelta(hours=amount)
-        if unit.startswith("day"):
-            return datetime.now() - timedelta(days=amount)
-
-    m = re.search(r'(\d+)\s*(minute|minutes|hour|hours|day|days)', t)
-    if m and any(w in t for w in ("posted", "ago", "since", "updated")):
-        amount = int(m.group(1))
-        unit = m.group(2)
-        if unit.startswith("minute"):
-            return datetime.now() - timedelta(minutes=amount)
-        if unit.startswith("hour"):
-            return datetime.now() - timedelta(hours=amount)
-        if unit.startswith("day"):
-            return datetime.now() - timedelta(days=amount)
-
-    return None
+    return datetime.fromtimestamp(parsed[0])
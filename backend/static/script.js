@@ -14,7 +14,7 @@ document.addEventListener('DOMContentLoaded', () => {
     const summaryDiv = document.getElementById('results-summary');
 
     let currentTaskId = null;
-    let pollingInterval = null;
+    let eventSource = null;
 
     // Initialize: Fetch plan and render cards
     fetchPlanAndRenderCards();
@@ -148,7 +148,7 @@ document.addEventListener('DOMContentLoaded', () => {
             if (data.task_id) {
                 currentTaskId = data.task_id;
                 log(`Task ID: ${currentTaskId}`);
-                pollStatus(currentTaskId);
+                followEvents(currentTaskId);
             } else {
                 log('Failed to start task', 'error');
                 scrapeAllBtn.disabled = false;
@@ -159,53 +159,84 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     });
 
-    function pollStatus(taskId) {
-        if (pollingInterval) clearInterval(pollingInterval);
-        
-        pollingInterval = setInterval(async () => {
-            try {
-                const response = await fetch(`/api/scrape/status/${taskId}`);
-                const data = await response.json();
+    function followEvents(taskId) {
+        if (eventSource) eventSource.close();
+
+        // Results rebuilt from events: url -> result (with its jobs array)
+        const resultsByUrl = new Map();
+        let renderPending = false;
+
+        // Jobs arrive one event at a time, re-render the table at most every 250ms
+        function scheduleRender() {
+            if (renderPending) return;
+            renderPending = true;
+            setTimeout(() => {
+                renderPending = false;
+                renderResultsTable([...resultsByUrl.values()]);
+            }, 250);
+        }
+
+        // The browser reconnects on its own and sends Last-Event-ID to resume
+        eventSource = new EventSource(`/api/scrape/events/${taskId}`);
 
-                // Update Progress UI
-                const progress = data.total > 0 ? (data.progress / data.total) * 100 : 0;
-                progressBar.style.width = `${progress}%`;
-                progressText.textContent = `${Math.round(progress)}%`;
+        eventSource.addEventListener('log', e => log(JSON.parse(e.data).message));
 
-                // Handle Logs
-                if (data.logs && data.logs.length > 0) {
-                   // Just show the last few logs to avoid spam
-                   const recentLogs = data.logs.slice(-3);
-                   recentLogs.forEach(l => log(l)); 
-                }
+        eventSource.addEventListener('result', e => {
+            applyDelta(resultsByUrl, { results: [JSON.parse(e.data)], jobs: [] });
+            scheduleRender();
+        });
 
-                // Handle Approval State
-                if (data.awaiting_approval && data.next_url) {
-                    currentSiteInfo.textContent = `Ready to scrape: ${data.next_url}`;
-                    toggleActionButtons(true);
-                } else {
-                    currentSiteInfo.textContent = data.status === 'running' ? 'Processing...' : `Status: ${data.status}`;
-                    toggleActionButtons(false);
-                }
+        eventSource.addEventListener('job', e => {
+            applyDelta(resultsByUrl, { results: [], jobs: [JSON.parse(e.data)] });
+            scheduleRender();
+        });
 
-                // Update Results Table (Cumulative)
-                // Note: The backend returns *all* results so far in data.results
-                // So we should re-render the table to avoid duplicates or complex diffing
-                if (data.results && data.results.length > 0) {
-                    renderResultsTable(data.results);
-                }
+        eventSource.addEventListener('task', e => {
+            const data = JSON.parse(e.data);
 
-                if (data.status === 'completed' || data.status === 'failed') {
-                    clearInterval(pollingInterval);
-                    scrapeAllBtn.disabled = false;
-                    toggleActionButtons(false);
-                    log(`Process finished: ${data.status}`, data.status === 'completed' ? 'success' : 'error');
-                }
+            // Update Progress UI
+            const progress = data.total > 0 ? (data.progress / data.total) * 100 : 0;
+            progressBar.style.width = `${progress}%`;
+            progressText.textContent = `${Math.round(progress)}%`;
 
-            } catch (e) {
-                console.error(e);
+            // Handle Approval State
+            if (data.awaiting_approval && data.next_url) {
+                currentSiteInfo.textContent = `Ready to scrape: ${data.next_url}`;
+                toggleActionButtons(true);
+            } else {
+                currentSiteInfo.textContent = data.status === 'running' ? 'Processing...' : `Status: ${data.status}`;
+                toggleActionButtons(false);
             }
-        }, 1000);
+        });
+
+        eventSource.addEventListener('done', e => {
+            const data = JSON.parse(e.data);
+            eventSource.close();
+            eventSource = null;
+            scrapeAllBtn.disabled = false;
+            toggleActionButtons(false);
+            log(`Process finished: ${data.status}`, data.status === 'completed' ? 'success' : 'error');
+        });
+
+        eventSource.onerror = () => console.warn('Event stream interrupted, reconnecting...');
+    }
+
+    // Merge result/job changes into resultsByUrl; returns true if any result or job changed
+    function applyDelta(resultsByUrl, data) {
+        data.results.forEach(r => {
+            const current = resultsByUrl.get(r.url) || { jobs: [] };
+            const { seq, job_count, ...fields } = r;
+            Object.assign(current, fields);
+            // The final result can replace a longer streamed list
+            current.jobs.length = Math.min(current.jobs.length, job_count);
+            resultsByUrl.set(r.url, current);
+        });
+        data.jobs.forEach(j => {
+            // A job can be sent before the result update that counted it
+            if (!resultsByUrl.has(j.url)) resultsByUrl.set(j.url, { url: j.url, jobs: [] });
+            resultsByUrl.get(j.url).jobs[j.position] = j.job;
+        });
+        return data.results.length > 0 || data.jobs.length > 0;
     }
 
     function toggleActionButtons(show) {
@@ -223,8 +254,14 @@ document.addEventListener('DOMContentLoaded', () => {
     async function sendAction(action) {
         if (!currentTaskId) return;
         try {
-            await fetch(`/api/scrape/${action}/${currentTaskId}`, { method: 'POST' });
+            const resp = await fetch(`/api/scrape/${action}/${currentTaskId}`, { method: 'POST' });
             toggleActionButtons(false);
+            if (!resp.ok) {
+                // e.g. 409 when the prompt was already answered
+                const data = await resp.json();
+                log(`Action ${action} ignored: ${data.message}`, 'error');
+                return;
+            }
             log(`Action sent: ${action}`);
         } catch (e) {
             log(`Failed to send action ${action}: ${e}`, 'error');
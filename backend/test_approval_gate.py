@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+from scraper.engine import ApprovalGate, ScraperEngine
+from scraper.task_manager import TaskManager
+from test_task_manager import NoStore
+
+def test_decisions_without_a_prompt_are_rejected():
+    gate = ApprovalGate()
+    assert gate.post(ApprovalGate.APPROVE) is False
+    assert gate.wait(timeout=0.01) is None
+    gate.begin()
+    assert gate.post(ApprovalGate.APPROVE) is True
+    assert gate.wait(timeout=0.01) == ApprovalGate.APPROVE
+    # The prompt was answered, a second click has nothing to approve
+    assert gate.post(ApprovalGate.APPROVE) is False
+
+def test_one_decision_per_prompt():
+    gate = ApprovalGate()
+    gate.begin()
+    assert gate.post(ApprovalGate.APPROVE) is True
+    # Double click before the worker picked the first one up
+    assert gate.post(ApprovalGate.APPROVE) is False
+    assert gate.wait(timeout=0.01) == ApprovalGate.APPROVE
+    gate.begin()
+    assert gate.wait(timeout=0.01) is None
+
+def test_skip_wins_over_approve_all_and_stop_wins_over_both():
+    gate = ApprovalGate()
+    gate.begin()
+    gate.post(ApprovalGate.SKIP)
+    gate.release_all()
+    assert gate.wait(timeout=0.01) == ApprovalGate.SKIP
+    gate.begin()
+    assert gate.wait(timeout=0.01) == ApprovalGate.APPROVE  # approve all is sticky
+    gate.stop()
+    assert gate.wait(timeout=0.01) == ApprovalGate.STOP
+
+def test_wait_wakes_on_decision_from_another_thread():
+    gate = ApprovalGate()
+    gate.begin()
+    threading.Timer(0.05, gate.post, args=(ApprovalGate.SKIP,)).start()
+    started = time.monotonic()
+    assert gate.wait(timeout=5) == ApprovalGate.SKIP
+    assert time.monotonic() - started < 1
+
+def test_wait_async_holds_no_thread():
+    gate = ApprovalGate()
+
+    async def main():
+        gate.begin()
+        waiting = asyncio.ensure_future(gate.wait_async())
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+        threading.Thread(target=gate.post, args=(ApprovalGate.APPROVE,)).start()
+        return await asyncio.wait_for(waiting, 5)
+
+    assert asyncio.run(main()) == ApprovalGate.APPROVE
+    assert gate._listeners == []
+
+class FakePool:
+    def shutdown(self):
+        pass
+
+def test_engine_double_approve_only_releases_one_url():
+    manager = TaskManager(store=NoStore())
+    engine = ScraperEngine(manager, browser_pool=FakePool())
+
+    def scrape(url, task_id):
+        time.sleep(0.1)
+        return {"url": url, "status": "success", "jobs": []}
+
+    engine._scrape = scrape
+    task_id = engine.start_scraping_task(["a", "b"])
+    deadline = time.monotonic() + 5
+    while not manager.get_task(task_id).awaiting_approval and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert engine.approve_next(task_id) is True
+    # Arrives while "a" is being scraped, before "b" is shown to anyone
+    assert engine.approve_next(task_id) is False
+    time.sleep(0.3)
+    task = manager.get_task(task_id)
+    assert [r["url"] for r in task.results] == ["a"]
+    assert task.awaiting_approval and task.next_url == "b"
+    engine.stop()
+
+def test_engine_skip_flag_is_cleared_by_the_worker():
+    manager = TaskManager(store=NoStore())
+    engine = ScraperEngine(manager, browser_pool=FakePool())
+    engine._scrape = lambda url, task_id: {"url": url, "status": "success", "jobs": []}
+    task_id = engine.start_scraping_task(["a", "b"])
+    deadline = time.monotonic() + 5
+    while not manager.get_task(task_id).awaiting_approval and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert engine.skip_next(task_id) is True
+    while manager.get_task(task_id).next_url != "b" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    task = manager.get_task(task_id)
+    # Cleared when "a" was skipped, not set again afterwards
+    assert task.results[0]["status"] == "skipped" and task.skip_next is False
+    assert task.awaiting_approval
+    engine.stop()
@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+from scraper import dates
+from scraper.dates import UNPARSED, merge_job, normalize_job, parse_posted
+from scraper.utils import filter_jobs_by_date
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc).timestamp()
+
+def _hours_ago(text):
+    parsed = parse_posted(text, NOW)
+    return None if parsed is None else (NOW - parsed[0]) / 3600
+
+def test_relative_phrases():
+    assert _hours_ago("3 days ago") == 72
+    assert _hours_ago("Posted 30+ days ago") == 720
+    assert _hours_ago("posted an hour ago") == 1
+    assert _hours_ago("3d ago") == 72
+    assert _hours_ago("posted 2 hrs ago") == 2
+    assert _hours_ago("il y a 2 semaines") == 336
+    assert _hours_ago("il y a un an") == 8760
+    assert _hours_ago("vor 3 Tagen") == 72
+    assert _hours_ago("hace una semana") == 168
+    assert _hours_ago("yesterday") == 24
+    assert _hours_ago("Just posted") == 0
+
+def test_absolute_dates():
+    assert parse_posted("2026-10-01T10:00:00Z", NOW) == (datetime(2026, 10, 1, 10, tzinfo=timezone.utc).timestamp(), "exact")
+    assert parse_posted("2026-10-01", NOW)[1] == "day"
+    assert parse_posted("May 1, 2026", NOW)[0] == datetime(2026, 5, 1, tzinfo=timezone.utc).timestamp()
+    assert parse_posted("15 agosto 2026", NOW)[0] == datetime(2026, 8, 15, tzinfo=timezone.utc).timestamp()
+    assert parse_posted(1_700_000_000_000, NOW) == (1_700_000_000, "exact")
+
+def test_ordinary_text_is_not_a_date():
+    # Word numbers with one-letter units: "a" + "d"
+    assert parse_posted("Posted ad", NOW) is None
+    assert parse_posted("Posted an h", NOW) is None
+    # German "here", not French "yesterday"
+    assert parse_posted("Hier arbeiten", NOW) is None
+    # "ago" is not Spanish August
+    assert parse_posted("posted 3 ago 2024", NOW) is None
+    assert parse_posted("Senior Engineer", NOW) is None
+
+def test_normalize_job_parses_once(monkeypatch):
+    calls = []
+    real = dates.parse_posted
+    monkeypatch.setattr(dates, "parse_posted", lambda value, now=None: calls.append(value) or real(value, now))
+
+    undated = {"title": "No date", "posted": "whenever"}
+    assert normalize_job(undated, NOW) is None
+    assert undated["posted_precision"] == UNPARSED
+    tried = len(calls)
+    assert normalize_job(undated, NOW) is None
+    assert len(calls) == tried
+
+    dated = {"posted": "2 days ago"}
+    assert NOW - normalize_job(dated, NOW) == 48 * 3600
+    normalize_job(dated, NOW)
+    assert calls.count("2 days ago") == 1
+
+def test_merge_with_a_new_date_parses_again():
+    job = {"posted": "whenever"}
+    normalize_job(job, NOW)
+    merge_job(job, {"description": "x"})
+    assert job["posted_precision"] == UNPARSED
+    merge_job(job, {"posted_at": "2026-10-18"})
+    assert normalize_job(job, NOW) == datetime(2026, 10, 18, tzinfo=timezone.utc).timestamp()
+
+def test_filter_jobs_by_date():
+    recent = {"posted": "2 hours ago"}
+    old = {"posted": "3 days ago"}
+    undated = {"posted": "n/a"}
+    assert filter_jobs_by_date([recent, old, undated]) == [recent, undated]
+    assert filter_jobs_by_date([recent, old, undated], require_date=True) == [recent]
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import time
+from scraper import http_cache
+from scraper.http_cache import HttpCache
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None, content=b"", url="https://x/job"):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = content
+        self.url = url
+
+def _cache(max_size_mb=1.0):
+    return HttpCache(os.path.join(tempfile.mkdtemp(), "cache.db"), max_size_mb=max_size_mb)
+
+def test_evicts_least_recently_used_first():
+    cache = _cache(max_size_mb=1.0)
+    # Random bytes do not compress, each entry is ~400KB on disk
+    for name in ("a", "b"):
+        cache.put(name, f"https://x/{name}", 200, {}, os.urandom(400 * 1024), max_age=60)
+        time.sleep(0.01)
+    assert cache.get("a") is not None  # "a" is now more recent than "b"
+    time.sleep(0.01)
+    cache.put("c", "https://x/c", 200, {}, os.urandom(400 * 1024), max_age=60)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache._size <= cache.max_bytes
+
+def test_replacing_an_entry_does_not_count_it_twice():
+    cache = _cache()
+    cache.put("a", "https://x/a", 200, {}, os.urandom(1000), max_age=60)
+    size = cache._size
+    cache.put("a", "https://x/a", 200, {}, os.urandom(1000), max_age=60)
+    assert abs(cache._size - size) < 100
+
+def test_no_store_is_not_cached():
+    cache = _cache()
+    cache.put("a", "https://x/a", 200, {"cache-control": "no-store"}, b"body")
+    assert cache.get("a") is None
+
+def test_fresh_entry_served_then_revalidated_with_304():
+    cache = _cache()
+    key, entry, fresh = http_cache.lookup(cache, "https://x/job", {"Accept": "text/html"}, max_age=60)
+    assert entry is None and fresh is None
+    resp, outcome = http_cache.store(cache, key, entry, FakeResponse(200, {"etag": '"v1"'}, b"<p>job</p>"))
+    assert outcome == "miss"
+
+    _, _, fresh = http_cache.lookup(cache, "https://x/job", {"Accept": "text/html"}, max_age=60)
+    assert fresh is not None and fresh.text == "<p>job</p>"
+
+    # Stale: the caller revalidates with the stored validators, a 304 serves the cached body
+    key, entry, fresh = http_cache.lookup(cache, "https://x/job", {"Accept": "text/html"}, max_age=0)
+    assert fresh is None and entry.validators() == {"If-None-Match": '"v1"'}
+    resp, outcome = http_cache.store(cache, key, entry, FakeResponse(304))
+    assert outcome == "revalidated" and resp.text == "<p>job</p>"
+
+def test_unrevalidatable_response_is_stored_only_with_a_lifetime():
+    cache = _cache()
+    key, entry, _ = http_cache.lookup(cache, "https://x/job", None, max_age=None)
+    http_cache.store(cache, key, entry, FakeResponse(200, {}, b"body"))
+    assert cache.get(key) is None
+    # The strategy's override makes it servable for a while
+    http_cache.store(cache, key, entry, FakeResponse(200, {}, b"body"), max_age=60)
+    assert cache.get(key) is not None
+    cache.put("s", "https://x/s", 200, {"cache-control": "max-age=60"}, b"body")
+    assert cache.get("s") is not None
@@ -0,0 +1,75 @@
+import os
+import tempfile
+from scraper.storage import SQLiteJobStore
+from scraper.task_manager import TaskManager
+
+def _store():
+    return SQLiteJobStore(os.path.join(tempfile.mkdtemp(), "jobs.db"))
+
+def test_round_trip_keeps_filtered_view():
+    store = _store()
+    kept = {"link": "https://x/1", "title": "Kept", "posted_at": "2026-10-01T10:00:00Z"}
+    dropped = {"link": "https://x/2", "title": "Old", "posted": "3 years ago"}
+    store.save_task("t", "completed", 1, 1)
+    store.save_result("t", 0, {"url": "u", "status": "success", "platform": "Greenhouse", "total_found": 2,
+                               "filtered_count": 1, "jobs": [kept], "jobs_unfiltered": [kept, dropped]})
+    task = store.load_task("t")
+    assert task["status"] == "completed"
+    result = task["results"][0]
+    assert result["platform"] == "Greenhouse" and result["filtered_count"] == 1
+    assert [j["title"] for j in result["jobs"]] == ["Kept"]
+    assert [j["title"] for j in result["jobs_unfiltered"]] == ["Kept", "Old"]
+
+def test_full_result_replaces_streamed_jobs():
+    store = _store()
+    store.save_task("t", "running", 0, 1)
+    store.save_result("t", 0, {"url": "u", "status": "running"})
+    store.save_jobs("t", "u", [(0, {"link": "a", "title": "A"}), (1, {"link": "b", "title": "B"})])
+    store.save_jobs("t", "u", [(0, {"link": "a", "title": "A2"})])
+    assert [j["title"] for j in store.load_task("t")["results"][0]["jobs"]] == ["A2", "B"]
+    store.save_result("t", 0, {"url": "u", "status": "success", "jobs": [{"link": "b", "title": "B"}]})
+    assert [j["title"] for j in store.load_task("t")["results"][0]["jobs"]] == ["B"]
+
+def test_posted_column_is_iso_or_null():
+    store = _store()
+    store.save_task("t", "completed", 1, 1)
+    store.save_jobs("t", "u", [
+        (0, {"link": "new", "posted_at": "2026-10-01"}),
+        (1, {"link": "old", "posted_at": "2020-01-01"}),
+        # Free text used to be stored as is and compared lexically
+        (2, {"link": "junk", "posted": "whenever"}),
+    ])
+    assert [j["link"] for j in store.find_jobs(task_id="t", posted_since="2026-01-01")] == ["new"]
+    assert store.load_task("missing") is None
+
+def test_task_manager_writes_only_changed_jobs():
+    store = _store()
+    written = []
+    save_jobs = store.save_jobs
+    store.save_jobs = lambda task_id, url, jobs: (written.append([j["link"] for _, j in jobs]),
+                                                  save_jobs(task_id, url, jobs))
+    manager = TaskManager(store=store)
+    task = manager.create_task(1)
+    manager.init_result(task.task_id, "u")
+    batch = [{"link": "a", "title": "A"}, {"link": "b", "title": "B"}]
+    manager.update_result_jobs(task.task_id, "u", [dict(j) for j in batch])
+    # The whole list again, one job changed
+    manager.update_result_jobs(task.task_id, "u", [dict(batch[0]), {"link": "b", "title": "B2"}])
+    manager.flush()
+    assert written == [["a", "b"], ["b"]]
+    assert [j["title"] for j in store.load_task(task.task_id)["results"][0]["jobs"]] == ["A", "B2"]
+
+def test_wait_until_done_returns_evicted_task_from_store():
+    manager = TaskManager(store=_store(), max_tasks=1)
+    task = manager.create_task(1)
+    manager.update_task_status(task.task_id, "completed")
+    # Evicts the finished task before any waiter looked at it
+    manager.create_task(1)
+    assert task.task_id not in manager.tasks
+    assert manager.wait_until_done(task.task_id, timeout=1).status == "completed"
+    assert manager.wait_until_done("missing", timeout=1) is None
+
+def test_canonical_link_drops_only_tracking_params():
+    from scraper.seen_jobs import canonical_link
+    link = "https://X.com/jobs/1/?utm_source=li&ref=li&refId=7&sourceId=3&src=x#apply"
+    assert canonical_link(link) == "https://x.com/jobs/1?refId=7&sourceId=3"
@@ -0,0 +1,62 @@
+from scraper.task_manager import TaskManager
+
+class NoStore:
+    """Keeps TaskManager off the default SQLite file."""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+def _manager():
+    return TaskManager(store=NoStore())
+
+def _running_task(manager, url="u"):
+    task = manager.create_task(1)
+    manager.init_result(task.task_id, url)
+    return task
+
+def test_changes_since_returns_only_newer_changes_in_order():
+    manager = _manager()
+    task = _running_task(manager)
+    manager.update_result_jobs(task.task_id, "u", [{"link": "a", "title": "A"}, {"link": "b", "title": "B"}])
+    seq = manager.changes_since(task.task_id, 0)["seq"]
+    manager.update_result_jobs(task.task_id, "u", [{"link": "b", "title": "B2"}])
+    manager.add_log(task.task_id, "hello")
+
+    delta = manager.changes_since(task.task_id, seq)
+    assert [(j["position"], j["job"]["title"]) for j in delta["jobs"]] == [(1, "B2")]
+    assert [r["url"] for r in delta["results"]] == ["u"]
+    assert [l["message"] for l in delta["logs"]] == ["hello"]
+    seqs = [e["seq"] for e in delta["jobs"] + delta["results"] + delta["logs"]]
+    assert all(s > seq for s in seqs) and delta["seq"] == max(seqs)
+    assert manager.changes_since(task.task_id, delta["seq"])["jobs"] == []
+
+def test_journal_keeps_one_entry_per_ref():
+    manager = _manager()
+    task = _running_task(manager)
+    for i in range(200):
+        manager.update_result_jobs(task.task_id, "u", [{"link": "a", "title": f"A{i}"}])
+    # One job and one result, however often they changed
+    assert len(manager._journal[task.task_id]) == 2
+    delta = manager.changes_since(task.task_id, 0)
+    assert [j["job"]["title"] for j in delta["jobs"]] == ["A199"]
+
+def test_shrunk_job_list_drops_stale_positions():
+    manager = _manager()
+    task = _running_task(manager)
+    manager.update_result_jobs(task.task_id, "u", [{"link": "a"}, {"link": "b"}, {"link": "c"}])
+    manager.add_result(task.task_id, {"url": "u", "status": "success", "jobs": [{"link": "a", "description": "x"}]})
+    delta = manager.changes_since(task.task_id, 0, summary=True)
+    assert [r["job_count"] for r in delta["results"]] == [1]
+    assert [j["job"] for j in delta["jobs"]] == [{"link": "a"}]
+    assert delta["progress"] == 1
+
+def test_unknown_task():
+    assert _manager().changes_since("missing", 0) is None
+
+def test_update_result_jobs_reports_what_changed():
+    manager = _manager()
+    task = _running_task(manager)
+    assert manager.update_result_jobs(task.task_id, "u", [{"link": "a"}, {"link": "b"}]) == (2, 0)
+    assert manager.update_result_jobs(task.task_id, "u", [{"link": "a"}, {"link": "b", "title": "B"}]) == (0, 1)
+    assert manager.update_result_jobs(task.task_id, "u", [{"link": "a"}]) == (0, 0)
+    assert manager.update_result_jobs("missing", "u", [{"link": "a"}]) == (0, 0)
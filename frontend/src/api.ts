@@ -40,13 +40,24 @@ export interface ScrapePlanResponse {
     plan: ScrapePlanItem[];
 }
 
+export interface LogRecord {
+    seq: number;
+    ts: number; // Unix seconds
+    level: 'debug' | 'info' | 'warning' | 'error';
+    event: string | null;
+    url: string | null;
+    message: string;
+    // Event specific counts, e.g. jobs, added, updated
+    [count: string]: number | string | null;
+}
+
 export interface TaskStatusResponse {
     task_id: string;
     status: string;
     progress: number;
     total: number;
     results: ScrapeResult[];
-    logs: string[];
+    logs: LogRecord[];
 }
 
 export const scrapeJobs = async (): Promise<ScrapeResponse> => {